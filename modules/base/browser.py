@@ -5,87 +5,198 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from typing import Dict, List, Optional, Sequence, Set
 import random
 import time
 from utils.config import Config
 from utils.retry import retry_on_error
+from modules.base.browser_pool import get_browser_pool, get_driver_path
+from modules.base import extractor
+
+# 页面地址和结果容器内容的特征，用于判断翻页或搜索是否完成
+_SIGNATURE_SCRIPT = '''
+    if (document.readyState === 'loading') return null;
+    const container = document.querySelector(arguments[0]);
+    const text = container ? container.innerText : '';
+    return location.href + '|' + text.length + '|' + text.slice(0, 200);
+'''
+
+# DOM 在指定时间内没有变化时回调 true，超时回调 false
+_SETTLE_SCRIPT = '''
+    const quiet = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+    let timer = null;
+    const observer = new MutationObserver(() => arm());
+    const limit = setTimeout(() => finish(false), timeout);
+    function finish(settled) {
+        observer.disconnect();
+        clearTimeout(timer);
+        clearTimeout(limit);
+        done(settled);
+    }
+    function arm() {
+        clearTimeout(timer);
+        timer = setTimeout(() => document.readyState === 'loading' ? arm() : finish(true), quiet);
+    }
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    arm();
+'''
+
+# 一次取出所有匹配元素的指定属性，属性不存在时读取同名 HTML 属性（如百度结果的 mu）
+_COLLECT_SCRIPT = '''
+    const properties = arguments[1];
+    return Array.from(document.querySelectorAll(arguments[0]), element => {
+        const item = {};
+        for (const name of properties) {
+            const value = name in element ? element[name] : element.getAttribute(name);
+            item[name] = value == null ? '' : String(value);
+        }
+        return item;
+    });
+'''
+
+# 一次取出结果容器的文本、全部链接和指定属性
+_PAGE_SCRIPT = '''
+    const containers = document.querySelectorAll(arguments[0]);
+    const parts = [];
+    for (const container of containers) {
+        parts.push(container.innerText);
+        for (const link of container.querySelectorAll('a[href]')) parts.push(link.href);
+        for (const name of arguments[1]) {
+            if (container.hasAttribute(name)) parts.push(container.getAttribute(name));
+            for (const element of container.querySelectorAll('[' + name + ']')) parts.push(element.getAttribute(name));
+        }
+    }
+    return parts.join('\\n');
+'''
 
 class BrowserBase:
     """浏览器基类，提供通用的 Selenium 功能"""
     
+    # 精简模式：不加载图片、字体、样式表和统计脚本，DOMContentLoaded 后即返回，
+    # 适合只需要读取链接和文本的结果页
+    lean = False
+    # 精简模式下屏蔽的资源，支持 * 通配符；模式需匹配完整 URL，带查询参数的资源（如 a.css?v=1）单独列出
+    blocked_resources = [
+        pattern
+        for ext in ('png', 'jpg', 'jpeg', 'gif', 'webp', 'svg', 'ico', 'bmp',
+                    'woff', 'woff2', 'ttf', 'otf', 'eot', 'css', 'mp4', 'webm', 'mp3')
+        for pattern in (f'*.{ext}', f'*.{ext}?*')
+    ] + [
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*hm.baidu.com*', '*cnzz.com*',
+    ]
+    # 结果容器的 CSS 选择器，用于判断翻页后结果是否已更新
+    results_selector = 'body'
+    # 两次翻页之间的最短间隔（秒），只在有反爬限制的站点设置
+    min_page_interval = 0
+    
     def __init__(self):
         self.config = Config()
         self.driver = None
+        self._driver_key = None
+        self._last_page_at = 0.0
+        # 各类等待实际花费的时间（秒），用于分析页面加载耗时
+        self.wait_timings: Dict[str, List[float]] = {}
     
     def init_driver(self, headless=True):
-        """初始化 WebDriver
+        """从浏览器池借出 WebDriver
         
         Args:
             headless: 是否使用无头模式
         """
         if self.driver is None:
-            chrome_options = Options()
-            if headless:
-                chrome_options.add_argument('--headless')
-            
-            # 基本配置
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_argument('--incognito')  # 无痕模式
+            # 启动参数不同的浏览器不能混用
+            self._driver_key = (headless, self.lean)
+            # 其他数据源长时间占用浏览器时超时失败，不阻塞整个扫描
+            timeout = float(self.config.get_api_key('browser', 'acquire_timeout') or 300)
+            self.driver = get_browser_pool().acquire(self._driver_key, lambda: self._create_driver(headless),
+                                                     timeout=timeout)
+    
+    def _create_driver(self, headless=True):
+        """启动新的 Chrome WebDriver
+        
+        Args:
+            headless: 是否使用无头模式
+        """
+        chrome_options = Options()
+        if headless:
+            chrome_options.add_argument('--headless')
+        
+        # 基本配置
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        chrome_options.add_argument('--incognito')  # 无痕模式
+        
+        # 随机 User-Agent
+        user_agents = [
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.159 Safari/537.36',
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        ]
+        chrome_options.add_argument(f'user-agent={random.choice(user_agents)}')
+        
+        # 实验性选项
+        chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        
+        # 代理配置
+        proxy = self.config.get_api_key('proxy')
+        if proxy:
+            if proxy.get('socks'):
+                chrome_options.add_argument(f'--proxy-server={proxy["socks"]}')
+            elif proxy.get('http'):
+                chrome_options.add_argument(f'--proxy-server={proxy["http"]}')
+            elif proxy.get('https'):
+                chrome_options.add_argument(f'--proxy-server={proxy["https"]}')
+        
+        # 精简模式
+        if self.lean:
+            chrome_options.page_load_strategy = 'eager'
+            chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        
+        driver = None
+        try:
+            # ChromeDriver 路径在进程内缓存，不再每次检查更新
+            service = Service(get_driver_path())
+            driver = webdriver.Chrome(service=service, options=chrome_options)
             
-            # 随机 User-Agent
-            user_agents = [
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/92.0.4515.159 Safari/537.36',
-                'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            ]
-            chrome_options.add_argument(f'user-agent={random.choice(user_agents)}')
+            # 修改 WebDriver 属性
+            driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                'source': '''
+                    Object.defineProperty(navigator, 'webdriver', {
+                        get: () => undefined
+                    })
+                '''
+            })
             
-            # 实验性选项
-            chrome_options.add_experimental_option('excludeSwitches', ['enable-automation'])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
+            # 屏蔽非文档资源，在网络层直接拦截
+            if self.lean:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_resources})
             
-            # 代理配置
-            proxy = self.config.get_api_key('proxy')
-            if proxy:
-                if proxy.get('socks'):
-                    chrome_options.add_argument(f'--proxy-server={proxy["socks"]}')
-                elif proxy.get('http'):
-                    chrome_options.add_argument(f'--proxy-server={proxy["http"]}')
-                elif proxy.get('https'):
-                    chrome_options.add_argument(f'--proxy-server={proxy["https"]}')
+            # 设置页面加载超时
+            driver.set_page_load_timeout(30)
+            return driver
             
-            try:
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                
-                # 修改 WebDriver 属性
-                self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                    'source': '''
-                        Object.defineProperty(navigator, 'webdriver', {
-                            get: () => undefined
-                        })
-                    '''
-                })
-                
-                # 设置页面加载超时
-                self.driver.set_page_load_timeout(30)
-                
-            except Exception as e:
-                print(f"[-] Chrome WebDriver 初始化失败: {str(e)}")
-                if self.driver:
-                    self.quit_driver()
-                raise e
+        except Exception as e:
+            print(f"[-] Chrome WebDriver 初始化失败: {str(e)}")
+            if driver:
+                try:
+                    driver.quit()
+                except:
+                    pass
+            raise e
     
     def quit_driver(self):
-        """关闭 WebDriver"""
+        """将 WebDriver 归还浏览器池，浏览器清理状态后供其他数据源复用"""
         if self.driver:
             try:
-                self.driver.quit()
+                get_browser_pool().release(self._driver_key, self.driver)
             except:
                 pass
             finally:
@@ -111,6 +222,96 @@ class BrowserBase:
             EC.presence_of_all_elements_located((by, value))
         )
     
+    def collect_elements(self, css: str, properties: Sequence[str] = ('innerText',)) -> List[Dict[str, str]]:
+        """在一次 execute_script 中读取所有匹配元素的属性
+        
+        逐个调用 element.text / get_attribute 时每次都是一次 WebDriver 请求，结果多时很慢。
+        
+        Args:
+            css: 元素的 CSS 选择器
+            properties: 要读取的 DOM 属性或 HTML 属性，如 innerText、href、mu
+        Returns:
+            每个元素一个字典，键为属性名
+        """
+        return self.driver.execute_script(_COLLECT_SCRIPT, css, list(properties)) or []
+    
+    def extract_page_subdomains(self, domain: str, css: Optional[str] = None,
+                                attributes: Sequence[str] = ()) -> Set[str]:
+        """在一次 execute_script 中取出结果容器的文本和链接，并提取子域名
+        
+        Args:
+            domain: 目标域名
+            css: 结果容器的 CSS 选择器，默认为 results_selector
+            attributes: 额外读取的 HTML 属性，如百度结果中保存原始 URL 的 mu
+        """
+        content = self.driver.execute_script(_PAGE_SCRIPT, css or self.results_selector, list(attributes))
+        return extractor.extract_subdomains(content or '', domain)
+    
+    def _record_wait(self, name: str, start: float):
+        """记录一次等待的耗时"""
+        self.wait_timings.setdefault(name, []).append(time.time() - start)
+    
+    def results_signature(self, css: str) -> Optional[str]:
+        """获取页面地址和结果容器内容的特征，页面仍在加载时返回 None
+        
+        Args:
+            css: 结果容器的 CSS 选择器
+        """
+        return self.driver.execute_script(_SIGNATURE_SCRIPT, css)
+    
+    def wait_for_results_change(self, css: str, before: Optional[str], timeout: float = 10) -> bool:
+        """等待页面跳转或结果容器内容变化，变化后立即返回
+        
+        Args:
+            css: 结果容器的 CSS 选择器
+            before: 操作前的 results_signature
+            timeout: 超时时间(秒)
+        Returns:
+            bool: 是否在超时前发生变化
+        """
+        start = time.time()
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                lambda driver: self.results_signature(css) not in (None, before)
+            )
+            return True
+        except TimeoutException:
+            return False
+        finally:
+            self._record_wait('results_change', start)
+    
+    def wait_for_dom_settle(self, quiet: float = 0.3, timeout: float = 5) -> bool:
+        """等待文档加载完成且 DOM 在 quiet 秒内没有变化
+        
+        在页面中用 MutationObserver 监听变化，不需要固定等待。
+        
+        Returns:
+            bool: 是否在超时前稳定
+        """
+        start = time.time()
+        try:
+            self.driver.set_script_timeout(timeout + 1)
+            return bool(self.driver.execute_async_script(_SETTLE_SCRIPT, int(quiet * 1000), int(timeout * 1000)))
+        except WebDriverException:
+            # 等待期间发生跳转时脚本会被中断
+            return False
+        finally:
+            self._record_wait('dom_settle', start)
+    
+    def pace(self, interval: Optional[float] = None):
+        """保证两次翻页之间至少间隔 interval 秒，页面加载已花费的时间计入间隔
+        
+        Args:
+            interval: 最短间隔，默认为 min_page_interval
+        """
+        interval = self.min_page_interval if interval is None else interval
+        remaining = interval - (time.time() - self._last_page_at)
+        if remaining > 0:
+            start = time.time()
+            time.sleep(remaining)
+            self._record_wait('pace', start)
+        self._last_page_at = time.time()
+    
     @retry_on_error(max_retries=3, delay=1)
     def safe_get(self, url):
         """安全的页面访问方法"""
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+import atexit
+import threading
+import time
+from typing import Callable, Hashable, List, Optional, Tuple
+from urllib.parse import urlparse
+from selenium.webdriver.remote.webdriver import WebDriver
+from webdriver_manager.chrome import ChromeDriverManager
+from utils.config import Config
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+def get_driver_path() -> str:
+    """获取 ChromeDriver 路径
+
+    优先使用配置文件中的 browser.driver_path，否则由 webdriver_manager 获取一次，
+    进程内复用，避免每次启动浏览器都进行网络检查。
+    """
+    global _driver_path
+    if _driver_path is None:
+        with _driver_path_lock:
+            if _driver_path is None:
+                _driver_path = Config().get_api_key('browser', 'driver_path') or ChromeDriverManager().install()
+    return _driver_path
+
+class BrowserPool:
+    """Chrome 浏览器池
+
+    限制同时运行的浏览器数量，数据源用完的浏览器清理 Cookie、存储、缓存和多余窗口后放回池中，
+    下一个数据源直接复用，省去数秒的冷启动时间。启动参数不同（如是否无头）的浏览器不会混用，
+    空闲超过 max_idle 秒的浏览器会被关闭。
+    """
+
+    def __init__(self, size: int = 2, max_idle: float = 300):
+        """
+        Args:
+            size: 同时运行的浏览器数量上限，已全部借出时 acquire 会等待
+            max_idle: 空闲浏览器保留时间（秒）
+        """
+        self.size = size
+        self.max_idle = max_idle
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._idle: List[Tuple[Hashable, WebDriver, float]] = []  # (启动参数, 浏览器, 放回时间)
+        self._busy = 0
+        self._closed = False
+
+    def acquire(self, key: Hashable, factory: Callable[[], WebDriver], timeout: Optional[float] = None) -> WebDriver:
+        """借出一个浏览器
+
+        Args:
+            key: 启动参数标识，只复用标识相同的浏览器
+            factory: 没有可复用的浏览器时用于启动新浏览器
+            timeout: 等待空闲名额的最长时间（秒），为 None 时一直等待
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("等待可用浏览器超时")
+        try:
+            with self._lock:
+                self._busy += 1
+            driver = self._take_idle(key)
+            if driver is None:
+                self._make_room()
+                driver = factory()
+            return driver
+        except Exception:
+            with self._lock:
+                self._busy -= 1
+            self._slots.release()
+            raise
+
+    def release(self, key: Hashable, driver: WebDriver):
+        """归还浏览器，清理失败或浏览器池已关闭时直接关闭浏览器"""
+        try:
+            if not self._closed and self._reset(driver):
+                with self._lock:
+                    self._idle.append((key, driver, time.time()))
+                    driver = None
+            if driver is not None:
+                self._quit(driver)
+        finally:
+            with self._lock:
+                self._busy -= 1
+            self._slots.release()
+
+    def _take_idle(self, key: Hashable) -> Optional[WebDriver]:
+        """取出一个启动参数相同且仍可用的空闲浏览器"""
+        while True:
+            expired = []
+            driver = None
+            with self._lock:
+                now = time.time()
+                for item in list(self._idle):
+                    if now - item[2] > self.max_idle:
+                        self._idle.remove(item)
+                        expired.append(item[1])
+                    elif driver is None and item[0] == key:
+                        self._idle.remove(item)
+                        driver = item[1]
+            for stale in expired:
+                self._quit(stale)
+            if driver is None:
+                return None
+            try:
+                driver.current_url  # 浏览器进程可能已经退出
+                return driver
+            except Exception:
+                self._quit(driver)
+
+    def _make_room(self):
+        """启动新浏览器前关闭多余的空闲浏览器，保证总数不超过上限"""
+        while True:
+            with self._lock:
+                if self._busy + len(self._idle) <= self.size or not self._idle:
+                    return
+                _, driver, _ = self._idle.pop(0)
+            self._quit(driver)
+
+    @staticmethod
+    def _reset(driver: WebDriver) -> bool:
+        """清理上一个数据源留下的状态
+
+        Returns:
+            是否清理成功，失败的浏览器不再复用
+        """
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            # Cookie 和缓存对所有站点生效，其余存储只能按来源清理，清理当前页面所在的来源
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            driver.execute_script('try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}')
+            origin = BrowserPool._origin(driver.current_url)
+            if origin:
+                try:
+                    driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+                except Exception:
+                    pass  # IndexedDB 等存储清理失败不影响复用
+            driver.get('about:blank')
+            driver.set_page_load_timeout(30)
+            driver.set_script_timeout(30)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _origin(url: str) -> Optional[str]:
+        """返回页面地址的来源（scheme://host[:port]），about:blank 等页面返回 None"""
+        parsed = urlparse(url or '')
+        if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+            return None
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    @staticmethod
+    def _quit(driver: WebDriver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        """关闭所有空闲浏览器，之后归还的浏览器也会直接关闭"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for _, driver, _ in idle:
+            self._quit(driver)
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+def get_browser_pool() -> BrowserPool:
+    """获取进程内共享的浏览器池，大小来自配置文件中的 browser 配置"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = Config()
+                _pool = BrowserPool(
+                    size=int(config.get_api_key('browser', 'pool_size') or 2),
+                    max_idle=float(config.get_api_key('browser', 'max_idle') or 300)
+                )
+    return _pool
+
+@atexit.register
+def close_browser_pool():
+    """退出时关闭所有浏览器"""
+    if _pool is not None:
+        _pool.close()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+import functools
+import re
+from typing import Iterable, Pattern, Set, Union
+
+# 单个标签：字母数字开头和结尾，中间可以有连字符
+_LABEL = r'[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?'
+
+# 完整域名的最大长度，也是流式扫描时在数据块之间保留的文本长度
+MAX_NAME_LENGTH = 253
+
+@functools.lru_cache(maxsize=64)
+def get_pattern(domain: str, binary: bool = False) -> Pattern:
+    """获取目标域名的预编译匹配模式，按域名缓存
+
+    匹配目标域名前的任意多级标签，如 a.b.example.com；
+    前面紧挨字母数字时不从中间开始匹配，后面仍是域名字符时（如 example.com.cn）不匹配。
+
+    Args:
+        domain: 目标域名，需为小写
+        binary: 为 True 时返回用于 bytes 的模式
+    """
+    pattern = rf'(?<![a-z0-9])(?:{_LABEL}\.)+{re.escape(domain)}(?![a-z0-9-]|\.[a-z0-9])'
+    if binary:
+        return re.compile(pattern.encode('utf-8'), re.IGNORECASE)
+    return re.compile(pattern, re.IGNORECASE)
+
+def _normalize_domain(domain: str) -> str:
+    return domain.strip().strip('.').lower()
+
+def extract_subdomains(content: Union[str, bytes], domain: str) -> Set[str]:
+    """从文本或字节串中提取目标域名的子域名，结果为去重后的小写域名"""
+    domain = _normalize_domain(domain)
+    binary = isinstance(content, (bytes, bytearray))
+    # 不包含目标域名时跳过正则扫描
+    if (domain.encode('utf-8') if binary else domain) not in content.lower():
+        return set()
+    return _scan(content, domain, 0, len(content), binary)
+
+def _scan(content: Union[str, bytes], domain: str, after: int, before: int, binary: bool) -> Set[str]:
+    """提取结束位置在 (after, before] 区间内的子域名"""
+    subdomains = set()
+    for match in get_pattern(domain, binary).finditer(content):
+        if after < match.end() <= before:
+            name = match.group(0)
+            name = (name.decode('utf-8', errors='ignore') if binary else name).lower()
+            if len(name) <= MAX_NAME_LENGTH:
+                subdomains.add(name)
+    return subdomains
+
+class SubdomainExtractor:
+    """流式子域名提取器
+
+    逐块输入响应体，数据块之间保留一段尾部文本，跨块的域名也能完整匹配，结果边输入边去重。
+
+    用法:
+        extractor = SubdomainExtractor('example.com')
+        for chunk in response.iter_bytes():
+            extractor.feed(chunk)
+        subdomains = extractor.close()
+    """
+
+    def __init__(self, domain: str):
+        self.domain = _normalize_domain(domain)
+        self.subdomains: Set[str] = set()
+        self._tail = None
+        self._scanned = 0  # 尾部文本中已处理过的位置
+
+    def feed(self, chunk: Union[str, bytes]) -> Set[str]:
+        """输入一个数据块
+
+        Returns:
+            本次新发现的子域名
+        """
+        buffer = chunk if self._tail is None else self._tail + chunk
+        # 后面不足两个字符的匹配可能被截断（如 example.com.cn），等下一个数据块到达后再处理
+        found = self._collect(buffer, len(buffer) - 2)
+        self._tail = buffer[-(MAX_NAME_LENGTH + len(self.domain)):]
+        self._scanned = len(self._tail) - 2
+        return found
+
+    def close(self) -> Set[str]:
+        """处理剩余的尾部文本并返回全部子域名"""
+        if self._tail:
+            self._collect(self._tail, len(self._tail))
+            self._tail = self._tail[:0]
+            self._scanned = 0
+        return self.subdomains
+
+    def _collect(self, buffer: Union[str, bytes], before: int) -> Set[str]:
+        binary = isinstance(buffer, (bytes, bytearray))
+        found = _scan(buffer, self.domain, self._scanned, before, binary) - self.subdomains
+        self.subdomains.update(found)
+        return found
+
+def extract_from_stream(chunks: Iterable[Union[str, bytes]], domain: str) -> Set[str]:
+    """从数据块流中提取子域名，如 response.iter_bytes()"""
+    extractor = SubdomainExtractor(domain)
+    for chunk in chunks:
+        extractor.feed(chunk)
+    return extractor.close()
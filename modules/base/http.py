@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+
+import asyncio
+import atexit
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Dict, Iterator, Optional, TypeVar, Union
+import httpx
+from utils.ratelimit import RateLimiter, get_rate_limiter
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 请求异常基类，替代 requests.exceptions.RequestException
+HttpError = httpx.HTTPError
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+_transport: Optional[httpx.HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+def get_transport() -> httpx.HTTPTransport:
+    """获取进程内共享的连接池
+
+    所有数据源共用同一个连接池，同一主机的连接（包括 TLS 会话）在数据源之间和多次扫描之间复用，
+    安装了 h2 时启用 HTTP/2。
+    """
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = httpx.HTTPTransport(
+                    verify=False,  # 统一禁用 SSL 验证
+                    http2=HTTP2_AVAILABLE,
+                    limits=httpx.Limits(max_connections=200, max_keepalive_connections=50, keepalive_expiry=60)
+                )
+    return _transport
+
+@atexit.register
+def close_transport():
+    """关闭共享连接池"""
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport.close()
+            _transport = None
+
+_async_transports: Dict[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport] = {}
+
+T = TypeVar('T')
+
+def get_async_transport() -> httpx.AsyncHTTPTransport:
+    """获取当前事件循环共享的异步连接池
+
+    异步连接只能在创建它的事件循环中使用，同一事件循环中的所有异步数据源共用一个连接池，
+    由 run_async 在事件循环结束前关闭。
+    """
+    loop = asyncio.get_running_loop()
+    transport = _async_transports.get(loop)
+    if transport is None:
+        transport = _async_transports[loop] = httpx.AsyncHTTPTransport(
+            verify=False,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50, keepalive_expiry=60)
+        )
+    return transport
+
+async def close_async_transport():
+    """关闭当前事件循环的异步连接池"""
+    transport = _async_transports.pop(asyncio.get_running_loop(), None)
+    if transport is not None:
+        await transport.aclose()
+
+def run_async(coro: Awaitable[T]) -> T:
+    """在新的事件循环中运行协程并返回结果，结束时关闭该事件循环的异步连接池
+
+    当前线程已有运行中的事件循环时（如在 main 协程中同步调用），在独立线程中运行。
+    """
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await close_async_transport()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(runner())
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, runner()).result()
+
+def _proxy_url(proxies: Union[str, Dict[str, str], None]) -> Optional[str]:
+    """从 requests 风格的 proxies 中取出代理地址，http 与 https 使用不同代理时抛出 ValueError"""
+    if not proxies:
+        return None
+    if isinstance(proxies, str):
+        return proxies
+    urls = {url for scheme, url in proxies.items() if url and scheme in ('http', 'https', 'all')}
+    if len(urls) > 1:
+        raise ValueError("HttpSession 的 http 和 https 请求只能使用同一个代理")
+    return urls.pop() if urls else None
+
+class HttpSession:
+    """兼容 requests.Session 用法的 HTTP 会话
+
+    每个数据源有独立的请求头和 Cookie，底层连接来自共享连接池，请求经过共享限速器按主机排队。
+    requests 特有的参数会被转换：verify 由连接池统一处理，allow_redirects 对应 follow_redirects。
+    代理在会话级别设置（proxy 参数或 proxies 属性），httpx 不支持按请求切换代理，
+    请求中传入与会话不同的 proxies 时抛出 ValueError，避免不经代理直接发出请求。
+    """
+
+    def __init__(self, timeout: float = 10, rate_limiter: Optional[RateLimiter] = None,
+                 proxy: Optional[str] = None):
+        """
+        Args:
+            timeout: 默认超时时间（秒）
+            rate_limiter: 限速器，默认为进程内共享的限速器
+            proxy: 代理地址，如 http://127.0.0.1:8080、socks5://127.0.0.1:1080
+        """
+        self._timeout = timeout
+        self._proxy = proxy
+        self._client = self._build_client(headers={'User-Agent': DEFAULT_USER_AGENT})
+        self.verify = False
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+
+    def _build_client(self, headers=None, cookies=None) -> httpx.Client:
+        # 会话只持有请求头和 Cookie，不单独关闭，连接池由 close_transport 统一关闭；
+        # 设置代理时 httpx 为代理单独建立连接，不经过共享连接池
+        return httpx.Client(
+            transport=get_transport(),
+            proxy=self._proxy,
+            verify=False,
+            http2=HTTP2_AVAILABLE,
+            headers=headers,
+            cookies=cookies,
+            timeout=self._timeout,
+            follow_redirects=True
+        )
+
+    @property
+    def proxies(self) -> Dict[str, str]:
+        """会话级代理，格式与 requests.Session.proxies 相同，修改需重新赋值"""
+        return {'http': self._proxy, 'https': self._proxy} if self._proxy else {}
+
+    @proxies.setter
+    def proxies(self, value: Union[str, Dict[str, str], None]):
+        proxy = _proxy_url(value)
+        if proxy != self._proxy:
+            self._proxy = proxy
+            self._client = self._build_client(self._client.headers, self._client.cookies)
+
+    @property
+    def headers(self) -> httpx.Headers:
+        return self._client.headers
+
+    @headers.setter
+    def headers(self, value):
+        self._client.headers = value
+
+    @property
+    def cookies(self) -> httpx.Cookies:
+        return self._client.cookies
+
+    @cookies.setter
+    def cookies(self, value):
+        self._client.cookies = value
+
+    def _translate(self, kwargs: dict) -> dict:
+        """将 requests 风格的参数转换为 httpx 参数"""
+        kwargs.pop('verify', None)
+        kwargs.pop('stream', None)
+        proxies = kwargs.pop('proxies', None)
+        if proxies and _proxy_url(proxies) != self._proxy:
+            raise ValueError("HttpSession 不支持按请求设置代理，请通过 session.proxies 设置会话级代理")
+        if 'allow_redirects' in kwargs:
+            kwargs['follow_redirects'] = kwargs.pop('allow_redirects')
+        if 'data' in kwargs and isinstance(kwargs['data'], (str, bytes)):
+            kwargs['content'] = kwargs.pop('data')
+        return kwargs
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """发送请求，按主机限速并从响应头中学习限速状态"""
+        self.rate_limiter.acquire(url)
+        response = self._client.request(method, url, **self._translate(kwargs))
+        self.rate_limiter.update(url, response)
+        return response
+
+    @contextlib.contextmanager
+    def stream(self, method: str, url: str, **kwargs) -> Iterator[httpx.Response]:
+        """发送请求但不读取响应体，用于逐块处理大响应"""
+        self.rate_limiter.acquire(url)
+        with self._client.stream(method, url, **self._translate(kwargs)) as response:
+            self.rate_limiter.update(url, response)
+            yield response
+
+    @staticmethod
+    def replay(response: httpx.Response, headers: dict, content: bytes) -> httpx.Response:
+        """用本地缓存的响应头和响应体替换 304 响应"""
+        return httpx.Response(200, headers=headers, content=content, request=response.request)
+
+    def is_rate_limited(self, response: httpx.Response) -> bool:
+        """响应是否表示请求被限速，等待时间已记录在限速器中，直接重试即可"""
+        return self.rate_limiter.is_rate_limited(response)
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET 请求"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        """POST 请求"""
+        return self.request('POST', url, **kwargs)
+
+class AsyncHttpSession(HttpSession):
+    """HttpSession 的异步版本，供原生异步的数据源使用
+
+    用法与 HttpSession 相同，request、get、post 需要 await，stream 为异步上下文管理器。
+    底层连接来自当前事件循环共享的异步连接池，限速器与同步会话共享。
+    """
+
+    def _build_client(self, headers=None, cookies=None) -> httpx.AsyncClient:
+        # 与同步会话相同，客户端不单独关闭，连接池由 close_async_transport 统一关闭
+        return httpx.AsyncClient(
+            transport=get_async_transport(),
+            proxy=self._proxy,
+            verify=False,
+            http2=HTTP2_AVAILABLE,
+            headers=headers,
+            cookies=cookies,
+            timeout=self._timeout,
+            follow_redirects=True
+        )
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """发送请求，按主机限速并从响应头中学习限速状态"""
+        await self.rate_limiter.acquire_async(url)
+        response = await self._client.request(method, url, **self._translate(kwargs))
+        self.rate_limiter.update(url, response)
+        return response
+
+    @contextlib.asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """发送请求但不读取响应体，用于逐块处理大响应"""
+        await self.rate_limiter.acquire_async(url)
+        async with self._client.stream(method, url, **self._translate(kwargs)) as response:
+            self.rate_limiter.update(url, response)
+            yield response
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET 请求"""
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        """POST 请求"""
+        return await self.request('POST', url, **kwargs)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+_decoder = json.JSONDecoder()
+
+# 已消费的缓冲区超过该长度时丢弃，保持内存占用平稳
+_COMPACT_SIZE = 1 << 16
+
+class _Buffer:
+    """按需从数据块中补充文本的解析缓冲区"""
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """读取下一个数据块，没有更多数据时返回 False"""
+        if self.eof:
+            return False
+        if self.pos > _COMPACT_SIZE:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        for chunk in self.chunks:
+            chunk = self.decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if chunk:
+                self.text += chunk
+                return True
+        self.text += self.decoder.decode(b'', final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """跳过空白并返回下一个字符，没有更多数据时返回空字符串"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        """消费指定字符"""
+        if self.peek() != char:
+            raise ValueError(f"JSON 格式错误: 位置 {self.pos} 处应为 {char!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """解析下一个完整的 JSON 值
+
+        值恰好结束在缓冲区末尾时继续读取，避免把被截断的数字当作完整的值。
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+def iter_json_items(chunks: Iterable[Union[bytes, str]], key: Optional[str] = None,
+                    rest: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """流式解析 JSON 数组，逐个返回数组元素
+
+    只在内存中保留当前元素，适合 crt.sh 这类数百 MB 的响应。
+
+    Args:
+        chunks: 响应体数据块，如 response.iter_bytes()
+        key: 数组在顶层对象中的键名，为 None 时顶层就是数组
+        rest: 提供时用于接收顶层对象中除数组外的其他字段（如分页信息），数组迭代完成后才完整
+    """
+    buf = _Buffer(chunks)
+
+    if key is None:
+        yield from _iter_array(buf)
+        return
+
+    buf.expect('{')
+    if buf.peek() == '}':
+        return
+    while True:
+        name = buf.value()
+        buf.expect(':')
+        if name == key and buf.peek() == '[':
+            yield from _iter_array(buf)
+        else:
+            value = buf.value()
+            if rest is not None:
+                rest[name] = value
+        if buf.peek() == ',':
+            buf.pos += 1
+            continue
+        buf.expect('}')
+        return
+
+def _iter_array(buf: _Buffer) -> Iterator[Any]:
+    """逐个解析数组元素"""
+    buf.expect('[')
+    if buf.peek() == ']':
+        buf.pos += 1
+        return
+    while True:
+        yield buf.value()
+        if buf.peek() == ',':
+            buf.pos += 1
+            continue
+        buf.expect(']')
+        return
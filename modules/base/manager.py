@@ -1,29 +1,45 @@
 #!/usr/bin/env python3
 
-from typing import Set, Dict, Type, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Set, Dict, Type, List, Callable, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 from .scraper import BaseScraper
+from .http import run_async
+from utils.cache import ResultCache
 from utils.colors import Colors
 from utils.logger import log_info, log_error
-import time
 
 class DataSourceManager:
-    """数据源管理器，用于并发查询多个数据源"""
+    """数据源管理器，用于并发查询多个数据源
     
-    def __init__(self, max_workers=10):
+    所有数据源在同一个事件循环中调度：原生异步的数据源直接 await，同步数据源在线程池中执行，
+    两者共用 max_workers 个并发名额。
+    """
+    
+    def __init__(self, max_workers=10, cache: Optional[ResultCache] = None, refresh: bool = False):
+        """
+        Args:
+            max_workers: 最大并发数
+            cache: 数据源结果缓存，为 None 时不使用缓存
+            refresh: 忽略已有缓存重新查询，并用新结果更新缓存
+        """
         self.sources: Dict[str, Type[BaseScraper]] = {}
         self.max_workers = max_workers
+        self.cache = cache
+        self.refresh = refresh
     
     def register(self, name: str, source_class: Type[BaseScraper]):
         """注册数据源"""
         self.sources[name] = source_class
     
-    def search(self, domain: str, options: Dict[str, bool]) -> Set[str]:
+    def search(self, domain: str, options: Dict[str, bool],
+               callback: Optional[Callable[[str, Set[str]], None]] = None) -> Set[str]:
         """并发搜索所有启用的数据源
         
         Args:
             domain: 目标域名
             options: 数据源选项，如 {'source_name': True/False}
+            callback: 每个数据源完成时以及数据源通过 emit() 送出部分结果时的回调，参数为 (数据源名称, 子域名集合)
         """
         subdomains = set()
         active_sources = []
@@ -35,29 +51,74 @@ class DataSourceManager:
         
         if not active_sources:
             return subdomains
-            
-        start_time = time.time()
         
-        # 创建线程池
-        with ThreadPoolExecutor(max_workers=min(len(active_sources), self.max_workers)) as executor:
-            # 提交任务并记录开始
-            future_to_source = {}
+        # 缓存未过期的数据源直接使用缓存结果
+        if self.cache and not self.refresh:
+            pending_sources = []
             for name, source_class in active_sources:
-                source = source_class()
-                # log_info(f'正在从 {Colors.highlight(name)} {Colors.info("搜索子域名...")}')
-                future_to_source[executor.submit(self._search_source, source, domain)] = (name, source)
-            
-            # 收集结果
-            for future in as_completed(future_to_source):
-                name, source = future_to_source[future]
-                try:
-                    result = future.result()
-                    if result:
-                        subdomains.update(result)
-                        log_info(f'从 {Colors.highlight(name)} {Colors.info("发现")} {Colors.highlight(len(result))} {Colors.info("个子域名")}')
-                except Exception as e:
-                    log_error(f'从 {Colors.highlight(name)} 搜索失败: {str(e)}')
+                cached = self.cache.get(name, domain)
+                if cached is None:
+                    pending_sources.append((name, source_class))
+                    continue
+                result = set(cached)
+                subdomains.update(result)
+                log_info(f'从 {Colors.highlight(name)} {Colors.info("缓存中读取")} {Colors.highlight(len(result))} {Colors.info("个子域名")}')
+                if callback and result:
+                    callback(name, result)
+            active_sources = pending_sources
+            if not active_sources:
+                return subdomains
             
+        sources = []
+        for name, source_class in active_sources:
+            source = source_class()
+            source.result_cache = self.cache
+            source.refresh = self.refresh
+            if callback:
+                # 数据源通过 emit() 提前送出的部分结果也交给回调
+                source.on_partial = lambda result, name=name: callback(name, result)
+            sources.append((name, source))
+        
+        subdomains.update(run_async(self._search_all(sources, domain, callback)))
+        return subdomains
+    
+    async def _search_all(self, sources: List[Tuple[str, BaseScraper]], domain: str,
+                          callback: Optional[Callable[[str, Set[str]], None]]) -> Set[str]:
+        """在事件循环中并发执行数据源，按完成顺序收集结果"""
+        subdomains = set()
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        sync_count = sum(1 for _, source in sources if not source.is_async)
+        executor = ThreadPoolExecutor(max_workers=max(1, min(sync_count, self.max_workers)))
+        
+        async def run(source: BaseScraper) -> Set[str]:
+            async with semaphore:
+                if source.is_async:
+                    return await self._search_source_async(source, domain)
+                return await loop.run_in_executor(executor, self._search_source, source, domain)
+        
+        tasks = {asyncio.ensure_future(run(source)): name for name, source in sources}
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = tasks[task]
+                    try:
+                        result = task.result()
+                        if result:
+                            # 空结果可能是查询出错，不写入缓存
+                            if self.cache:
+                                self.cache.set(name, domain, result)
+                            subdomains.update(result)
+                            log_info(f'从 {Colors.highlight(name)} {Colors.info("发现")} {Colors.highlight(len(result))} {Colors.info("个子域名")}')
+                            if callback:
+                                callback(name, result)
+                    except Exception as e:
+                        log_error(f'从 {Colors.highlight(name)} 搜索失败: {str(e)}')
+        finally:
+            executor.shutdown(wait=True)
+        
         return subdomains
     
     def _search_source(self, source: BaseScraper, domain: str) -> Set[str]:
@@ -66,4 +127,12 @@ class DataSourceManager:
             return source.search(domain)
         except Exception as e:
             log_error(f"数据源查询出错: {str(e)}")
-            return set() 
\ No newline at end of file
+            return set()
+    
+    async def _search_source_async(self, source: BaseScraper, domain: str) -> Set[str]:
+        """执行单个原生异步数据源的搜索"""
+        try:
+            return await source.search_async(domain)
+        except Exception as e:
+            log_error(f"数据源查询出错: {str(e)}")
+            return set()
\ No newline at end of file
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+class CursorPaginator:
+    """通用游标分页器
+
+    从每一页中取出下一页的游标后立即在后台请求下一页，再解析当前页，
+    使解析与网络请求重叠进行。请求速率由数据源会话的共享限速器控制，
+    结果以流的形式逐个返回。
+
+    用法:
+        paginator = CursorPaginator(fetch_page, lambda page: page.get('next'), extract_names, max_pages=20)
+        for name in paginator:
+            ...
+    """
+
+    def __init__(self, fetch: Callable[[Any], Any], next_cursor: Callable[[Any], Optional[Any]],
+                 extract: Callable[[Any], Iterable[Any]], start: Any = None,
+                 max_pages: Optional[int] = None):
+        """
+        Args:
+            fetch: 根据游标请求一页数据，第一页的游标为 start，返回 None 表示没有数据
+            next_cursor: 从一页数据中取出下一页的游标，没有下一页时返回 None 或空值
+            extract: 从一页数据中提取结果
+            start: 第一页的游标
+            max_pages: 最多请求的页数，为 None 时不限制
+        """
+        self.fetch = fetch
+        self.next_cursor = next_cursor
+        self.extract = extract
+        self.start = start
+        self.max_pages = max_pages
+        self.pages = 0
+
+    def __iter__(self) -> Iterator[Any]:
+        seen_cursors = set()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.fetch, self.start)
+            while future is not None:
+                page = future.result()
+                future = None
+                if page is None:
+                    break
+                self.pages += 1
+
+                # 先发出下一页的请求，再解析当前页
+                cursor = self.next_cursor(page)
+                if cursor and cursor not in seen_cursors and (self.max_pages is None or self.pages < self.max_pages):
+                    seen_cursors.add(cursor)
+                    future = executor.submit(self.fetch, cursor)
+
+                yield from self.extract(page)
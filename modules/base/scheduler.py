@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future
+import time
+from .manager import DataSourceManager
+from utils.cache import ResultCache
+from utils.colors import Colors
+from utils.logger import log_info
+
+class ScanScheduler:
+    """扫描调度器
+
+    将所有类别的数据源注册到同一个数据源管理器中，在全局并发数限制下同时执行；
+    DNS 服务器探测、泛解析检测等后台任务与数据源收集并行运行。
+    """
+
+    def __init__(self, max_workers: int = 20, cache: Optional[ResultCache] = None, refresh: bool = False):
+        """
+        Args:
+            max_workers: 数据源全局并发数
+            cache: 数据源结果缓存，为 None 时不使用缓存
+            refresh: 忽略已有缓存重新查询所有数据源
+        """
+        self.manager = DataSourceManager(max_workers=max_workers, cache=cache, refresh=refresh)
+        self.options: Dict[str, bool] = {}
+        self.tasks: Dict[str, Tuple[Callable, tuple, dict]] = {}
+        self.futures: Dict[str, Future] = {}
+
+    def add_category(self, register: Callable[[DataSourceManager], None], **options):
+        """添加一个数据源类别
+
+        Args:
+            register: 类别的注册函数，如 register_ct_sources
+            options: 数据源选项，如 {'source_name': True/False}
+        """
+        register(self.manager)
+        self.options.update(options)
+
+    def add_task(self, name: str, func: Callable, *args, **kwargs):
+        """添加与数据源收集并行执行的后台任务"""
+        self.tasks[name] = (func, args, kwargs)
+
+    def has_sources(self) -> bool:
+        """是否存在启用的数据源"""
+        return any(enabled and name in self.manager.sources for name, enabled in self.options.items())
+
+    def run(self, domain: str, callback: Optional[Callable[[str, Set[str]], None]] = None) -> Set[str]:
+        """启动后台任务并并发查询所有启用的数据源
+
+        Args:
+            domain: 目标域名
+            callback: 每个数据源完成时的回调，用于流式处理结果
+        Returns:
+            Set[str]: 所有数据源发现的子域名
+        """
+        start_time = time.time()
+        executor = ThreadPoolExecutor(max_workers=max(1, len(self.tasks)))
+        try:
+            for name, (func, args, kwargs) in self.tasks.items():
+                self.futures[name] = executor.submit(func, *args, **kwargs)
+
+            subdomains = self.manager.search(domain, self.options, callback=callback)
+        finally:
+            # 不等待后台任务，由 result() 按需等待
+            executor.shutdown(wait=False)
+
+        if self.has_sources():
+            log_info(f'数据源收集完成，用时 {Colors.highlight(f"{time.time() - start_time:.2f}")} {Colors.info("秒")}')
+        return subdomains
+
+    def result(self, name: str, timeout: float = None) -> Any:
+        """等待并获取后台任务的结果，任务中的异常会在此处重新抛出"""
+        return self.futures[name].result(timeout=timeout)
@@ -1,21 +1,38 @@
 #!/usr/bin/env python3
 
-import requests
-from typing import Set
+import asyncio
+import contextlib
+import os
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Union
+import threading
 import time
-import re
 import urllib3
 from utils.colors import Colors
 from utils.config import Config
+from modules.base import extractor
 from modules.base.browser import BrowserBase
+from modules.base.http import AsyncHttpSession, HttpSession, run_async
+from modules.base.json_stream import iter_json_items
 from datetime import datetime
 from utils.retry import retry_on_error
+from utils.http_cache import get_http_cache
 
 # 禁用所有 SSL 警告
 urllib3.disable_warnings()
 
 class BaseScraper:
-    """所有数据源的基类"""
+    """所有数据源的基类
+    
+    同步数据源实现 search()，由数据源管理器在线程池中执行；原生异步的数据源实现 search_async()，
+    通过 async_session 发送请求，由管理器在事件循环中直接 await，不占用线程。
+    两种数据源都可以通过 search() 和 search_async() 调用，另一种方式由基类适配。
+    """
+    
+    # 内容变化缓慢的数据源可开启 HTTP 条件请求缓存
+    http_cache = False
+    # emit() 积累到该数量或距上次送出超过 emit_interval 秒时送出一批子域名
+    emit_batch = 200
+    emit_interval = 2.0
     
     @staticmethod
     def get_timestamp() -> str:
@@ -37,44 +54,190 @@ class BaseScraper:
         return f"[{timestamp}][{symbol}] {message}"
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        self.session.verify = False  # 统一禁用 SSL 验证
+        # 所有数据源共享同一个连接池，请求头和 Cookie 各自独立
+        self.session = HttpSession()
         self.config = Config()
+        # 由数据源管理器设置，流式解析时用于在数据源结束前送出部分结果
+        self.on_partial: Optional[Callable[[Set[str]], None]] = None
+        self._emit_buffer: Set[str] = set()
+        self._emit_time = time.time()
+        self._emit_lock = threading.Lock()
+        # 由数据源管理器设置为本次扫描的结果缓存，--no-cache 时为 None，--refresh 时只写不读
+        self.result_cache = None
+        self.refresh = False
+        self._async_session: Optional[AsyncHttpSession] = None
+    
+    @property
+    def is_async(self) -> bool:
+        """是否为原生异步的数据源（重写了 search_async）"""
+        return type(self).search_async is not BaseScraper.search_async
+    
+    @property
+    def async_session(self) -> AsyncHttpSession:
+        """原生异步数据源使用的 HTTP 会话，需要在事件循环中首次访问"""
+        if self._async_session is None:
+            self._async_session = AsyncHttpSession()
+        return self._async_session
     
     def search(self, domain: str) -> Set[str]:
-        """搜索子域名"""
+        """搜索子域名
+        
+        原生异步的数据源只需实现 search_async()，同步调用时在新的事件循环中执行。
+        """
+        if self.is_async:
+            return run_async(self.search_async(domain))
         raise NotImplementedError("子类必须实现此方法")
     
-    def extract_subdomains(self, content: str, domain: str) -> Set[str]:
-        """从文本中提取子域名"""
-        subdomains = set()
-        pattern = r'[a-zA-Z0-9][-a-zA-Z0-9]*\.' + re.escape(domain)
-        matches = re.finditer(pattern, content)
-        for match in matches:
-            subdomain = match.group(0).lower()
-            if subdomain.endswith(f".{domain}"):
-                subdomains.add(subdomain)
-        return subdomains
-    
-    def _handle_rate_limit(self, response, min_wait=1, max_wait=5):
-        """处理 API 速率限制"""
-        remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
-        if remaining < 10:  # 剩余请求数较少时
-            time.sleep(max_wait)
-        else:
-            time.sleep(min_wait)
-
-    @retry_on_error(max_retries=3, delay=1)
+    async def search_async(self, domain: str) -> Set[str]:
+        """异步搜索子域名，默认在线程中执行同步的 search()"""
+        return await asyncio.to_thread(self.search, domain)
+    
+    def emit(self, *subdomains: str):
+        """在数据源结束前送出已发现的子域名
+        
+        分页或流式读取的数据源每发现子域名就调用，积累成批后交给 on_partial，
+        流式解析管道无需等待整个数据源完成。search() 的返回值仍需包含全部结果。
+        """
+        if self.on_partial is None:
+            return
+        with self._emit_lock:
+            self._emit_buffer.update(subdomains)
+            if len(self._emit_buffer) < self.emit_batch and time.time() - self._emit_time < self.emit_interval:
+                return
+            batch, self._emit_buffer = self._emit_buffer, set()
+            self._emit_time = time.time()
+        if batch:
+            self.on_partial(batch)
+    
+    def cache_get(self, source: str, domain: str, query: str = '') -> Optional[Any]:
+        """读取扫描的结果缓存，未使用缓存或强制刷新时返回 None"""
+        if self.result_cache is None or self.refresh:
+            return None
+        return self.result_cache.get(source, domain, query)
+    
+    def cache_set(self, source: str, domain: str, value: Any, query: str = ''):
+        """写入扫描的结果缓存，未使用缓存时忽略"""
+        if self.result_cache is not None:
+            self.result_cache.set(source, domain, value, query)
+    
+    def extract_subdomains(self, content: Union[str, bytes], domain: str) -> Set[str]:
+        """从文本或字节串中提取子域名，支持多级子域名"""
+        return extractor.extract_subdomains(content, domain)
+    
+    @retry_on_error(max_retries=3, delay=1, circuit_key=lambda self, *args, **kwargs: type(self).__name__)
     def safe_request(self, method, url, **kwargs):
-        """安全的请求方法，带有重试机制"""
+        """安全的请求方法，只重试临时错误，同一数据源连续失败后熔断"""
         kwargs.setdefault('timeout', 10)  # 默认超时时间
+        if self.http_cache and method.upper() == 'GET':
+            return self._cached_request(url, **kwargs)
         response = self.session.request(method, url, **kwargs)
         response.raise_for_status()  # 抛出非 200 状态码的异常
         return response
     
+    @retry_on_error(max_retries=3, delay=1, circuit_key=lambda self, *args, **kwargs: type(self).__name__)
+    async def safe_request_async(self, method, url, **kwargs):
+        """safe_request 的异步版本，使用 async_session，重试等待不阻塞事件循环"""
+        kwargs.setdefault('timeout', 10)  # 默认超时时间
+        response = await self.async_session.request(method, url, **kwargs)
+        response.raise_for_status()  # 抛出非 200 状态码的异常
+        return response
+    
+    def _cached_request(self, url, **kwargs):
+        """带条件请求缓存的 GET 请求，服务端返回 304 时使用本地副本"""
+        cache = get_http_cache()
+        key = cache.key(url, kwargs.get('params'))
+        headers = dict(kwargs.pop('headers', None) or {})
+        response = self.session.request('GET', url, headers={**headers, **cache.conditional_headers(key)}, **kwargs)
+        
+        if response.status_code == 304:
+            cached = cache.load(key)
+            if cached:
+                return self.session.replay(response, *cached)
+            # 本地副本已被淘汰，重新完整请求
+            response = self.session.request('GET', url, headers=headers, **kwargs)
+        
+        response.raise_for_status()  # 抛出非 200 状态码的异常
+        if response.status_code == 200:
+            cache.store(key, url, response.headers, response.content)
+        return response
+    
+    def stream_json(self, method, url, key: Optional[str] = None,
+                    rest: Optional[Dict[str, Any]] = None, **kwargs) -> Iterator[Any]:
+        """流式请求并逐个返回 JSON 数组中的元素，内存占用与响应大小无关
+        
+        开启 http_cache 的数据源会边解析边把响应体写入缓存，304 时直接从本地副本流式读取。
+        收到响应头之前的临时错误与 safe_request 一样重试和熔断，开始读取响应体后不再重试。
+        
+        Args:
+            key: 数组在顶层对象中的键名，为 None 时顶层就是数组
+            rest: 接收顶层对象中除数组外的其他字段
+        """
+        kwargs.setdefault('timeout', 30)
+        cache = get_http_cache() if self.http_cache and method.upper() == 'GET' else None
+        cache_key = cache.key(url, kwargs.get('params')) if cache else None
+        headers = dict(kwargs.pop('headers', None) or {})
+        conditional = cache.conditional_headers(cache_key) if cache else {}
+        
+        # 有本地副本时先发送条件请求，副本在此期间被淘汰则重新完整请求
+        attempts = [{**headers, **conditional}, headers] if conditional else [headers]
+        for request_headers in attempts:
+            stack, response = self._open_stream(method, url, headers=request_headers, **kwargs)
+            with stack:
+                if response.status_code == 304:
+                    body = cache.open_body(cache_key)
+                    if not body:
+                        continue
+                    with body:
+                        yield from iter_json_items(iter(lambda: body.read(1 << 16), b''), key, rest)
+                    return
+                
+                if cache and cache.is_cacheable(response.headers):
+                    yield from self._tee_json(cache, cache_key, url, response, key, rest)
+                else:
+                    yield from iter_json_items(response.iter_bytes(), key, rest)
+                return
+    
+    @retry_on_error(max_retries=3, delay=1, circuit_key=lambda self, *args, **kwargs: type(self).__name__)
+    def _open_stream(self, method, url, **kwargs):
+        """建立流式请求并等待响应头
+        
+        Returns:
+            (ExitStack, 响应)，由调用方在读完响应体后关闭 ExitStack
+        """
+        stack = contextlib.ExitStack()
+        try:
+            response = stack.enter_context(self.session.stream(method, url, **kwargs))
+            if response.status_code != 304:
+                response.raise_for_status()  # 抛出非 200 状态码的异常
+        except BaseException:
+            stack.close()
+            raise
+        return stack, response
+    
+    @staticmethod
+    def _tee_json(cache, cache_key: str, url: str, response, key: Optional[str],
+                  rest: Optional[Dict[str, Any]]) -> Iterator[Any]:
+        """解析响应的同时将响应体写入缓存临时文件，完整读取后移入缓存"""
+        tmp_path = cache.temp_path(cache_key)
+        complete = False
+        try:
+            with open(tmp_path, 'wb') as f:
+                def chunks():
+                    for chunk in response.iter_bytes():
+                        f.write(chunk)
+                        yield chunk
+                
+                body = chunks()
+                yield from iter_json_items(body, key, rest)
+                # 读完数组后剩余的内容也要写入缓存
+                for _ in body:
+                    pass
+            complete = True
+            cache.store_file(cache_key, url, response.headers, tmp_path)
+        finally:
+            if not complete and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
     def get(self, url, **kwargs):
         """GET 请求"""
         return self.safe_request('GET', url, **kwargs)
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from utils.logger import log_info, log_error, log_warning, log_success
 from utils.colors import Colors
 import dns.resolver
@@ -82,7 +82,8 @@ class SubdomainTakeoverChecker:
         # 可以继续添加其他服务的指纹
     }
     
-    def __init__(self, domain: str, dns_records: Dict[str, Dict[str, List[str]]], debug: bool = False):
+    def __init__(self, domain: str, dns_records: Dict[str, Dict[str, List[str]]], debug: bool = False,
+                 cache: Optional[Dict[str, Tuple[bool, str, str]]] = None):
         """
         初始化检测器
         
@@ -90,10 +91,12 @@ class SubdomainTakeoverChecker:
             domain: 目标域名
             dns_records: DNS 解析记录 {'subdomain': {'A': [], 'CNAME': []}}
             debug: 是否显示调试信息
+            cache: 已检查过的 CNAME 目标及其结果，多次调用间共享时同一目标只检查一次
         """
         self.domain = domain
         self.dns_records = dns_records
         self.debug = debug
+        self.cache = cache if cache is not None else {}
         self.vulnerable_domains: Dict[str, Dict] = {}
         
     def check_domain(self, subdomain: str, cname: str) -> Tuple[bool, str, str]:
@@ -142,45 +145,54 @@ class SubdomainTakeoverChecker:
         return False, "", "不匹配任何已知指纹"
     
     def check_all(self) -> Dict[str, Dict]:
-        """检查所有子域名"""
-        domains_to_check = []
+        """检查所有子域名
         
-        # 收集所有需要检查的域名
+        多个子域名指向同一 CNAME 目标时只检查一次，已在缓存中的目标不再重复检查。
+        """
+        # 收集所有需要检查的 CNAME 目标及指向它的子域名
+        targets: Dict[str, List[str]] = {}
         for subdomain, records in self.dns_records.items():
             if 'CNAME' in records and records['CNAME']:
                 for cname in records['CNAME']:
-                    domains_to_check.append((subdomain, cname))
+                    targets.setdefault(cname.lower(), []).append(subdomain)
         
-        if not domains_to_check:
+        if not targets:
             log_info("未发现需要检查的 CNAME 记录")
             return {}
-            
         
-        # 使用线程池并发检查
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_domain = {
-                executor.submit(self.check_domain, subdomain, cname): (subdomain, cname)
-                for subdomain, cname in domains_to_check
-            }
-            
-            for future in as_completed(future_to_domain):
-                subdomain, cname = future_to_domain[future]
-                try:
-                    is_vulnerable, service, details = future.result()
-                    if is_vulnerable:
-                        log_warning(f"发现可能存在接管风险的子域名: {subdomain}")
-                        log_warning(f"  - CNAME: {cname}")
-                        log_warning(f"  - 服务: {service}")
-                        log_warning(f"  - 详情: {details}")
-                        
-                        self.vulnerable_domains[subdomain] = {
-                            'cname': cname,
-                            'service': service,
-                            'details': details
-                        }
-                except Exception as e:
-                    if self.debug:
-                        log_error(f"检查 {subdomain} 时出错: {str(e)}")
+        # 使用线程池并发检查尚未检查过的目标
+        pending = [cname for cname in targets if cname not in self.cache]
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(10, len(pending))) as executor:
+                future_to_cname = {
+                    executor.submit(self.check_domain, targets[cname][0], cname): cname
+                    for cname in pending
+                }
+                
+                for future in as_completed(future_to_cname):
+                    cname = future_to_cname[future]
+                    try:
+                        self.cache[cname] = future.result()
+                    except Exception as e:
+                        if self.debug:
+                            log_error(f"检查 {cname} 时出错: {str(e)}")
+                        self.cache[cname] = (False, "", f"检查出错: {str(e)}")
+        
+        for cname, subdomains in targets.items():
+            is_vulnerable, service, details = self.cache[cname]
+            if not is_vulnerable:
+                continue
+            for subdomain in subdomains:
+                log_warning(f"发现可能存在接管风险的子域名: {subdomain}")
+                log_warning(f"  - CNAME: {cname}")
+                log_warning(f"  - 服务: {service}")
+                log_warning(f"  - 详情: {details}")
+                
+                self.vulnerable_domains[subdomain] = {
+                    'cname': cname,
+                    'service': service,
+                    'details': details
+                }
         
         # 打印结果统计
         if self.vulnerable_domains:
@@ -193,7 +205,8 @@ class SubdomainTakeoverChecker:
             
         return self.vulnerable_domains
 
-def check_takeover(domain: str, dns_records: Dict[str, Dict[str, List[str]]], debug: bool = False) -> Dict[str, Dict]:
+def check_takeover(domain: str, dns_records: Dict[str, Dict[str, List[str]]], debug: bool = False,
+                   cache: Optional[Dict[str, Tuple[bool, str, str]]] = None) -> Dict[str, Dict]:
     """
     检查子域名接管风险
     
@@ -201,9 +214,10 @@ def check_takeover(domain: str, dns_records: Dict[str, Dict[str, List[str]]], de
         domain: 目标域名
         dns_records: DNS 解析记录
         debug: 是否显示调试信息
+        cache: 已检查过的 CNAME 目标及其结果
     
     Returns:
         Dict[str, Dict]: 检测结果
     """
-    checker = SubdomainTakeoverChecker(domain, dns_records, debug)
+    checker = SubdomainTakeoverChecker(domain, dns_records, debug, cache)
     return checker.check_all() 
\ No newline at end of file
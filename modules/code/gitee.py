@@ -1,12 +1,37 @@
 #!/usr/bin/env python3
 
-from typing import Set
+from typing import Dict, Iterator, Optional, Set
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import base64
+import os
+import threading
+import time
 from ..base.scraper import BaseScraper
 from utils.colors import Colors
 
+# 不下载的二进制文件扩展名
+BINARY_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.svg', '.psd',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar', '.tar', '.jar', '.war',
+    '.exe', '.dll', '.so', '.dylib', '.bin', '.class', '.pyc', '.o', '.a',
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    '.mp3', '.mp4', '.avi', '.mov', '.wav', '.flac',
+    '.ttf', '.otf', '.woff', '.woff2', '.eot', '.apk', '.ipa', '.db', '.sqlite',
+}
+
 class GiteeScraper(BaseScraper):
-    """Gitee 代码搜索"""
+    """Gitee 代码搜索
+    
+    按查询搜索仓库，多个仓库由线程池并发遍历。每个仓库通过 Git Tree API 一次获取完整文件列表，
+    跳过二进制文件和大文件，文件内容按 blob SHA 持久缓存。整次搜索受时间和下载字节数预算限制。
+    """
+    
+    max_workers = 5                   # 并发遍历的仓库数
+    max_pages = 3                     # 每个查询最多获取的仓库搜索页数
+    max_files_per_repo = 100          # 每个仓库最多下载的文件数
+    max_file_size = 512 * 1024        # 超过该大小的文件不下载（字节）
+    time_budget = 300                 # 整次搜索的时间预算（秒）
+    byte_budget = 50 * 1024 * 1024    # 整次搜索的下载字节数预算
     
     def __init__(self):
         super().__init__()
@@ -15,6 +40,99 @@ class GiteeScraper(BaseScraper):
             self.session.headers.update({
                 'Accept': 'application/json'
             })
+        self._lock = threading.Lock()
+        self._stop = threading.Event()  # 预算用尽时停止下载
+        self._deadline = 0.0
+        self._bytes = 0
+        self._seen_blobs: Set[str] = set()
+    
+    def _check_budget(self) -> bool:
+        """预算是否仍有剩余，用尽时通知所有线程停止"""
+        if self._stop.is_set():
+            return False
+        if time.time() > self._deadline or self._bytes > self.byte_budget:
+            print(Colors.warning("[!] Gitee 搜索达到时间或流量预算，停止下载"))
+            self._stop.set()
+            return False
+        return True
+    
+    def _get(self, url: str, params: Optional[Dict] = None, timeout: int = 15):
+        """带 access_token 的 GET 请求，被限速时最多重试 3 次"""
+        params = dict(params or {}, access_token=self.token)
+        for _ in range(3):
+            response = self.session.get(url, params=params, timeout=timeout)
+            # 等待时间由共享限速器根据响应头控制
+            if not self.session.is_rate_limited(response):
+                break
+            print("[!] 触发速率限制，等待重试...")
+        return response
+    
+    def _iter_repos(self, query: str) -> Iterator[Dict]:
+        """逐页返回查询匹配的仓库"""
+        url = "https://gitee.com/api/v5/search/repositories"
+        for page in range(1, self.max_pages + 1):
+            if not self._check_budget():
+                return
+            response = self._get(url, {'q': query, 'per_page': 100, 'page': page})
+            if response.status_code != 200:
+                print(f"[-] API 请求失败，状态码: {response.status_code}")
+                return
+            repos = response.json()
+            if not repos:  # 没有更多结果
+                return
+            yield from repos
+    
+    @staticmethod
+    def _is_text_file(entry: Dict, max_size: int) -> bool:
+        """根据扩展名和大小判断是否值得下载"""
+        if entry.get('type') != 'blob' or entry.get('size', 0) > max_size:
+            return False
+        return os.path.splitext(entry.get('path', ''))[1].lower() not in BINARY_EXTENSIONS
+    
+    def _search_repo(self, repo: Dict, domain: str) -> Set[str]:
+        """遍历一个仓库的文件并提取子域名"""
+        subdomains = set()
+        full_name = repo['full_name']
+        branch = repo.get('default_branch') or 'master'
+        
+        if not self._check_budget():
+            return subdomains
+        response = self._get(f"https://gitee.com/api/v5/repos/{full_name}/git/trees/{branch}", {'recursive': 1})
+        if response.status_code != 200:
+            return subdomains
+        
+        files = [entry for entry in response.json().get('tree', []) if self._is_text_file(entry, self.max_file_size)]
+        for entry in files[:self.max_files_per_repo]:
+            sha = entry['sha']
+            with self._lock:
+                if sha in self._seen_blobs:
+                    continue
+                self._seen_blobs.add(sha)
+            
+            cached = self.cache_get('gitee_blob', domain, sha)
+            if cached is not None:
+                subdomains.update(cached)
+                continue
+            if not self._check_budget():
+                break
+            
+            try:
+                blob = self._get(f"https://gitee.com/api/v5/repos/{full_name}/git/blobs/{sha}", timeout=10)
+                if blob.status_code != 200:
+                    continue
+                data = base64.b64decode(blob.json().get('content') or '')
+                with self._lock:
+                    self._bytes += len(data)
+                if b'\x00' in data[:8192]:  # 没有扩展名的二进制文件
+                    found = set()
+                else:
+                    found = self.extract_subdomains(data, domain)
+                self.cache_set('gitee_blob', domain, found, sha)
+                subdomains.update(found)
+            except Exception as e:
+                print(f"[-] 获取文件内容失败: {str(e)}")
+        
+        return subdomains
     
     def search(self, domain: str) -> Set[str]:
         """从 Gitee 搜索子域名"""
@@ -38,56 +156,32 @@ class GiteeScraper(BaseScraper):
             f'"{domain}" filename:hosts',    # Hosts 文件
         ]
         
-        for query in queries:
-            try:
-                url = "https://gitee.com/api/v5/search/repositories"
-                params = {
-                    'access_token': self.token,
-                    'q': query,
-                    'per_page': 100,
-                    'page': 1
-                }
-                
-                while True:
-                    response = self.safe_request('GET', url, params=params, timeout=15)
-                    if response.status_code == 200:
-                        repos = response.json()
-                        if not repos:  # 没有更多结果
-                            break
-                            
-                        for repo in repos:
-                            # 搜索仓库内容
-                            try:
-                                content_url = f"https://gitee.com/api/v5/repos/{repo['full_name']}/contents"
-                                content_response = self.session.get(content_url, timeout=10)
-                                if content_response.status_code == 200:
-                                    files = content_response.json()
-                                    for file in files:
-                                        if file['type'] == 'file':
-                                            # 获取文件内容
-                                            download_url = file['download_url']
-                                            file_response = self.session.get(download_url, timeout=10)
-                                            if file_response.status_code == 200:
-                                                content = file_response.text
-                                                subdomains.update(self.extract_subdomains(content, domain))
-                            except Exception as e:
-                                print(f"[-] 获取仓库内容失败: {str(e)}")
-                                continue
-                        
-                        params['page'] += 1  # 下一页
-                        self._handle_rate_limit(response)
-                        
-                    elif response.status_code == 403:  # 速率限制
-                        print("[!] 触发速率限制，等待重试...")
-                        self._handle_rate_limit(response, max_wait=30)
-                        continue
-                    else:
-                        print(f"[-] API 请求失败，状态码: {response.status_code}")
-                        break
-                    
-            except Exception as e:
-                print(f"[-] 搜索失败 ({query}): {str(e)}")
-                continue
+        self._stop = threading.Event()
+        self._deadline = time.time() + self.time_budget
+        self._bytes = 0
+        self._seen_blobs = set()
+        seen_repos = set()
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = []
+            for query in queries:
+                try:
+                    for repo in self._iter_repos(query):
+                        # 同一仓库可能被多个查询命中，只遍历一次
+                        if repo.get('full_name') and repo['full_name'] not in seen_repos:
+                            seen_repos.add(repo['full_name'])
+                            futures.append(executor.submit(self._search_repo, repo, domain))
+                except Exception as e:
+                    print(f"[-] 搜索失败 ({query}): {str(e)}")
+                    continue
+            
+            for future in as_completed(futures):
+                try:
+                    found = future.result()
+                    subdomains.update(found)
+                    self.emit(*found)
+                except Exception as e:
+                    print(f"[-] 获取仓库内容失败: {str(e)}")
         
         return subdomains
 
@@ -1,18 +1,22 @@
 #!/usr/bin/env python3
 
-import requests
-import json
-from typing import Set
-import time
-import re
-import base64
-from utils.config import Config
-from .scraper import CodeScraper
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Set
 from ..base.scraper import BaseScraper
+from ..base.extractor import extract_from_stream
 from utils.colors import Colors
 
 class GitHubScraper(BaseScraper):
-    """GitHub 代码搜索"""
+    """GitHub 代码搜索
+    
+    优先使用搜索结果中的匹配片段，只有片段未覆盖整个文件时才下载完整内容，
+    下载结果按 blob SHA 持久缓存，相同内容在多次查询和多次扫描之间只下载一次。
+    """
+    
+    # 并发下载文件内容的线程数
+    max_workers = 8
+    # 每次扫描最多下载的文件数
+    max_blob_fetches = 200
     
     def __init__(self):
         super().__init__()
@@ -23,26 +27,6 @@ class GitHubScraper(BaseScraper):
                 'Accept': 'application/vnd.github+json'
             })
     
-    def _handle_rate_limit(self, response):
-        """处理 API 速率限制"""
-        remaining = int(response.headers.get('X-RateLimit-Remaining', 0))
-        limit = int(response.headers.get('X-RateLimit-Limit', 0))
-        reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
-        
-        # 如果剩余请求数小于总限制的 10%，则进行等待
-        if remaining < limit * 0.1:
-            wait_time = reset_time - int(time.time())
-            if wait_time > 0:
-                print(f"[*] API 剩余请求数: {remaining}/{limit}")
-                print(f"[*] 等待 {wait_time} 秒后继续...")
-                time.sleep(min(wait_time, 30))  # 最多等待 30 秒
-        elif remaining < limit * 0.2:
-            # 剩余请求数较少时，增加请求间隔
-            time.sleep(5)
-        else:
-            # 正常请求间隔
-            time.sleep(1)
-
     def search(self, domain: str) -> Set[str]:
         """从 GitHub 搜索子域名"""
         subdomains = set()
@@ -101,6 +85,8 @@ class GitHubScraper(BaseScraper):
         #     f'"{domain}" filename:hosts',                  # Hosts 文件
         ]
         
+        pending = {}  # blob SHA -> 需要下载完整内容的文件
+        
         for query in queries:
             try:
                 url = "https://api.github.com/search/code"
@@ -108,42 +94,70 @@ class GitHubScraper(BaseScraper):
                     'q': query,
                     'per_page': 100
                 }
+                # 让搜索结果附带匹配片段，多数文件无需再下载完整内容
+                headers = {'Accept': 'application/vnd.github.text-match+json'}
                 
-                response = self.get(url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    if 'items' in data:
-                        for item in data['items']:
-                            if 'url' in item:
-                                try:
-                                    content_response = self.session.get(item['url'], timeout=10)
-                                    if content_response.status_code == 200:
-                                        content_data = content_response.json()
-                                        if 'content' in content_data:
-                                            content = base64.b64decode(content_data['content']).decode('utf-8', errors='ignore')
-                                            
-                                            # 使用正则表达式查找子域名
-                                            pattern = r'[a-zA-Z0-9][-a-zA-Z0-9]*\.' + re.escape(domain)
-                                            matches = re.finditer(pattern, content)
-                                            for match in matches:
-                                                subdomain = match.group(0).lower()
-                                                if subdomain.endswith(f".{domain}"):
-                                                    subdomains.add(subdomain)
-                                except Exception as e:
-                                    print(Colors.error(f"[-] 获取文件内容失败: {str(e)}"))
-                                    continue
-                elif response.status_code == 403:  # 速率限制
+                # 请求间隔由共享限速器根据 X-RateLimit-* 响应头控制
+                for _ in range(3):
+                    response = self.session.get(url, params=params, headers=headers)
+                    if not self.session.is_rate_limited(response):
+                        break
                     print("[!] 触发速率限制，等待重试...")
-                    self._handle_rate_limit(response)
-                    continue
                 
-                # 处理速率限制
-                self._handle_rate_limit(response)
+                if response.status_code == 200:
+                    for item in response.json().get('items', []):
+                        sha = item.get('sha')
+                        fragments = [match.get('fragment') or '' for match in item.get('text_matches', [])]
+                        subdomains.update(self.extract_subdomains(' '.join(fragments), domain))
+                        
+                        # 片段已覆盖整个文件，或同一内容已处理过时不再下载；没有文件大小时按未覆盖处理
+                        file_size = item.get('file_size')
+                        if not sha or sha in pending or (file_size is not None and sum(map(len, fragments)) >= file_size):
+                            continue
+                        cached = self.cache_get('github_blob', domain, sha)
+                        if cached is not None:
+                            subdomains.update(cached)
+                        elif 'git_url' in item:
+                            pending[sha] = item['git_url']
+                elif self.session.is_rate_limited(response):
+                    print("[!] 多次触发速率限制，跳过当前查询")
                 
             except Exception as e:
                 print(Colors.error(f"[-] 搜索失败 ({query}): {str(e)}"))
                 continue
         
+        subdomains.update(self._fetch_blobs(pending, domain))
+        return subdomains
+    
+    def _fetch_blobs(self, blobs: Dict[str, str], domain: str) -> Set[str]:
+        """并发下载文件内容并提取子域名，结果按 blob SHA 缓存
+        
+        Args:
+            blobs: blob SHA 到 Git Blob API 地址的映射
+        """
+        subdomains = set()
+        if len(blobs) > self.max_blob_fetches:
+            print(Colors.warning(f"[!] 待下载文件过多，只下载前 {self.max_blob_fetches} 个"))
+            blobs = dict(list(blobs.items())[:self.max_blob_fetches])
+        
+        def fetch(sha: str, url: str) -> Set[str]:
+            # raw 格式直接返回文件内容，省去 base64 解码，边下载边提取
+            with self.session.stream('GET', url, headers={'Accept': 'application/vnd.github.raw'}, timeout=10) as response:
+                response.raise_for_status()
+                found = extract_from_stream(response.iter_bytes(), domain)
+            self.cache_set('github_blob', domain, found, sha)
+            return found
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(fetch, sha, url) for sha, url in blobs.items()]
+            for future in as_completed(futures):
+                try:
+                    found = future.result()
+                    subdomains.update(found)
+                    self.emit(*found)
+                except Exception as e:
+                    print(Colors.error(f"[-] 获取文件内容失败: {str(e)}"))
+        
         return subdomains
     
     def _search_issues(self, domain: str) -> Set[str]:
@@ -168,14 +182,7 @@ class GitHubScraper(BaseScraper):
                     for item in data['items']:
                         # 搜索 issue 标题和内容
                         content = f"{item.get('title', '')} {item.get('body', '')}"
-                        pattern = r'[a-zA-Z0-9][-a-zA-Z0-9]*\.' + re.escape(domain)
-                        matches = re.finditer(pattern, content)
-                        for match in matches:
-                            subdomain = match.group(0).lower()
-                            if subdomain.endswith(f".{domain}"):
-                                subdomains.add(subdomain)
-            
-            time.sleep(2)
+                        subdomains.update(self.extract_subdomains(content, domain))
             
         except Exception as e:
             print(Colors.error(f"[-] Issues 搜索失败: {str(e)}"))
@@ -6,10 +6,13 @@ from scouter import log_warning
 from .scraper import CTScraper
 from utils.config import Config
 from utils.colors import Colors
+from ..base.paginator import CursorPaginator
 
 class CensysScraper(CTScraper):
     """Censys 证书透明度日志搜索"""
     
+    max_pages = 10  # 最多翻页数，每页消耗一次查询额度
+    
     def __init__(self):
         super().__init__()
         self.config = Config()
@@ -34,16 +37,26 @@ class CensysScraper(CTScraper):
         }
         auth = (self.api_id, self.api_secret)
         
+        def fetch(cursor):
+            page_params = dict(params, cursor=cursor) if cursor else params
+            return self.get(url, params=page_params, headers=headers, auth=auth, timeout=10).json().get('result') or {}
+        
+        def extract(result):
+            for hit in result.get('hits', []):
+                yield from hit.get('parsed', {}).get('names', []) or hit.get('names', [])
+        
+        paginator = CursorPaginator(
+            fetch,
+            lambda result: result.get('links', {}).get('next'),
+            extract,
+            max_pages=self.max_pages
+        )
+        
         try:
-            response = self.session.get(url, params=params, headers=headers, auth=auth, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if 'result' in data and 'hits' in data['result']:
-                    for hit in data['result']['hits']:
-                        if 'parsed' in hit and 'names' in hit['parsed']:
-                            for name in hit['parsed']['names']:
-                                if name.endswith(f".{domain}"):
-                                    subdomains.add(name.lower())
+            for name in paginator:
+                if name.endswith(f".{domain}"):
+                    subdomains.add(name.lower())
+                    self.emit(name.lower())
                                     
         except Exception as e:
             print(f"[-] 从 Censys 获取数据失败: {str(e)}")
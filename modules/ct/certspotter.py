@@ -2,10 +2,13 @@
 
 from typing import Set
 from .scraper import CTScraper
+from ..base.paginator import CursorPaginator
 
 class CertspotterScraper(CTScraper):
     """Certspotter 证书透明度日志搜索"""
     
+    max_pages = 50  # 最多翻页数
+    
     def search(self, domain: str) -> Set[str]:
         """从 Certspotter 查询子域名"""
         subdomains = set()
@@ -16,17 +19,25 @@ class CertspotterScraper(CTScraper):
             'expand': 'dns_names'
         }
         
+        def fetch(after):
+            # 使用上一页最后一条记录的 id 作为游标
+            page_params = dict(params, after=after) if after else params
+            return self.get(url, params=page_params, timeout=10).json()
+        
+        paginator = CursorPaginator(
+            fetch,
+            lambda page: page[-1].get('id') if page else None,
+            lambda page: (dns_name for cert in page for dns_name in cert.get('dns_names', [])),
+            max_pages=self.max_pages
+        )
+        
         try:
-            response = self.session.get(url, params=params, timeout=10, verify=False)
-            if response.status_code == 200:
-                data = response.json()
-                for cert in data:
-                    if 'dns_names' in cert:
-                        for dns_name in cert['dns_names']:
-                            if dns_name.endswith(f".{domain}"):
-                                subdomains.add(dns_name.lower())
+            for dns_name in paginator:
+                if dns_name.endswith(f".{domain}"):
+                    subdomains.add(dns_name.lower())
+                    self.emit(dns_name.lower())
                                 
         except Exception as e:
             print(f"[-] 从 Certspotter 获取数据失败: {str(e)}")
         
-        return subdomains 
\ No newline at end of file
+        return subdomains
@@ -6,6 +6,8 @@ from .scraper import CTScraper
 class CrtshScraper(CTScraper):
     """crt.sh 证书透明度日志搜索"""
     
+    http_cache = True
+    
     def search(self, domain: str) -> Set[str]:
         """从 crt.sh 查询子域名"""
         subdomains = set()
@@ -16,16 +18,13 @@ class CrtshScraper(CTScraper):
         for query in query_list:
             url = f"https://crt.sh/?q={query}&output=json"
             try:
-                response = self.safe_request('GET', url, timeout=10, verify=False)
-                if response.status_code == 200:
-                    data = response.json()
-                    for entry in data:
-                        # 获取域名列表
-                        domain_names = [name.strip() for name in entry['name_value'].split('\n')]
-                        # 添加到结果集
-                        subdomains.update(domain_names)
-                    # 清理结果
-                    subdomains = {subdomain for subdomain in subdomains if subdomain.endswith(f".{domain}")}
+                # 大域名的响应可达数百 MB，逐条解析证书记录，只保留子域名
+                for entry in self.stream_json('GET', url, timeout=60):
+                    for name in entry.get('name_value', '').split('\n'):
+                        name = name.strip().lower()
+                        if name.endswith(f".{domain}"):
+                            subdomains.add(name)
+                            self.emit(name)
                     
             except Exception as e:
                 print(f"[-] 从 crt.sh 获取数据失败: {str(e)}")
@@ -14,10 +14,8 @@ class IntelligenceScraper(BaseScraper):
         raise NotImplementedError("子类必须实现此方法")
     
     
-def get_intelligence_subdomains(domain: str, **kwargs) -> Set[str]:
-    """从多个威胁情报平台获取子域名"""
-    manager = DataSourceManager()
-    
+def register_intelligence_sources(manager: DataSourceManager):
+    """注册威胁情报平台数据源"""
     from .alienvault import AlienVaultScraper
     from .threatbook import ThreatBookScraper
     from .virustotal import VirusTotalScraper
@@ -25,5 +23,9 @@ def get_intelligence_subdomains(domain: str, **kwargs) -> Set[str]:
     manager.register('alienvault', AlienVaultScraper)
     manager.register('threatbook', ThreatBookScraper)
     manager.register('virustotal', VirusTotalScraper)
-    
+
+def get_intelligence_subdomains(domain: str, **kwargs) -> Set[str]:
+    """从多个威胁情报平台获取子域名"""
+    manager = DataSourceManager()
+    register_intelligence_sources(manager)
     return manager.search(domain, kwargs)
\ No newline at end of file
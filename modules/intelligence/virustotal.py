@@ -2,6 +2,7 @@
 from typing import Set
 from utils.logger import log_error, log_info, log_warning
 from .scraper import IntelligenceScraper
+from ..base.paginator import CursorPaginator
 
 class VirusTotalScraper(IntelligenceScraper):
     """
@@ -11,6 +12,8 @@ class VirusTotalScraper(IntelligenceScraper):
     API 文档: https://developers.virustotal.com/reference
     """
     
+    max_pages = 4  # 默认最多翻页数，可通过 virustotal.max_pages 配置
+    
     def search(self, domain: str) -> Set[str]:
         subdomains = set()
         api_key = self.config.get_api_key('virustotal', 'api_key')
@@ -18,21 +21,25 @@ class VirusTotalScraper(IntelligenceScraper):
         if not api_key:
             log_warning("VirusTotal API 密钥未配置")
             return subdomains
+        max_pages = int(self.config.get_api_key('virustotal', 'max_pages') or self.max_pages)
             
         try:
-            url = f"https://www.virustotal.com/api/v3/domains/{domain}/subdomains"
+            url = f"https://www.virustotal.com/api/v3/domains/{domain}/subdomains?limit=40"
             headers = {'x-apikey': api_key}
             
-            response = self.get(url, headers=headers)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if 'data' in data:
-                    for item in data['data']:
-                        if 'id' in item:
-                            subdomain = item['id'].lower()
-                            if subdomain.endswith(f".{domain}"):
-                                subdomains.add(subdomain)
+            # links.next 是下一页的完整 URL
+            paginator = CursorPaginator(
+                lambda page_url: self.get(page_url, headers=headers).json(),
+                lambda data: data.get('links', {}).get('next'),
+                lambda data: (item['id'] for item in data.get('data', []) if 'id' in item),
+                start=url,
+                max_pages=max_pages
+            )
+            for item_id in paginator:
+                subdomain = item_id.lower()
+                if subdomain.endswith(f".{domain}"):
+                    subdomains.add(subdomain)
+                    self.emit(subdomain)
                                 
         except Exception as e:
             log_error(f"VirusTotal 查询失败: {str(e)}")
@@ -2,7 +2,6 @@
 
 from typing import Set
 from .scraper import PublicDNSScraper
-import time
 
 class DNSDumpsterScraper(PublicDNSScraper):
     """DNSDumpster 子域名搜索"""
@@ -33,8 +32,7 @@ class DNSDumpsterScraper(PublicDNSScraper):
                         if name.endswith(f".{domain}"):
                             subdomains.add(name)
                     
-                    page += 1  # 获取下一页
-                    time.sleep(1)  # API 速率限制
+                    page += 1  # 获取下一页，请求间隔由共享限速器控制
                 else:
                     break
                 
@@ -8,15 +8,15 @@ from .scraper import PublicDNSScraper
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 class HackertargetScraper(PublicDNSScraper):
-    """Hackertarget 子域名搜索"""
+    """Hackertarget 子域名搜索（原生异步）"""
     
-    def search(self, domain: str) -> Set[str]:
+    async def search_async(self, domain: str) -> Set[str]:
         """从 hackertarget 查询子域名"""
         subdomains = set()
         url = f"https://api.hackertarget.com/hostsearch/?q={domain}"
         
         try:
-            response = self.session.get(url, timeout=10, verify=False)
+            response = await self.async_session.get(url, timeout=10)
             if response.status_code == 200:
                 lines = response.text.splitlines()
                 for line in lines:
@@ -3,8 +3,6 @@
 from typing import Set
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
 
 from utils.logger import log_error
 from ..base.scraper import BrowserScraper
@@ -13,6 +11,10 @@ from utils.colors import Colors
 class NetcraftScraper(BrowserScraper):
     """Netcraft 子域名搜索"""
     
+    # 结果表只需要文本
+    lean = True
+    results_selector = '.results-table'
+    
     def search(self, domain: str) -> Set[str]:
         """从 Netcraft 查询子域名"""
         subdomains = set()
@@ -24,14 +26,13 @@ class NetcraftScraper(BrowserScraper):
             
             # 访问搜索页面
             self.safe_get(search_url)
-            time.sleep(3)
+            self.wait_for_dom_settle()
             
             # 检查并点击 Accept Cookies 按钮
             try:
                 cookie_button = self.driver.find_element(By.CSS_SELECTOR, "button.btn-info.teal[data-value='1']")
                 if cookie_button.is_displayed():
                     cookie_button.click()
-                    time.sleep(1)
             except:
                 pass
             
@@ -53,8 +54,8 @@ class NetcraftScraper(BrowserScraper):
                 # 如果有结果，继续处理
                 while True:
                     # 获取当前页面的子域名
-                    for element in self.driver.find_elements(By.CLASS_NAME, "results-table__host"):
-                        subdomain = element.text.strip().lower()
+                    for element in self.collect_elements(".results-table__host"):
+                        subdomain = element['innerText'].strip().lower()
                         if subdomain.endswith(f".{domain}"):
                             subdomains.add(subdomain)
                     
@@ -64,14 +65,11 @@ class NetcraftScraper(BrowserScraper):
                         if not next_button.is_enabled():
                             break
                         
-                        self.driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-                        time.sleep(0.5)
-                        
+                        before = self.results_signature(self.results_selector)
                         self.driver.execute_script("arguments[0].click();", next_button)
                         
-                        WebDriverWait(self.driver, 10).until(
-                            EC.staleness_of(next_button)
-                        )
+                        if not self.wait_for_results_change(self.results_selector, before):
+                            break
                     except:
                         break
                 
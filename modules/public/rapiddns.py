@@ -11,6 +11,8 @@ class RapidDNSScraper(PublicDNSScraper):
     数据源: https://rapiddns.io/
     """
     
+    http_cache = True
+    
     def search(self, domain: str) -> Set[str]:
         """
         从 RapidDNS 获取子域名
@@ -24,9 +24,9 @@ class RobtexScraper(BrowserScraper):
             )
             
             # 查找所有链接元素
-            elements = self.driver.find_elements(By.CSS_SELECTOR, "a[href^='https://www.robtex.com/dns-lookup/']")
+            elements = self.collect_elements("a[href^='https://www.robtex.com/dns-lookup/']", ('href',))
             for element in elements:
-                href = element.get_attribute('href')
+                href = element['href']
                 # 从 href 中提取子域名
                 subdomain = href.split('dns-lookup/')[1].strip().lower()
                 if subdomain.endswith(f".{domain}"):
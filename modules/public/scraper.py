@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 
-import requests
 from typing import Set
 
 from ..base.scraper import BaseScraper
@@ -11,18 +10,10 @@ class PublicDNSScraper(BaseScraper):
     
     def __init__(self):
         super().__init__()
-        
-    
-    def search(self, domain: str) -> Set[str]:
-        """搜索子域名"""
-        raise NotImplementedError("子类必须实现此方法")
     
 
-def get_public_dns_subdomains(domain: str, **kwargs) -> Set[str]:
-    """从多个公共 DNS 数据源获取子域名"""
-    manager = DataSourceManager()
-    
-    # 注册数据源
+def register_public_dns_sources(manager: DataSourceManager):
+    """注册公共 DNS 数据源"""
     from .ip138 import IP138Scraper
     from .hackertarget import HackertargetScraper
     from .securitytrails import SecurityTrailsScraper
@@ -44,4 +35,9 @@ def get_public_dns_subdomains(domain: str, **kwargs) -> Set[str]:
     manager.register('bevigil', BeVigilScraper)
     manager.register('rapiddns', RapidDNSScraper)
     manager.register('urlscan', URLScanScraper)
+
+def get_public_dns_subdomains(domain: str, **kwargs) -> Set[str]:
+    """从多个公共 DNS 数据源获取子域名"""
+    manager = DataSourceManager()
+    register_public_dns_sources(manager)
     return manager.search(domain, kwargs) 
\ No newline at end of file
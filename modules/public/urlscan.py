@@ -40,25 +40,21 @@ class URLScanScraper(PublicDNSScraper):
                 'Content-Type': 'application/json'
             }
             
-            # 发送请求
-            response = self.get(url, params=params, headers=headers)
-            
-            # 解析响应
-            if response.status_code == 200:
-                data = response.json()
-                if 'results' in data:
-                    for result in data['results']:
-                        # 从 page 和 task 数据中提取子域名
-                        if 'page' in result:
-                            domain_name = result['page'].get('domain', '')
-                            if domain_name and domain_name.endswith(f".{domain}"):
-                                subdomains.add(domain_name.lower())
-                        
-                        # 从 task 数据中提取子域名
-                        if 'task' in result:
-                            domain_name = result['task'].get('domain', '')
-                            if domain_name and domain_name.endswith(f".{domain}"):
-                                subdomains.add(domain_name.lower())
+            # 发送请求并逐条解析结果
+            for result in self.stream_json('GET', url, key='results', params=params, headers=headers):
+                # 从 page 和 task 数据中提取子域名
+                if 'page' in result:
+                    domain_name = result['page'].get('domain', '')
+                    if domain_name and domain_name.endswith(f".{domain}"):
+                        subdomains.add(domain_name.lower())
+                        self.emit(domain_name.lower())
+                
+                # 从 task 数据中提取子域名
+                if 'task' in result:
+                    domain_name = result['task'].get('domain', '')
+                    if domain_name and domain_name.endswith(f".{domain}"):
+                        subdomains.add(domain_name.lower())
+                        self.emit(domain_name.lower())
                                 
         except Exception as e:
             log_error(f"URLScan 查询失败: {str(e)}")
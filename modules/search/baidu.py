@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 
 from typing import Set
-import time
+from urllib.parse import quote
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -11,6 +11,16 @@ from utils.colors import Colors
 class BaiduScraper(SearchEngineScraper):
     """百度搜索引擎"""
     
+    results_selector = '#content_left'
+    min_page_interval = 1  # 翻页过快会触发安全验证
+    max_pages = 100
+    next_marker = '下一页'
+    result_attributes = ('mu',)
+    captcha_keywords = ('安全验证', 'wappass.baidu.com/static/captcha')
+    
+    def page_url(self, query: str, page: int) -> str:
+        return f"https://www.baidu.com/s?wd={quote(query)}&pn={(page - 1) * 10}"
+    
     def _is_last_page(self) -> bool:
         """检查是否是最后一页"""
         try:
@@ -34,7 +44,6 @@ class BaiduScraper(SearchEngineScraper):
             
             # 访问百度首页
             self.safe_get("https://www.baidu.com")
-            time.sleep(1)
             
             # 搜索
             search_input = WebDriverWait(self.driver, 10).until(
@@ -45,6 +54,7 @@ class BaiduScraper(SearchEngineScraper):
             
             # 点击搜索
             search_button = self.driver.find_element(By.ID, "su")
+            self.pace()
             search_button.click()
             
             # 等待结果
@@ -52,36 +62,39 @@ class BaiduScraper(SearchEngineScraper):
                 EC.presence_of_element_located((By.CLASS_NAME, "result"))
             )
             
+            if self.hybrid:
+                # 第 1 页在浏览器中处理，之后的页通过 HTTP 并发获取
+                if self.is_captcha(self.driver.page_source, self.driver.current_url):
+                    print(self.format_log('-', Colors.warning("百度搜索遇到验证码"), Colors.warning))
+                    return subdomains
+                subdomains.update(self.extract_page_subdomains(
+                    domain, "div.result.c-container.xpath-log.new-pmd", attributes=('mu',)
+                ))
+                if not self._is_last_page():
+                    subdomains.update(self.paginate_http(f"site:{domain}", domain))
+                return subdomains
+            
             page_num = 1
-            max_pages = 100  # 最多爬取50页
             max_retries = 3  # 每页最多重试3次
             
-            while page_num <= max_pages:
+            while page_num <= self.max_pages:
                 # 检查验证码
-                if '安全验证' in self.driver.page_source:
+                if self.is_captcha(self.driver.page_source, self.driver.current_url):
                     print(self.format_log('-', Colors.warning("百度搜索遇到验证码"), Colors.warning))
                     break
                 
                 retry_count = 0
                 while retry_count < max_retries:
                     try:
-                        # 提取域名
-                        results = WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div.result.c-container.xpath-log.new-pmd"))
+                        # 等待结果出现
+                        WebDriverWait(self.driver, 10).until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR, "div.result.c-container.xpath-log.new-pmd"))
                         )
                         
-                        for result in results:
-                            try:
-                                # 从 mu 属性中提取 URL
-                                mu = result.get_attribute('mu')
-                                if mu:
-                                    subdomains.update(self.extract_subdomains(mu.lower(), domain))
-                                
-                                # 从文本内容中提取域名
-                                text = result.text.lower()
-                                subdomains.update(self.extract_subdomains(text, domain))
-                            except:
-                                continue
+                        # 一次取出所有结果的文本和 mu 属性（原始 URL）并提取域名
+                        subdomains.update(self.extract_page_subdomains(
+                            domain, "div.result.c-container.xpath-log.new-pmd", attributes=('mu',)
+                        ))
                         
                         # 检查是否是最后一页
                         if self._is_last_page():
@@ -97,24 +110,24 @@ class BaiduScraper(SearchEngineScraper):
                         self.driver.execute_script("arguments[0].scrollIntoView(true);", next_page)
                         
                         # 点击下一页
+                        before = self.results_signature(self.results_selector)
+                        self.pace()
                         next_page.click()
                         
-                        # 等待新页面加载
-                        WebDriverWait(self.driver, 10).until(
-                            lambda driver: driver.find_elements(By.CSS_SELECTOR, "div.result.c-container.xpath-log.new-pmd")
-                        )
+                        # 等待结果更新，旧页面的结果不算
+                        if not self.wait_for_results_change(self.results_selector, before):
+                            raise TimeoutError("等待下一页结果超时")
                         
                         page_num += 1
-                        time.sleep(1)
                         break  # 成功后跳出重试循环
                         
-                    except Exception as e:
+                    except Exception:
                         retry_count += 1
                         if retry_count < max_retries:
-                            time.sleep(1)
                             # 刷新当前页面
+                            self.pace()
                             self.driver.refresh()
-                            time.sleep(1)
+                            self.wait_for_dom_settle()
                             continue
                         else:
                             return subdomains
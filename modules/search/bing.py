@@ -1,42 +1,29 @@
 #!/usr/bin/env python3
 
 from typing import Set
-import time
-from bs4 import BeautifulSoup
-import re
+from urllib.parse import quote
 from .scraper import SearchEngineScraper
 
 class BingScraper(SearchEngineScraper):
-    """Bing 搜索引擎"""
+    """Bing 搜索引擎
+    
+    结果页不需要浏览器，直接通过 HTTP 并发获取，只在遇到验证码时启动浏览器处理。
+    """
+    
+    results_selector = '#b_results'
+    max_pages = 20
+    next_marker = 'sb_pagN'
+    captcha_keywords = ('/turing/captcha', 'b_captcha')
+    
+    def page_url(self, query: str, page: int) -> str:
+        return f"https://www.bing.com/search?q={quote(query)}&first={(page - 1) * 10 + 1}"
     
     def search(self, domain: str) -> Set[str]:
         """从 Bing 搜索引擎查询子域名"""
-        subdomains = set()
-        page = 1
-        
-        while True:
-            url = f"https://www.bing.com/search?q={domain}&first={page}"
-            try:
-                response = self.session.get(url, timeout=10)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # 提取搜索结果中的域名
-                    for cite in soup.select("cite"):
-                        text = cite.get_text().lower()
-                        subdomains.update(self.extract_subdomains(text, domain))
-                    
-                    # 检查是否有下一页
-                    if not soup.select("a.sb_pagN"):
-                        break
-                    
-                    page += 10
-                    time.sleep(0.5)  # 避免请求过快
-                else:
-                    break
-                    
-            except Exception as e:
-                print(f"[-] Bing 搜索失败: {str(e)}")
-                break
-        
-        return subdomains 
\ No newline at end of file
+        try:
+            return self.paginate_http(domain, domain, start_page=1)
+        except Exception as e:
+            print(f"[-] Bing 搜索失败: {str(e)}")
+            return set()
+        finally:
+            self.quit_driver()
@@ -6,7 +6,6 @@ from urllib.parse import urlparse
 from modules.base.scraper import BaseScraper
 from scouter import log_warning
 from utils.colors import Colors
-import time
 
 from utils.logger import log_error
 
@@ -68,21 +67,16 @@ class FofaScraper(BaseScraper):
                     'full': False
                 }
                 
-                response = self.safe_request('GET', "https://fofa.info/api/v1/search/all", params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    if 'results' in data:
-                        new_domains = set()
-                        for result in data['results']:
-                            if isinstance(result, list) and len(result) > 0:
-                                host = result[0]
-                                if domain_name := self._extract_domain(host, domain):
-                                    new_domains.add(domain_name)
-                        
-                        if new_domains:
-                            subdomains.update(new_domains)
-                        
-                time.sleep(1)  # 避免请求过快
+                # 逐条解析结果，避免一次性加载上万条记录
+                meta = {}
+                for result in self.stream_json('GET', "https://fofa.info/api/v1/search/all", key='results', rest=meta, params=params):
+                    if isinstance(result, list) and len(result) > 0:
+                        host = result[0]
+                        if domain_name := self._extract_domain(host, domain):
+                            subdomains.add(domain_name)
+                            self.emit(domain_name)
+                if meta.get('error'):
+                    log_error(f"FOFA 查询失败: {meta.get('errmsg', '')}")
                 
             except Exception as e:
                 log_error(f"FOFA 搜索失败 ({query}): {str(e)}")
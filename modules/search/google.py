@@ -1,19 +1,22 @@
 #!/usr/bin/env python3
 
 from typing import Set, List
+from urllib.parse import quote
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from urllib.parse import urlparse
-import time
 
 from utils.logger import log_error
-from ..base.scraper import BrowserScraper
+from .scraper import SearchEngineScraper
 from utils.colors import Colors
 
-class GoogleScraper(BrowserScraper):
+class GoogleScraper(SearchEngineScraper):
     """Google 搜索引擎"""
     
+    results_selector = '#search'
+    min_page_interval = 1  # 翻页过快会触发人机验证
+    max_pages = 30
+    next_marker = 'id="pnnext"'
+    captcha_keywords = ('/sorry/', 'unusual traffic')
+    
     def __init__(self):
         super().__init__()
         # 搜索语法列表
@@ -24,6 +27,9 @@ class GoogleScraper(BrowserScraper):
             # 'site:{domain} (filetype:conf OR filetype:yaml OR filetype:env OR filetype:txt OR filetype:log OR filetype:xml OR filetype:json)',
         ]
     
+    def page_url(self, query: str, page: int) -> str:
+        return f"https://www.google.com/search?q={quote(query)}&start={(page - 1) * 10}"
+    
     def _has_no_results(self) -> bool:
         """检查是否没有搜索结果"""
         try:
@@ -56,10 +62,12 @@ class GoogleScraper(BrowserScraper):
             search_input = self.wait_for_element(By.NAME, "q")
             search_input.clear()
             search_input.send_keys(dork)
+            before = self.results_signature(self.results_selector)
+            self.pace()
             search_input.submit()
             
-            # 等待页面加载
-            time.sleep(2)
+            # 等待结果页加载
+            self.wait_for_results_change(self.results_selector, before)
             
             # 检查是否有结果
             if self._has_no_results():
@@ -70,24 +78,25 @@ class GoogleScraper(BrowserScraper):
             self.wait_for_element(By.CLASS_NAME, "g")
             
             while True:
-                # 提取域名
-                for cite in self.driver.find_elements(By.CSS_SELECTOR, "cite.tjvcx"):
-                    text = cite.text.lower()
-                    if text.startswith('http'):
-                        try:
-                            hostname = urlparse(text).netloc
-                            if hostname.endswith(f".{self.current_domain}"):
-                                subdomains.add(hostname)
-                        except:
-                            subdomains.update(self.extract_subdomains(text, self.current_domain))
+                # 一次取出结果区的文本和链接并提取域名
+                subdomains.update(self.extract_page_subdomains(self.current_domain))
+                
+                # 混合模式下之后的页通过 HTTP 并发获取
+                if self.hybrid:
+                    if self.driver.find_elements(By.ID, "pnnext"):
+                        subdomains.update(self.paginate_http(dork, self.current_domain))
+                    break
                 
                 # 下一页
                 next_page = self.driver.find_elements(By.ID, "pnnext")
                 if not next_page:
                     break
                     
+                before = self.results_signature(self.results_selector)
+                self.pace()
                 next_page[0].click()
-                time.sleep(1)
+                if not self.wait_for_results_change(self.results_selector, before):
+                    break
                 
         except Exception as e:
             print(self.format_log('-', Colors.error(f"Google 搜索失败 ({dork}): {str(e)}"), Colors.error))
@@ -117,8 +126,6 @@ class GoogleScraper(BrowserScraper):
                 new_domains = self._search_with_dork(dork)
                 if new_domains:
                     subdomains.update(new_domains)
-                
-                time.sleep(2)  # 避免请求过快
         except Exception as e:
             log_error(f"Google 搜索失败: {str(e)}")
         
@@ -1,29 +1,94 @@
 #!/usr/bin/env python3
 
-from typing import Set
-import requests
+from typing import Dict, Optional, Set
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import base64
+import re
+import threading
 from utils.config import Config
 from utils.logger import log_error, log_info, log_warning
 from utils.colors import Colors
 from ..base.scraper import BaseScraper
-import time
+from ..base.http import HttpError
 
 class HunterScraper(BaseScraper):
     """奇安信鹰图 Hunter 搜索引擎"""
     
+    page_size = 100
+    max_workers = 2     # 并发获取的页数，限速 0.5 次/秒时两个并发即可让限速等待与网络请求重叠
+    max_retries = 3
+    min_quota = 0       # 剩余积分不高于该值时停止查询
+    
     def __init__(self):
         super().__init__()
         self.config = Config()
         self.api_key = self.config.get_api_key('hunter', 'api_key')
         self.base_url = "https://hunter.qianxin.com/openApi/search"
+        self._stop = threading.Event()  # 积分不足时停止获取剩余页
     
     def _encode_search_query(self, query: str) -> str:
         """Base64 编码搜索语句"""
         return base64.urlsafe_b64encode(query.encode('utf-8')).decode('utf-8')
     
+    def _parse_quota(self, text) -> Optional[int]:
+        """从 "剩余积分：1234" 这类文本中解析积分数"""
+        match = re.search(r'\d+', str(text or ''))
+        return int(match.group(0)) if match else None
+    
+    def _fetch_page(self, params: Dict, page: int) -> Optional[Dict]:
+        """获取一页结果，被限速时由限速器退避后重试
+        
+        Returns:
+            响应中的 data 字段，失败或积分不足时返回 None
+        """
+        if self._stop.is_set():
+            return None
+        
+        params = dict(params, page=page)
+        for retry_count in range(1, self.max_retries + 1):
+            response = self.session.get(self.base_url, params=params, timeout=10)
+            if response.status_code != 200:
+                log_error(f"Hunter API 返回错误: {response.status_code}")
+                return None
+            
+            data = response.json()
+            if data.get('code') == 429:
+                if retry_count < self.max_retries:
+                    # Hunter 在响应体中返回限速错误，由限速器指数退避
+                    log_warning(f"请求频率过高，等待后重试 ({retry_count}/{self.max_retries})")
+                    self.session.rate_limiter.backoff(self.base_url)
+                    continue
+                log_error(f"达到最大重试次数，跳过第 {page} 页")
+                return None
+            
+            if data.get('code') != 200:
+                log_error(f"Hunter API 返回错误: {data.get('message')}")
+                return None
+            
+            result = data.get('data') or {}
+            # 剩余积分不足时停止提交新的请求
+            rest_quota = self._parse_quota(result.get('rest_quota'))
+            if rest_quota is not None and rest_quota <= self.min_quota:
+                if not self._stop.is_set():
+                    log_warning(f"Hunter API 积分不足 ({result.get('rest_quota')})，停止查询")
+                self._stop.set()
+            return result
+        return None
+    
+    def _collect(self, result: Dict, domain: str, subdomains: Set[str]):
+        """从一页结果中提取子域名"""
+        for item in result.get('arr') or []:
+            if 'domain' in item:
+                domain_name = item['domain'].lower()
+                if domain_name.endswith(f".{domain}"):
+                    subdomains.add(domain_name)
+                    self.emit(domain_name)
+    
     def search(self, domain: str) -> Set[str]:
-        """从 Hunter 查询子域名"""
+        """从 Hunter 查询子域名
+        
+        第一页返回结果总数后，在剩余积分允许的范围内并发获取其余页，请求速率由共享限速器控制。
+        """
         subdomains = set()
         
         if not self.api_key:
@@ -38,79 +103,51 @@ class HunterScraper(BaseScraper):
         params = {
             'api-key': self.api_key,
             'search': encoded_query,
-            'page': 1,
-            'page_size': 100,
+            'page_size': self.page_size,
             'is_web': 1
         }
+        self._stop = threading.Event()
         
         try:
-            while True:
-                # 添加重试机制
-                max_retries = 3
-                retry_count = 0
-                
-                while retry_count < max_retries:
-                    response = self.session.get(self.base_url, params=params, timeout=10)
-                    
-                    if response.status_code != 200:
-                        log_error(f"Hunter API 返回错误: {response.status_code}")
-                        return subdomains
-                    
-                    data = response.json()
-
-                    
-                    if data.get('code') == 429:
-                        retry_count += 1
-                        if retry_count < max_retries:
-                            log_warning(f"请求频率过高，等待后重试 ({retry_count}/{max_retries})")
-                            time.sleep(5)  # 等待5秒后重试
-                            continue
-                        else:
-                            log_error("达到最大重试次数，跳过当前页")
-                            break
-                    
-                    if response.status_code != 200 or data.get('code') != 200:
-                        log_error(f"Hunter API 返回错误: {data.get('message')}")
-                        break
-                    
-                    # 处理响应数据
-                    if 'data' in data:
-                        # 检查积分额度
-                        rest_quota = data['data'].get('rest_quota', '')
-                        consume_quota = data['data'].get('consume_quota', '')
-                        
-                        # 如果剩余积分不足，终止查询
-                        if '剩余积分：0' in rest_quota:
-                            log_warning("Hunter API 积分已用完")
-                            return subdomains
-                        
-                        # 处理子域名数据
-                        if 'arr' in data['data']:
-                            for item in data['data']['arr']:
-                                if 'domain' in item:
-                                    domain_name = item['domain'].lower()
-                                    if domain_name.endswith(f".{domain}"):
-                                        subdomains.add(domain_name)
-                    
-                        # 检查是否有更多页
-                        total = data['data'].get('total', 0)
-                        current_page = params['page']
-                        total_pages = (total + params['page_size'] - 1) // params['page_size']
-                        
-                        if current_page >= total_pages:
-                            return subdomains
-                        
-                        params['page'] += 1
-                        break  # 成功获取数据，跳出重试循环
-                
-                # 如果重试次数达到上限，终止查询
-                if retry_count >= max_retries:
-                    break
+            first = self._fetch_page(params, 1)
+            if first is None:
+                return subdomains
+            self._collect(first, domain, subdomains)
+            
+            # 检查是否有更多页
+            total = first.get('total', 0)
+            total_pages = (total + self.page_size - 1) // self.page_size
+            pages = list(range(2, total_pages + 1))
+            if not pages or self._stop.is_set():
+                return subdomains
+            
+            # 按剩余积分和每页消耗的积分限制页数
+            rest_quota = self._parse_quota(first.get('rest_quota'))
+            consume_quota = self._parse_quota(first.get('consume_quota'))
+            if rest_quota is not None and consume_quota:
+                affordable = max(0, (rest_quota - self.min_quota) // consume_quota)
+                if affordable < len(pages):
+                    log_warning(f"Hunter API 剩余积分只够查询 {affordable} 页，共 {len(pages)} 页")
+                    pages = pages[:affordable]
+            
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pages) or 1)) as executor:
+                futures = [executor.submit(self._fetch_page, params, page) for page in pages]
+                for future in as_completed(futures):
+                    # 单页失败不影响其他页
+                    try:
+                        result = future.result()
+                    except HttpError as e:
+                        log_error(f"Hunter API 请求异常: {str(e)}")
+                        continue
+                    except Exception as e:
+                        log_error(f"处理 Hunter 数据时出错: {str(e)}")
+                        continue
+                    if result:
+                        self._collect(result, domain, subdomains)
         
-        except requests.exceptions.RequestException as e:
+        except HttpError as e:
             log_error(f"Hunter API 请求异常: {str(e)}")
         except Exception as e:
             log_error(f"处理 Hunter 数据时出错: {str(e)}")
         
         return subdomains
-
@@ -4,13 +4,15 @@ from typing import Set
 
 from scouter import log_warning
 from ..base.scraper import BaseScraper
+from ..base.paginator import CursorPaginator
 from utils.colors import Colors
-import requests
 import time
 
 class Quake360Scraper(BaseScraper):
     """Quake360 搜索引擎"""
     
+    max_pages = 10  # 最多翻页数
+    
     def __init__(self):
         super().__init__()
         self.token = self.config.get_api_key('quake360', 'api_key')
@@ -40,54 +42,32 @@ class Quake360Scraper(BaseScraper):
             'shortcuts':["63734bfa9c27d4249ca7261c"]
         }
         
-        pagination_id = None
-        page = 1
+        def fetch(pagination_id):
+            # 流式解析当前页，只保留域名，meta 等其他字段在解析完成后可用
+            page_data = dict(data, pagination_id=pagination_id) if pagination_id else data
+            result = {}
+            page = {'domains': [], 'count': 0}
+            for item in self.stream_json('POST', url, key='data', rest=result, json=page_data):
+                page['count'] += 1
+                if isinstance(item, dict) and 'domain' in item:
+                    page['domains'].append(item['domain'].lower())
+            page['meta'] = result.get('meta') or {}
+            return page
+        
+        # 没有数据说明到达最后一页，否则使用 pagination_id 翻页
+        paginator = CursorPaginator(
+            fetch,
+            lambda page: page['meta'].get('pagination_id') if page['count'] else None,
+            lambda page: page['domains'],
+            max_pages=self.max_pages
+        )
+        
+        try:
+            for hostname in paginator:
+                domains.add(hostname)
+        except Exception as e:
+            print(self.format_log('-', Colors.error(f"请求失败: {str(e)}"), Colors.error))
         
-        while True:
-            try:
-                # 添加分页ID
-                if pagination_id:
-                    data['pagination_id'] = pagination_id
-                
-                # 发送请求
-                response = self.session.post(url, json=data)
-                if response.status_code != 200:
-                    print(self.format_log('-', Colors.error(f"请求失败，状态码: {response.status_code}"), Colors.error))
-                    break
-                
-                result = response.json()
-                
-                # 提取域名
-                if 'data' in result:
-                    # 如果没有数据，说明到达最后一页
-                    if not result['data']:
-                        break
-                    
-                    # 处理当前页数据
-                    new_domains = set()
-                    for item in result['data']:
-                        if 'domain' in item:
-                            hostname = item['domain'].lower()
-                            new_domains.add(hostname)
-                    
-                    if new_domains:
-                        domains.update(new_domains)
-                    
-                    # 获取下一页的 pagination_id
-                    if 'meta' in result and 'pagination_id' in result['meta']:
-                        new_pagination_id = result['meta']['pagination_id']
-                        if new_pagination_id == None and result['data'] == []:
-                            # pagination_id 没有变化，说明到达最后一页
-                            break
-                        pagination_id = new_pagination_id
-                        page += 1
-                    else:
-                        break
-                else:
-                    break
-                
-            except Exception as e:
-                break
         return domains
     
     def search(self, target_domain: str) -> Set[str]:
@@ -1,18 +1,140 @@
 #!/usr/bin/env python3
 
-from typing import Set
+from typing import Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup
 from ..base.scraper import BaseScraper, BrowserScraper
 from ..base.manager import DataSourceManager
+from utils.logger import log_warning
 
 class SearchEngineScraper(BrowserScraper):
-    """搜索引擎基类"""
-    pass
-
-def get_search_engine_subdomains(domain: str, **kwargs) -> Set[str]:
-    """从多个搜索引擎获取子域名"""
-    manager = DataSourceManager()
+    """搜索引擎基类
+    
+    混合模式下浏览器只用于打开首页、完成搜索和处理验证码，之后的结果页使用浏览器的
+    Cookie 和 User-Agent 通过 HTTP 并发获取，遇到验证码时回到浏览器中处理后继续。
+    子类通过 page_url、next_marker、captcha_keywords 和 results_selector 描述结果页。
+    """
+    
+    # 结果页只需要链接和文本
+    lean = True
+    # 第 2 页起改用 HTTP 翻页
+    hybrid = True
+    max_pages = 10           # 最多获取的结果页数
+    max_workers = 4          # 并发获取的结果页数，请求速率由共享限速器控制
+    max_recoveries = 2       # 遇到验证码时最多回到浏览器处理的次数
+    next_marker = ''         # 结果页中存在下一页时出现的文本
+    result_attributes = ()   # 在浏览器中提取结果页时额外读取的 HTML 属性
+    captcha_keywords = ('验证码', 'captcha', 'verify')
+    
+    def page_url(self, query: str, page: int) -> str:
+        """第 page 页（从 1 开始）结果的地址"""
+        raise NotImplementedError("子类必须实现此方法")
+    
+    def is_captcha(self, text: str, url: str = '') -> bool:
+        """页面内容或跳转后的地址中是否出现验证码关键词"""
+        text = f"{url} {text}".lower()
+        return any(keyword.lower() in text for keyword in self.captcha_keywords)
+    
+    def export_browser_session(self):
+        """将浏览器的 Cookie 和 User-Agent 复制到 HTTP 会话"""
+        if self.driver is None:
+            return
+        self.session.headers['User-Agent'] = self.driver.execute_script('return navigator.userAgent')
+        for cookie in self.driver.get_cookies():
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
     
-    # 注册数据源
+    def results_content(self, html: str) -> str:
+        """截取结果页中 results_selector 对应的部分，避免提取到页眉、页脚和推荐链接中的域名"""
+        if self.results_selector == 'body':
+            return html
+        node = BeautifulSoup(html, 'html.parser').select_one(self.results_selector)
+        return str(node) if node is not None else ''
+    
+    def _fetch_page(self, query: str, page: int, domain: str) -> Tuple[Set[str], str]:
+        """通过 HTTP 获取一页结果，临时错误由 safe_request 重试
+        
+        Returns:
+            (子域名集合, 状态)，状态为 ok、last（最后一页）、captcha 或 error
+        """
+        try:
+            response = self.safe_request('GET', self.page_url(query, page))
+        except Exception as e:
+            # 部分搜索引擎的验证码页使用非 200 状态码
+            response = getattr(e, 'response', None)
+            if response is None or not self.is_captcha(response.text, str(response.url)):
+                log_warning(f"获取第 {page} 页结果失败: {str(e)}")
+                return set(), 'error'
+        if self.is_captcha(response.text, str(response.url)):
+            return set(), 'captcha'
+        subdomains = self.extract_subdomains(self.results_content(response.text), domain)
+        if self.next_marker and self.next_marker not in response.text:
+            return subdomains, 'last'
+        return subdomains, 'ok'
+    
+    def recover_in_browser(self, url: str) -> bool:
+        """在浏览器中打开触发验证码的页面，通过后重新导出会话
+        
+        Returns:
+            bool: 浏览器中是否已没有验证码
+        """
+        if self.driver is None:
+            self.init_driver()
+        self.pace()
+        self.safe_get(url)
+        self.wait_for_dom_settle()
+        if self.is_captcha(self.driver.page_source, self.driver.current_url):
+            return False
+        self.export_browser_session()
+        return True
+    
+    def paginate_http(self, query: str, domain: str, start_page: int = 2) -> Set[str]:
+        """从 start_page 开始通过 HTTP 并发获取结果页，直到最后一页或 max_pages
+        
+        Args:
+            query: 搜索语句
+            domain: 目标域名
+            start_page: 起始页码，浏览器已处理的页不再获取
+        """
+        subdomains = set()
+        self.export_browser_session()
+        page = start_page
+        recoveries = 0
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while page <= self.max_pages:
+                batch = list(range(page, min(page + self.max_workers, self.max_pages + 1)))
+                results = executor.map(lambda number: self._fetch_page(query, number, domain), batch)
+                
+                # 按页码顺序处理，遇到最后一页或出错时停止
+                page = None
+                for number, (found, status) in zip(batch, results):
+                    subdomains.update(found)
+                    self.emit(*found)
+                    if status == 'ok':
+                        continue
+                    if status == 'captcha':
+                        if recoveries < self.max_recoveries and self.recover_in_browser(self.page_url(query, number)):
+                            # 浏览器中已经打开了这一页，直接提取后从下一页继续
+                            recoveries += 1
+                            found = self.extract_page_subdomains(domain, attributes=self.result_attributes)
+                            subdomains.update(found)
+                            self.emit(*found)
+                            if self.next_marker and self.next_marker not in self.driver.page_source:
+                                break
+                            page = number + 1
+                        else:
+                            log_warning(f"第 {number} 页遇到验证码，停止翻页")
+                    break
+                else:
+                    page = batch[-1] + 1
+                if page is None:
+                    break
+        
+        return subdomains
+
+def register_search_engine_sources(manager: DataSourceManager):
+    """注册搜索引擎数据源"""
     from .google import GoogleScraper
     from .bing import BingScraper
     from .baidu import BaiduScraper
@@ -30,4 +152,9 @@ def get_search_engine_subdomains(domain: str, **kwargs) -> Set[str]:
     manager.register('hunter', HunterScraper)
     manager.register('shodan', ShodanScraper)
     manager.register('fullhunt', FullHuntScraper)
+
+def get_search_engine_subdomains(domain: str, **kwargs) -> Set[str]:
+    """从多个搜索引擎获取子域名"""
+    manager = DataSourceManager()
+    register_search_engine_sources(manager)
     return manager.search(domain, kwargs) 
\ No newline at end of file
@@ -1,12 +1,11 @@
 #!/usr/bin/env python3
 
 from typing import Set
-import requests
 from utils.config import Config
 from utils.logger import log_error, log_info, log_warning
 from utils.colors import Colors
 from ..base.scraper import BaseScraper
-import time
+from ..base.http import HttpError
 
 class ShodanScraper(BaseScraper):
     """Shodan 搜索引擎"""
@@ -44,8 +43,8 @@ class ShodanScraper(BaseScraper):
                 if response.status_code == 429:
                     retry_count += 1
                     if retry_count < max_retries:
+                        # 等待时间已由限速器根据响应头记录，下次请求前自动等待
                         log_warning(f"请求频率过高，等待后重试 ({retry_count}/{max_retries})")
-                        time.sleep(5)  # 等待5秒后重试
                         continue
                     else:
                         log_error("达到最大重试次数，终止查询")
@@ -72,7 +71,7 @@ class ShodanScraper(BaseScraper):
                     log_error(f"解析 Shodan 响应失败: {str(e)}")
                     break
         
-        except requests.exceptions.RequestException as e:
+        except HttpError as e:
             log_error(f"Shodan API 请求异常: {str(e)}")
         except Exception as e:
             log_error(f"处理 Shodan 数据时出错: {str(e)}")
@@ -7,18 +7,21 @@ import json
 import csv
 from datetime import datetime
 import time
-from modules.ct.scraper import get_ct_subdomains
-from modules.public.scraper import get_public_dns_subdomains
-from modules.code.scraper import get_code_subdomains
+from modules.ct.scraper import register_ct_sources
+from modules.public.scraper import register_public_dns_sources
+from modules.code.scraper import register_code_sources
 import os
 from utils.config import Config, init_config
-from modules.search.scraper import get_search_engine_subdomains
+from utils.cache import ResultCache
+from utils.incremental import ScanState
+from modules.search.scraper import register_search_engine_sources
 from utils.colors import Colors
 from utils.logger import log_info, log_success, log_error, log_warning
 import asyncio
-from modules.intelligence.scraper import get_intelligence_subdomains
+from modules.intelligence.scraper import register_intelligence_sources
+from modules.base.scheduler import ScanScheduler
+from utils.pipeline import StreamingResolver
 from modules.check.axfr import check_axfr
-from modules.check.takeover import check_takeover
 
 
 
@@ -122,6 +125,38 @@ def get_output_path(domain: str, output_format: str) -> str:
     """
     return os.path.join(get_result_dir(), f"{domain}.{output_format}")
 
+def get_output_settings(args) -> tuple:
+    """
+    根据命令行参数确定输出文件和格式
+    
+    Args:
+        args: 命令行参数
+    Returns:
+        (输出文件路径, 输出格式)
+    """
+    output_file = None
+    output_format = 'txt'  # 默认格式
+    
+    if args.txt is not None:
+        output_format = 'txt'
+        output_file = args.txt if args.txt != 'default' else None
+    elif args.json is not None:
+        output_format = 'json'
+        output_file = args.json if args.json != 'default' else None
+    elif args.csv is not None:
+        output_format = 'csv'
+        output_file = args.csv if args.csv != 'default' else None
+    
+    # 如果没有指定输出文件，使用默认文件名
+    if not output_file or output_file == 'default':
+        output_file = get_output_path(args.domain, output_format)
+    else:
+        # 如果指定了完整路径，使用指定的路径
+        if not os.path.isabs(output_file):
+            output_file = os.path.join(get_result_dir(), output_file)
+    
+    return output_file, output_format
+
 async def main():
     # 确保结果目录存在
     result_dir = get_result_dir()
@@ -157,6 +192,16 @@ async def main():
     output_group.add_argument('-c', '--csv', nargs='?', const='default', metavar='FILE', help='保存为 CSV 格式 (不指定文件名则使用默认)')
     
     scan_parser.add_argument('--debug', action='store_true', help='显示调试信息')
+    scan_parser.add_argument('--workers', type=int, default=20, help='数据源全局并发数 (默认: 20)')
+    scan_parser.add_argument('--resolver-engine', choices=['auto', 'massdns', 'aiodns'], default='auto',
+                             help='DNS 解析引擎: massdns 或内置异步引擎 aiodns (默认: auto，未安装 massdns 时使用 aiodns)')
+    scan_parser.add_argument('--resolvers', metavar='FILE', help='额外的公共 DNS 服务器列表文件，验证后加入解析池')
+    scan_parser.add_argument('--stream', action='store_true', help='流式解析: 数据源产出子域名后立即分批解析并实时输出')
+    scan_parser.add_argument('--stream-batch', type=int, default=2000, help='流式解析的微批次大小 (默认: 2000)')
+    scan_parser.add_argument('--incremental', action='store_true', help='增量扫描: 只解析新出现的子域名并输出变化结果')
+    scan_parser.add_argument('--recheck-hours', type=float, default=72, help='增量扫描时已知子域名的复查间隔，单位小时 (默认: 72)')
+    scan_parser.add_argument('--no-cache', action='store_true', help='不使用数据源结果缓存')
+    scan_parser.add_argument('--refresh', action='store_true', help='忽略已有缓存重新查询所有数据源并更新缓存')
     
     # 数据源选项
     source_group = scan_parser.add_argument_group('数据源选项')
@@ -302,32 +347,13 @@ async def main():
                     # 直接进行 DNS 解析
                     if len(all_subdomains) > 0:
                         log_info("正在对获取到的子域名进行 DNS 解析...")
-                        finder = SubdomainFinder(args.domain, debug=args.debug)
+                        finder = SubdomainFinder(args.domain, debug=args.debug, resolver_engine=args.resolver_engine, resolvers_file=args.resolvers)
                         resolved_domains, dns_records = finder.dns_brute(all_subdomains, debug=args.debug)
                         
                         # 保存结果
                         if resolved_domains:
                             # 确定输出文件和格式
-                            output_file = None
-                            output_format = 'txt'  # 默认格式
-                            
-                            if args.txt is not None:
-                                output_format = 'txt'
-                                output_file = args.txt if args.txt != 'default' else None
-                            elif args.json is not None:
-                                output_format = 'json'
-                                output_file = args.json if args.json != 'default' else None
-                            elif args.csv is not None:
-                                output_format = 'csv'
-                                output_file = args.csv if args.csv != 'default' else None
-                            
-                            # 如果没有指定输出文件，使用默认文件名
-                            if not output_file or output_file == 'default':
-                                output_file = os.path.join(get_result_dir(), f"{args.domain}.{output_format}")
-                            else:
-                                # 如果指定了完整路径，使用指定的路径
-                                if not os.path.isabs(output_file):
-                                    output_file = os.path.join(get_result_dir(), output_file)
+                            output_file, output_format = get_output_settings(args)
                             
                             # 确保输出目录存在
                             output_dir = os.path.dirname(output_file)
@@ -365,25 +391,31 @@ async def main():
                 else:
                     log_info("未发现域传送漏洞，将使用其他方式搜集子域名...")
             
-            # 继续原有的子域名收集逻辑
+            # 所有类别的数据源统一由调度器并发执行
+            # 数据源结果缓存，未过期的数据源不再重复查询
+            cache = None
+            if not args.no_cache:
+                try:
+                    cache = ResultCache.from_config()
+                except Exception as e:
+                    log_warning(f"打开结果缓存失败，不使用缓存: {str(e)}")
+            scheduler = ScanScheduler(max_workers=args.workers, cache=cache, refresh=args.refresh)
+            
             # 证书透明度日志搜索
             if args.ct or args.crtsh or args.certspotter or args.censys or args.sslmate or args.racent or args.all:
-                ct_domains = get_ct_subdomains(
-                    args.domain,
+                scheduler.add_category(
+                    register_ct_sources,
                     crtsh=args.crtsh or args.all or args.ct,
                     certspotter=args.certspotter or args.all or args.ct,
                     censys=args.censys or args.all or args.ct,
                     sslmate=args.sslmate or args.all or args.ct,
                     racent=args.racent or args.all or args.ct
                 )
-                
-                if ct_domains:
-                    all_subdomains.update(ct_domains)
             
             # 公共 DNS 数据源
             if args.public or args.ip138 or args.hackertarget or args.securitytrails or args.netcraft or args.robtex or args.dnsdumpster or args.bevigil or args.dnsgrep or args.rapiddns or args.urlscan or args.all:
-                public_domains = get_public_dns_subdomains(
-                    args.domain,
+                scheduler.add_category(
+                    register_public_dns_sources,
                     ip138=args.ip138 or args.all or args.public,
                     hackertarget=args.hackertarget or args.all or args.public,
                     securitytrails=args.securitytrails or args.all or args.public,
@@ -395,25 +427,19 @@ async def main():
                     rapiddns=args.rapiddns or args.all or args.public,
                     urlscan=args.urlscan or args.all or args.public
                 )
-                
-                if public_domains:
-                    all_subdomains.update(public_domains)
             
             # 代码仓库搜索
             if args.code or args.github or args.gitee or args.all:
-                code_domains = get_code_subdomains(
-                    args.domain,
+                scheduler.add_category(
+                    register_code_sources,
                     github=args.github or args.all or args.code,
                     gitee=args.gitee or args.all or args.code
                 )
-                
-                if code_domains:
-                    all_subdomains.update(code_domains)
             
             # 搜索引擎子域名收集
             if args.search or args.google or args.bing or args.baidu or args.quake360 or args.fofa or args.hunter or args.shodan or args.fullhunt or args.all:
-                search_domains = get_search_engine_subdomains(
-                    args.domain,
+                scheduler.add_category(
+                    register_search_engine_sources,
                     google=args.google or args.all or args.search,
                     bing=args.bing or args.all or args.search,
                     baidu=args.baidu or args.all or args.search,
@@ -423,23 +449,18 @@ async def main():
                     shodan=args.shodan or args.all or args.search,
                     fullhunt=args.fullhunt or args.all or args.search
                 )
-                
-                if search_domains:
-                    all_subdomains.update(search_domains)
             
             # 威胁情报平台子域名收集
             if args.alienvault or args.threatbook or args.virustotal or args.all or args.intelligence:
-                intel_domains = get_intelligence_subdomains(
-                    args.domain,
+                scheduler.add_category(
+                    register_intelligence_sources,
                     alienvault=args.alienvault or args.all or args.intelligence,
                     threatbook=args.threatbook or args.all or args.intelligence,
                     virustotal=args.virustotal or args.all or args.intelligence
                 )
-                
-                if intel_domains:
-                    all_subdomains.update(intel_domains)
             
             # DNS爆破模式
+            brute_domains = set()
             if args.brute or args.all:
                 # 检查是否指定了字典文件
                 default_wordlist = os.path.join(os.path.dirname(__file__), 'dict', 'big_test.txt')
@@ -467,41 +488,70 @@ async def main():
                 except Exception as e:
                     log_error(f"读取字典文件失败: {str(e)}")
                     return
+            
+            # DNS 服务器探测和泛解析检测与数据源收集同时进行
+            if scheduler.has_sources() or all_subdomains:
+                scheduler.add_task('finder', SubdomainFinder, args.domain, debug=args.debug, resolver_engine=args.resolver_engine, resolvers_file=args.resolvers)
+            
+            # 增量模式下只解析新出现的子域名和到达复查时间的已知子域名
+            state = None
+            if args.incremental:
+                state = ScanState(
+                    os.path.join(get_result_dir(), f"{args.domain}_state.json"),
+                    recheck_interval=args.recheck_hours * 3600
+                )
+                # 字典生成的候选子域名解析失败时不写入状态文件，避免状态文件随字典增长
+                state.transient = {name.lower() for name in brute_domains}
+            select = state.pending if state else (lambda names: names)
+            
+            # 流式模式下数据源每完成一个，其结果立即送入解析管道
+            pipeline = None
+            if args.stream and 'finder' in scheduler.tasks:
+                live_file = os.path.join(get_result_dir(), f"{args.domain}_live.txt")
+                pipeline = StreamingResolver(
+                    lambda: scheduler.result('finder'),
+                    live_file,
+                    batch_size=args.stream_batch,
+                    debug=args.debug
+                )
+                pipeline.start()
+                pipeline.submit(select(all_subdomains))
+                log_info(f"已启用流式解析，实时结果写入: {live_file}")
+            
+            all_subdomains.update(scheduler.run(
+                args.domain,
+                callback=(lambda name, result: pipeline.submit(select(result))) if pipeline else None
+            ))
 
             resolved_domains = set()
-            # 开始进行 DNS 解析
-            if len(all_subdomains) > 0:
-                # 创建 DNS 解析器
-                finder = SubdomainFinder(args.domain, debug=args.debug)
+            # 开始进行 DNS 解析，增量模式下即使没有候选子域名也要复查已知子域名
+            if len(all_subdomains) > 0 or (state and state.records and 'finder' in scheduler.tasks):
+                # 获取与数据源收集并行创建的 DNS 解析器
+                finder = scheduler.result('finder')
                 
                 all_subdomains = {s.lower() for s in all_subdomains}
-                # 进行 DNS 解析
-                resolved_domains, dns_records = finder.dns_brute(all_subdomains, debug=args.debug)
+                if pipeline:
+                    # 等待流式管道解析完剩余的子域名
+                    resolved_domains, dns_records = pipeline.close()
+                else:
+                    # 进行 DNS 解析
+                    candidates = select(all_subdomains)
+                    if state:
+                        log_info(f"增量扫描: {Colors.highlight(len(candidates))} {Colors.info('个子域名需要解析')}")
+                    resolved_domains, dns_records = finder.dns_brute(candidates, debug=args.debug) if candidates else (set(), {})
+                
+                if state:
+                    # 合并到已知结果中，输出变化并保留完整结果
+                    delta = state.update(resolved_domains, dns_records)
+                    state.save()
+                    ScanState.save_delta(delta, os.path.join(get_result_dir(), f"{args.domain}_delta.json"))
+                    resolved_domains, dns_records = state.domains(), state.dns_records()
                 
                 if resolved_domains:
                     log_success(f"DNS 解析完成，发现 {len(resolved_domains)} 个有效子域名")
                     
                     # 确定输出文件和格式
-                    output_file = None
-                    output_format = 'txt'  # 默认格式
-                    
-                    if args.txt is not None:
-                        output_format = 'txt'
-                        output_file = args.txt if args.txt != 'default' else None
-                    elif args.json is not None:
-                        output_format = 'json'
-                        output_file = args.json if args.json != 'default' else None
-                    elif args.csv is not None:
-                        output_format = 'csv'
-                        output_file = args.csv if args.csv != 'default' else None
-                    
-                    # 如果没有指定输出文件，使用默认文件名
-                    if not output_file or output_file == 'default':
-                        output_file = os.path.join(get_result_dir(), f"{args.domain}.{output_format}")
-                    else:
-                        # 如果指定了完整路径，使用指定的路径
-                        if not os.path.isabs(output_file):
-                            output_file = os.path.join(get_result_dir(), output_file)
+                    output_file, output_format = get_output_settings(args)
                     
                     # 确保输出目录存在
                     output_dir = os.path.dirname(output_file)
@@ -519,8 +569,8 @@ async def main():
                     except Exception as e:
                         log_error(f"保存结果失败: {str(e)}")
                     
-                    # 检查子域名接管风险
-                    takeover_results = check_takeover(args.domain, dns_records, debug=args.debug)
+                    # 子域名接管检测已在解析完成后统一进行
+                    takeover_results = finder.takeover_results
                     if takeover_results:
                         print("\n" + Colors.BLUE + "=" * 70)
                         print(f"{Colors.section('存在接管风险的子域名')}")
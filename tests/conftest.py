@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import importlib
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class FakeClock:
+    """可手动推进的时钟，sleep 只推进时间不实际等待"""
+
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock(request, monkeypatch):
+    """替换被测模块中的 time.time 和 time.sleep
+
+    需要替换的模块由测试文件中的 CLOCK_MODULES 指定，如 CLOCK_MODULES = ['utils.retry']。
+    """
+    clock = FakeClock()
+    for path in getattr(request.module, 'CLOCK_MODULES', ()):
+        module = importlib.import_module(path)
+        monkeypatch.setattr(module.time, 'time', clock.time)
+        monkeypatch.setattr(module.time, 'sleep', clock.sleep)
+    return clock
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.base import browser
+from modules.base.browser_pool import BrowserPool
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_handle = handle
+
+class FakeDriver:
+    """记录 CDP 调用的 WebDriver 替身"""
+
+    def __init__(self, url='https://www.example.com/search?q=1', handles=('main',), reject=()):
+        self.current_url = url
+        self.window_handles = list(handles)
+        self.current_handle = handles[0]
+        self.switch_to = FakeSwitchTo(self)
+        self.reject = set(reject)
+        self.cdp_calls = []
+        self.scripts = []
+        self.closed = []
+        self.quit_called = False
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp_calls.append((cmd, params))
+        if cmd in self.reject:
+            raise RuntimeError(f'{cmd} rejected')
+        return {}
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+
+    def close(self):
+        self.closed.append(self.current_handle)
+
+    def get(self, url):
+        self.current_url = url
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+def test_reset_clears_state_for_visited_origin():
+    """清理 Cookie、缓存和当前来源的存储，关闭多余窗口"""
+    driver = FakeDriver(handles=('main', 'popup'))
+    assert BrowserPool._reset(driver) is True
+    commands = [cmd for cmd, _ in driver.cdp_calls]
+    assert 'Network.clearBrowserCookies' in commands
+    assert 'Network.clearBrowserCache' in commands
+    assert ('Storage.clearDataForOrigin', {'origin': 'https://www.example.com', 'storageTypes': 'all'}) in driver.cdp_calls
+    assert any('localStorage.clear()' in script for script in driver.scripts)
+    assert driver.closed == ['popup']
+    assert driver.current_url == 'about:blank'
+
+def test_reset_tolerates_storage_clear_failure():
+    """存储清理被拒绝时浏览器仍可复用"""
+    driver = FakeDriver(reject={'Storage.clearDataForOrigin'})
+    assert BrowserPool._reset(driver) is True
+
+def test_reset_skips_origin_clear_on_blank_page():
+    driver = FakeDriver(url='about:blank')
+    assert BrowserPool._reset(driver) is True
+    assert 'Storage.clearDataForOrigin' not in [cmd for cmd, _ in driver.cdp_calls]
+
+def test_release_keeps_driver_warm():
+    """归还的浏览器放回池中，下一次借出时复用而不是重新启动"""
+    pool = BrowserPool(size=1)
+    driver = FakeDriver()
+    started = []
+    factory = lambda: started.append(1) or driver
+
+    assert pool.acquire('key', factory, timeout=1) is driver
+    pool.release('key', driver)
+    assert not driver.quit_called
+    assert pool.acquire('key', factory, timeout=1) is driver
+    assert started == [1]
+    pool.release('key', driver)
+    pool.close()
+    assert driver.quit_called
+
+def test_acquire_times_out_when_pool_exhausted():
+    """浏览器全部借出时等待超时后抛出 TimeoutError"""
+    pool = BrowserPool(size=1)
+    driver = FakeDriver()
+    pool.acquire('key', lambda: driver, timeout=1)
+    with pytest.raises(TimeoutError):
+        pool.acquire('key', FakeDriver, timeout=0.05)
+    pool.release('key', driver)
+    pool.close()
+
+def test_init_driver_uses_configured_timeout(monkeypatch):
+    """init_driver 按配置的 acquire_timeout 等待浏览器"""
+    calls = []
+
+    class RecordingPool:
+        def acquire(self, key, factory, timeout=None):
+            calls.append(timeout)
+            return FakeDriver()
+
+    monkeypatch.setattr(browser, 'get_browser_pool', lambda: RecordingPool())
+    source = browser.BrowserBase()
+    source.config.config['browser'] = {'acquire_timeout': 12}
+    source.init_driver()
+    assert calls == [12.0]
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import dns_resolver
+from utils.dns_resolver import SubdomainFinder
+
+def select_engine(engine):
+    return SubdomainFinder._select_engine(None, engine)
+
+def test_missing_massdns_falls_back(monkeypatch):
+    """massdns 不存在时，无论 auto 还是显式指定都改用内置异步引擎"""
+    monkeypatch.setattr(dns_resolver.shutil, 'which', lambda name: None)
+    assert select_engine('auto') == 'aiodns'
+    assert select_engine('massdns') == 'aiodns'
+    assert select_engine('aiodns') == 'aiodns'
+
+def test_massdns_used_when_installed(monkeypatch):
+    monkeypatch.setattr(dns_resolver.shutil, 'which', lambda name: '/usr/bin/massdns')
+    assert select_engine('auto') == 'massdns'
+    assert select_engine('massdns') == 'massdns'
+    assert select_engine('aiodns') == 'aiodns'
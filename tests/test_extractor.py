@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.base.extractor import SubdomainExtractor, extract_from_stream, extract_subdomains
+
+SAMPLE = (
+    'see https://WWW.Example.com/path and mail.example.com, api.v2.example.com:8443 '
+    'but not example.com.cn, notexample.com or badexample.com; '
+    '"cdn-1.static.example.com" <a href="//img.example.com/x.png">' + 'x' * 300 +
+    ' deep.' + 'a' * 60 + '.example.com end'
+)
+
+def split_chunks(content, size: int):
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+def test_extract_subdomains():
+    """提取多级子域名，结果为小写并排除相似域名"""
+    found = extract_subdomains(SAMPLE, 'Example.com')
+    assert {'www.example.com', 'mail.example.com', 'api.v2.example.com',
+            'cdn-1.static.example.com', 'img.example.com'} <= found
+    assert not any(name.endswith('.com.cn') for name in found)
+    assert 'notexample.com' not in found and 'badexample.com' not in found
+
+def test_stream_matches_whole_text():
+    """任意数据块大小下流式提取与整体提取结果一致"""
+    expected = extract_subdomains(SAMPLE, 'example.com')
+    for size in (1, 2, 3, 10, 64, 257, len(SAMPLE)):
+        assert extract_from_stream(split_chunks(SAMPLE, size), 'example.com') == expected
+
+def test_stream_bytes_matches_text():
+    """字节流与文本的提取结果一致"""
+    data = SAMPLE.encode('utf-8')
+    expected = extract_subdomains(data, 'example.com')
+    assert expected == extract_subdomains(SAMPLE, 'example.com')
+    for size in (1, 5, 100):
+        assert extract_from_stream(split_chunks(data, size), 'example.com') == expected
+
+def test_suffix_split_at_chunk_end():
+    """数据块在 example.com 与 .cn 之间断开时不误报"""
+    assert extract_from_stream(['a.example.com', '.cn b.example.com'], 'example.com') == {'b.example.com'}
+    assert extract_from_stream(['a.example.co', 'm x'], 'example.com') == {'a.example.com'}
+
+def test_feed_returns_only_new_names():
+    """feed 只返回本次新发现的子域名，紧挨数据块末尾的域名留到下一块确认"""
+    extractor = SubdomainExtractor('example.com')
+    first = extractor.feed('a.example.com b.example.com ')
+    second = extractor.feed('a.example.com c.example.com  ')
+    assert first == {'a.example.com'}
+    assert second == {'b.example.com', 'c.example.com'}
+    assert extractor.close() == {'a.example.com', 'b.example.com', 'c.example.com'}
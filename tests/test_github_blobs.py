@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import contextlib
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.code.github import GitHubScraper
+
+DOMAIN = 'example.com'
+
+class FakeCache:
+    """内存中的结果缓存"""
+
+    def __init__(self, entries=None):
+        self.entries = dict(entries or {})
+        self.writes = []
+
+    def get(self, source, domain, query=''):
+        return self.entries.get((source, domain, query))
+
+    def set(self, source, domain, value, query=''):
+        self.writes.append((source, domain, query))
+        self.entries[(source, domain, query)] = sorted(value)
+
+def code_item(sha, fragment, file_size=None):
+    item = {
+        'sha': sha,
+        'git_url': f'https://api.github.com/repos/o/r/git/blobs/{sha}',
+        'text_matches': [{'fragment': fragment}],
+    }
+    if file_size is not None:
+        item['file_size'] = file_size
+    return item
+
+def make_scraper(items, cache):
+    scraper = GitHubScraper()
+    scraper.token = 'token'
+    scraper.result_cache = cache
+    response = SimpleNamespace(status_code=200, headers={}, json=lambda: {'items': items})
+    scraper.session.get = lambda *args, **kwargs: response
+    return scraper
+
+def test_partial_fragments_fetch_blob():
+    """片段未覆盖整个文件时下载完整内容，并写入 blob 缓存"""
+    cache = FakeCache()
+    items = [
+        code_item('aaa', 'host = "a.example.com"', file_size=5000),  # 片段只是文件的一部分
+        code_item('bbb', 'b.example.com', file_size=13),             # 片段覆盖整个文件
+        code_item('ccc', 'c.example.com'),                           # 没有文件大小
+    ]
+    scraper = make_scraper(items, cache)
+    bodies = {
+        items[0]['git_url']: b'x = "a.example.com"\ny = "deep.a.example.com"\n',
+        items[2]['git_url']: b'z = "hidden.example.com"\n',
+    }
+    requested = []
+
+    @contextlib.contextmanager
+    def stream(method, url, **kwargs):
+        requested.append(url)
+        yield SimpleNamespace(raise_for_status=lambda: None, iter_bytes=lambda: iter([bodies[url]]))
+
+    scraper.session.stream = stream
+    calls = []
+    fetch_blobs = scraper._fetch_blobs
+    scraper._fetch_blobs = lambda blobs, domain: calls.append(dict(blobs)) or fetch_blobs(blobs, domain)
+
+    found = scraper._search_code(DOMAIN)
+
+    assert calls == [{'aaa': items[0]['git_url'], 'ccc': items[2]['git_url']}]
+    assert sorted(requested) == sorted(bodies)
+    assert {'a.example.com', 'deep.a.example.com', 'b.example.com', 'hidden.example.com'} <= found
+    assert sorted(cache.writes) == [('github_blob', DOMAIN, 'aaa'), ('github_blob', DOMAIN, 'ccc')]
+
+def test_cached_blob_not_downloaded():
+    """blob 缓存命中时直接使用缓存结果，不再下载"""
+    cache = FakeCache({('github_blob', DOMAIN, 'aaa'): ['cached.example.com']})
+    scraper = make_scraper([code_item('aaa', 'a.example.com', file_size=5000)], cache)
+    calls = []
+    scraper._fetch_blobs = lambda blobs, domain: calls.append(dict(blobs)) or set()
+
+    found = scraper._search_code(DOMAIN)
+
+    assert calls == [{}]
+    assert found == {'a.example.com', 'cached.example.com'}
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.base.http import HttpSession
+
+PROXY = 'http://127.0.0.1:8080'
+
+def test_session_proxy_keeps_headers_and_cookies():
+    """设置会话级代理后请求头和 Cookie 保持不变"""
+    session = HttpSession()
+    session.headers['X-Test'] = '1'
+    session.cookies.set('sid', 'abc')
+    session.proxies = {'http': PROXY, 'https': PROXY}
+    assert session.proxies == {'http': PROXY, 'https': PROXY}
+    assert session.headers['X-Test'] == '1'
+    assert session.cookies.get('sid') == 'abc'
+    assert session._client._mounts  # 请求经由代理发出
+
+def test_request_proxies_must_match_session():
+    """请求中的 proxies 与会话代理一致时忽略，不一致时抛出异常而不是绕过代理"""
+    session = HttpSession(proxy=PROXY)
+    assert 'proxies' not in session._translate({'proxies': {'https': PROXY}})
+    with pytest.raises(ValueError):
+        session._translate({'proxies': {'https': 'http://10.0.0.1:3128'}})
+    with pytest.raises(ValueError):
+        HttpSession()._translate({'proxies': {'https': PROXY}})
+
+def test_mixed_scheme_proxies_rejected():
+    session = HttpSession()
+    with pytest.raises(ValueError):
+        session.proxies = {'http': PROXY, 'https': 'http://10.0.0.1:3128'}
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.incremental import ScanState
+
+HOUR = 3600
+
+CLOCK_MODULES = ['utils.incremental']
+
+@pytest.fixture
+def state_file(tmp_path):
+    return str(tmp_path / 'example.com_state.json')
+
+def records(*names, ip='1.1.1.1'):
+    return {name: {'A': [ip], 'CNAME': []} for name in names}
+
+def scan(state_file, candidates, resolved, ip='1.1.1.1', transient=()):
+    """模拟一次增量扫描：筛选待解析子域名，合并解析结果并保存状态"""
+    state = ScanState(state_file, recheck_interval=72 * HOUR, max_misses=2)
+    state.transient = set(transient)
+    pending = state.pending(candidates)
+    hits = set(resolved) & pending
+    delta = state.update(hits, records(*hits, ip=ip))
+    state.save()
+    return pending, delta, state
+
+def test_first_scan_reports_all_added(clock, state_file):
+    pending, delta, state = scan(state_file, ['a.example.com', 'B.example.com', 'x.example.com'],
+                                 ['a.example.com', 'b.example.com'])
+    assert pending == {'a.example.com', 'b.example.com', 'x.example.com'}
+    assert [item['domain'] for item in delta['added']] == ['a.example.com', 'b.example.com']
+    assert delta['removed'] == [] and delta['changed'] == []
+    assert state.misses == {'x.example.com': clock.now}
+
+def test_rescan_skips_known_and_recent_misses(clock, state_file):
+    """复查间隔内只解析新出现的子域名"""
+    scan(state_file, ['a.example.com', 'x.example.com'], ['a.example.com'])
+    clock.now += HOUR
+    pending, delta, _ = scan(state_file, ['a.example.com', 'x.example.com', 'new.example.com'],
+                             ['a.example.com', 'new.example.com'])
+    assert pending == {'new.example.com'}
+    assert [item['domain'] for item in delta['added']] == ['new.example.com']
+
+def test_known_names_rechecked_without_source(clock, state_file):
+    """数据源不再返回的已知子域名到达复查时间后也会被解析"""
+    scan(state_file, ['a.example.com'], ['a.example.com'])
+    clock.now += 73 * HOUR
+    pending, _, _ = scan(state_file, [], ['a.example.com'])
+    assert pending == {'a.example.com'}
+
+def test_changed_records(clock, state_file):
+    scan(state_file, ['a.example.com'], ['a.example.com'], ip='1.1.1.1')
+    clock.now += 73 * HOUR
+    _, delta, _ = scan(state_file, ['a.example.com'], ['a.example.com'], ip='2.2.2.2')
+    assert delta['changed'] == [{
+        'domain': 'a.example.com',
+        'old': {'A': ['1.1.1.1'], 'CNAME': []},
+        'new': {'A': ['2.2.2.2'], 'CNAME': []}
+    }]
+
+def test_removed_after_consecutive_misses(clock, state_file):
+    """已知子域名连续 max_misses 次解析失败才报告消失，中间成功一次则重新计数"""
+    scan(state_file, ['a.example.com'], ['a.example.com'])
+
+    clock.now += 73 * HOUR
+    _, delta, state = scan(state_file, [], [])
+    assert delta['removed'] == [] and 'a.example.com' in state.records
+
+    clock.now += 73 * HOUR
+    _, delta, _ = scan(state_file, [], ['a.example.com'])
+    assert delta['removed'] == [] and delta['added'] == []
+
+    clock.now += 73 * HOUR
+    _, delta, _ = scan(state_file, [], [])
+    assert delta['removed'] == []
+    clock.now += 73 * HOUR
+    _, delta, state = scan(state_file, [], [])
+    assert [item['domain'] for item in delta['removed']] == ['a.example.com']
+    assert 'a.example.com' not in state.records
+
+def test_misses_expire_and_transient_not_stored(clock, state_file):
+    """字典生成的候选子域名失败不记录，其他失败记录到复查时间后不再保存"""
+    _, _, state = scan(state_file, ['x.example.com', 'www.example.com'], [],
+                       transient=['www.example.com'])
+    assert set(state.misses) == {'x.example.com'}
+
+    clock.now += 73 * HOUR
+    state = ScanState(state_file, recheck_interval=72 * HOUR)
+    state.save()
+    assert state.misses == {}
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import json
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.base.json_stream import iter_json_items
+
+def split_chunks(data: bytes, size: int):
+    """按固定大小切分数据块"""
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+def test_top_level_array_any_chunk_size():
+    """顶层数组在任意数据块边界下解析结果一致"""
+    items = [{'name_value': f'host{i}.example.com\nwww.example.com', 'id': i * 1234567} for i in range(50)]
+    data = json.dumps(items).encode('utf-8')
+    for size in (1, 2, 3, 7, 64, len(data)):
+        assert list(iter_json_items(split_chunks(data, size))) == items
+
+def test_multibyte_characters_split_across_chunks():
+    """多字节字符被切分在两个数据块之间时正确解码"""
+    items = [{'issuer': '中国测试证书机构', 'name': '子域名.example.com'}] * 3
+    data = json.dumps(items, ensure_ascii=False).encode('utf-8')
+    for size in (1, 2, 5):
+        assert list(iter_json_items(split_chunks(data, size))) == items
+
+def test_number_at_chunk_end_not_truncated():
+    """数字恰好结束在数据块末尾时等待后续数据"""
+    chunks = [b'[12', b'34, 5', b'6]']
+    assert list(iter_json_items(chunks)) == [1234, 56]
+
+def test_keyed_array_and_rest_fields():
+    """从顶层对象中取出数组，其余字段写入 rest"""
+    payload = {'code': 0, 'data': [{'host': 'a.example.com'}, {'host': 'b.example.com'}], 'size': 2}
+    data = json.dumps(payload).encode('utf-8')
+    rest = {}
+    items = list(iter_json_items(split_chunks(data, 3), key='data', rest=rest))
+    assert items == payload['data']
+    assert rest == {'code': 0, 'size': 2}
+
+def test_empty_array_and_object():
+    """空数组和缺少数组的对象不返回元素"""
+    assert list(iter_json_items([b'[', b' ]'])) == []
+    assert list(iter_json_items([b'{}'], key='data')) == []
+    rest = {}
+    assert list(iter_json_items([b'{"error": "quota"}'], key='data', rest=rest)) == []
+    assert rest == {'error': 'quota'}
+
+def test_truncated_body_raises():
+    """响应体被截断时抛出异常而不是静默返回部分结果"""
+    with pytest.raises(ValueError):
+        list(iter_json_items([b'[{"a": 1}, {"b"']))
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import asyncio
+import threading
+import time
+import httpx
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.base import http
+from modules.base.manager import DataSourceManager
+from modules.base.scraper import BaseScraper
+from modules.public.hackertarget import HackertargetScraper
+
+class SyncSource(BaseScraper):
+    def search(self, domain):
+        time.sleep(0.2)
+        return {f'sync.{domain}'}
+
+class AsyncSource(BaseScraper):
+    threads = set()
+
+    async def search_async(self, domain):
+        AsyncSource.threads.add(threading.get_ident())
+        await asyncio.sleep(0.2)
+        return {f'async.{domain}'}
+
+class FailingSource(BaseScraper):
+    async def search_async(self, domain):
+        raise RuntimeError('boom')
+
+def make_manager(**sources):
+    manager = DataSourceManager(max_workers=10)
+    for name, source_class in sources.items():
+        manager.register(name, source_class)
+    return manager
+
+def test_mixed_sources_run_concurrently():
+    """原生异步数据源与同步数据源并发执行，结果和回调都完整"""
+    manager = make_manager(sync1=SyncSource, sync2=SyncSource, async1=AsyncSource, async2=AsyncSource, bad=FailingSource)
+    calls = []
+    start = time.time()
+    result = manager.search('example.com', dict.fromkeys(['sync1', 'sync2', 'async1', 'async2', 'bad'], True),
+                            callback=lambda name, found: calls.append(name))
+    assert time.time() - start < 0.6
+    assert result == {'sync.example.com', 'async.example.com'}
+    assert sorted(calls) == ['async1', 'async2', 'sync1', 'sync2']
+    # 异步数据源都在同一个事件循环线程中执行，不各占一个线程
+    assert len(AsyncSource.threads) == 1
+
+def test_search_inside_running_loop():
+    """在已有事件循环的协程中同步调用时仍能完成（如 scouter 的 main 协程）"""
+    manager = make_manager(sync=SyncSource, native=AsyncSource)
+
+    async def main():
+        return manager.search('example.com', {'sync': True, 'native': True})
+
+    assert asyncio.run(main()) == {'sync.example.com', 'async.example.com'}
+
+def test_sync_adapter_for_async_source():
+    """原生异步数据源也可以直接调用 search()"""
+    assert AsyncSource().search('example.com') == {'async.example.com'}
+    assert AsyncSource().is_async and not SyncSource().is_async
+
+def test_native_source_uses_async_session(monkeypatch):
+    """HackerTarget 通过异步会话和共享异步连接池请求"""
+    requests = []
+
+    def handler(request):
+        requests.append(str(request.url))
+        return httpx.Response(200, text='www.example.com,1.1.1.1\napi.example.com,2.2.2.2\nother.org,3.3.3.3\n')
+
+    monkeypatch.setattr(http, 'get_async_transport', lambda: httpx.MockTransport(handler))
+    manager = make_manager(hackertarget=HackertargetScraper)
+    assert manager.search('example.com', {'hackertarget': True}) == {'www.example.com', 'api.example.com'}
+    assert requests == ['https://api.hackertarget.com/hostsearch/?q=example.com']
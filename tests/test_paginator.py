@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.base.paginator import CursorPaginator
+
+def make_pages(count):
+    """生成 count 页数据，每页包含下一页的游标，最后一页没有游标"""
+    return {
+        f'c{i}': {'items': [f'item{i}a', f'item{i}b'], 'next': f'c{i + 1}' if i + 1 < count else None}
+        for i in range(count)
+    }
+
+def make_paginator(pages, calls, **kwargs):
+    def fetch(cursor):
+        calls.append(cursor)
+        page = pages[cursor]
+        if isinstance(page, Exception):
+            raise page
+        return page
+    return CursorPaginator(fetch, lambda page: page.get('next'), lambda page: page['items'],
+                           start='c0', **kwargs)
+
+def test_follows_cursor():
+    """按游标依次请求到最后一页，结果按页顺序返回"""
+    calls = []
+    paginator = make_paginator(make_pages(3), calls)
+    assert list(paginator) == ['item0a', 'item0b', 'item1a', 'item1b', 'item2a', 'item2b']
+    assert calls == ['c0', 'c1', 'c2']
+    assert paginator.pages == 3
+
+def test_stops_at_max_pages():
+    """达到 max_pages 后不再请求下一页"""
+    calls = []
+    paginator = make_paginator(make_pages(10), calls, max_pages=2)
+    assert list(paginator) == ['item0a', 'item0b', 'item1a', 'item1b']
+    assert calls == ['c0', 'c1']
+
+def test_prefetch_error_raised():
+    """后台预取下一页失败时，异常在取结果时抛给调用方，已返回的结果不受影响"""
+    pages = make_pages(3)
+    pages['c1'] = RuntimeError('boom')
+    results = []
+    with pytest.raises(RuntimeError, match='boom'):
+        for item in make_paginator(pages, []):
+            results.append(item)
+    assert results == ['item0a', 'item0b']
+
+def test_stops_on_empty_page():
+    """fetch 返回 None 时提前结束，重复的游标也不会再次请求"""
+    calls = []
+    pages = make_pages(3)
+    pages['c1'] = None
+    assert list(make_paginator(pages, calls)) == ['item0a', 'item0b']
+    assert calls == ['c0', 'c1']
+
+    calls = []
+    pages = {'c0': {'items': ['a'], 'next': 'c1'}, 'c1': {'items': ['b'], 'next': 'c1'}}
+    assert list(make_paginator(pages, calls)) == ['a', 'b']
+    assert calls == ['c0', 'c1']
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+from types import SimpleNamespace
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ratelimit import RateLimiter, TokenBucket, parse_retry_after
+
+URL = 'https://api.example.com/v1/search'
+
+CLOCK_MODULES = ['utils.ratelimit']
+
+def response(status_code: int = 200, **headers):
+    return SimpleNamespace(status_code=status_code, headers=headers)
+
+def test_bucket_refill(clock):
+    """令牌用完后按速率补充，并发请求依次排队"""
+    bucket = TokenBucket(rate=2, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    # 空闲足够久后补满，但不超过 burst
+    clock.now += 10
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+def test_unlimited_bucket(clock):
+    """未配置速率时不等待，只遵守暂停时间"""
+    bucket = TokenBucket()
+    assert all(bucket.reserve() == 0 for _ in range(100))
+    bucket.block(clock.now + 5)
+    assert bucket.reserve() == pytest.approx(5)
+
+def test_limits_by_longest_prefix(clock):
+    """路径前缀越长的限速规则优先"""
+    limiter = RateLimiter({'api.example.com': 10, 'api.example.com/v1/search': 0.5})
+    assert limiter.bucket(URL).rate == 0.5
+    assert limiter.bucket('https://api.example.com/v1/users').rate == 10
+    assert limiter.bucket('https://other.example.com/').rate is None
+
+def test_parse_retry_after(clock):
+    """Retry-After 支持秒数和 HTTP 日期"""
+    assert parse_retry_after('12') == 12.0
+    assert parse_retry_after('-3') == 0.0
+    assert parse_retry_after('Tue, 14 Nov 2023 22:13:40 GMT') == pytest.approx(20)
+    assert parse_retry_after('soon') is None
+
+def test_learn_retry_after(clock):
+    """429 响应的 Retry-After 暂停该主机的请求"""
+    limiter = RateLimiter()
+    assert limiter.update(URL, response(429, **{'Retry-After': '30'}))
+    assert limiter.acquire(URL) == pytest.approx(30)
+    # 其他主机不受影响
+    assert limiter.acquire('https://other.example.com/') == 0
+
+def test_learn_remaining_quota(clock):
+    """根据剩余配额把请求均匀分配到重置前，配额耗尽时暂停到重置时间"""
+    limiter = RateLimiter()
+    reset = str(int(clock.now + 100))
+    limiter.update(URL, response(200, **{'X-RateLimit-Remaining': '50', 'X-RateLimit-Reset': reset}))
+    bucket = limiter.bucket(URL)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(2)
+
+    limiter.update(URL, response(403, **{'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '60'}))
+    assert limiter.acquire(URL) == pytest.approx(60)
+
+def test_backoff_without_retry_after(clock):
+    """没有 Retry-After 的限速响应按连续次数指数退避，成功后重置"""
+    limiter = RateLimiter()
+    limiter.update(URL, response(429))
+    assert limiter.acquire(URL) == pytest.approx(2)
+    limiter.update(URL, response(429))
+    assert limiter.acquire(URL) == pytest.approx(4)
+    limiter.update(URL, response(200))
+    assert limiter.bucket(URL).throttled == 0
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+import pytest
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import retry
+from utils.retry import CircuitBreaker, CircuitOpenError, classify_error, retry_on_error
+
+class FakeHttpError(Exception):
+    """带响应的 HTTP 异常，模拟 raise_for_status 抛出的异常"""
+
+    def __init__(self, status_code: int, headers: dict = None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+CLOCK_MODULES = ['utils.retry']
+
+def test_classify_error_by_status():
+    """按状态码区分临时错误和永久错误"""
+    assert classify_error(FakeHttpError(503)) == (True, None)
+    assert classify_error(FakeHttpError(429, {'Retry-After': '7'})) == (True, 7.0)
+    assert classify_error(FakeHttpError(404)) == (False, None)
+    assert classify_error(FakeHttpError(401)) == (False, None)
+
+def test_classify_error_without_response():
+    """超时、连接失败等没有响应的异常可以重试，熔断异常不重试"""
+    assert classify_error(TimeoutError('timed out')) == (True, None)
+    assert classify_error(ConnectionError('reset')) == (True, None)
+    assert classify_error(CircuitOpenError('open')) == (False, None)
+
+def test_circuit_breaker_transitions(clock):
+    """连续失败后熔断，冷却结束放行一次试探请求，试探失败重新熔断，成功则恢复"""
+    breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert not breaker.is_open
+
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # 冷却结束后的试探请求失败，立即重新熔断
+    clock.now += 61
+    breaker.before_call()
+    assert not breaker.is_open
+    breaker.record_failure()
+    assert breaker.is_open
+
+    # 试探请求成功后恢复，失败计数清零
+    clock.now += 61
+    breaker.before_call()
+    breaker.record_success()
+    assert not breaker.is_open and breaker.failures == 0
+    breaker.record_failure()
+    assert not breaker.is_open
+
+def test_retry_only_transient_errors(clock):
+    """临时错误重试到成功，永久错误只调用一次"""
+    calls = []
+
+    @retry_on_error(max_retries=3, delay=1)
+    def flaky():
+        calls.append(clock.now)
+        if len(calls) < 3:
+            raise FakeHttpError(502)
+        return 'ok'
+
+    assert flaky() == 'ok'
+    assert len(calls) == 3
+
+    @retry_on_error(max_retries=3, delay=1)
+    def not_found():
+        calls.append(clock.now)
+        raise FakeHttpError(404)
+
+    calls.clear()
+    with pytest.raises(FakeHttpError):
+        not_found()
+    assert len(calls) == 1
+
+def test_retry_honours_retry_after(clock):
+    """按 Retry-After 等待，超过上限时不再重试"""
+    calls = []
+
+    @retry_on_error(max_retries=2, delay=1, max_retry_after=60)
+    def limited(wait):
+        calls.append(clock.now)
+        if len(calls) == 1:
+            raise FakeHttpError(429, {'Retry-After': str(wait)})
+        return 'ok'
+
+    assert limited(30) == 'ok'
+    assert calls[1] - calls[0] >= 30
+
+    calls.clear()
+    with pytest.raises(FakeHttpError):
+        limited(120)
+    assert len(calls) == 1
+
+def test_retry_opens_circuit(clock):
+    """同一数据源连续失败达到阈值后不再请求"""
+    retry._breakers.pop('test-source', None)
+    calls = []
+
+    @retry_on_error(max_retries=3, delay=1, circuit_key=lambda: 'test-source')
+    def down():
+        calls.append(clock.now)
+        raise TimeoutError('timed out')
+
+    with pytest.raises((TimeoutError, CircuitOpenError)):
+        down()
+    with pytest.raises((TimeoutError, CircuitOpenError)):
+        down()
+    assert retry.get_circuit_breaker('test-source').is_open
+    count = len(calls)
+    with pytest.raises(CircuitOpenError):
+        down()
+    assert len(calls) == count
+    retry._breakers.pop('test-source', None)
+
+def test_retry_coroutine():
+    """协程函数同样只重试临时错误"""
+    calls = []
+
+    @retry_on_error(max_retries=3, delay=0.01)
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise FakeHttpError(503)
+        return 'ok'
+
+    assert asyncio.run(flaky()) == 'ok'
+    assert len(calls) == 3
+
+    @retry_on_error(max_retries=3, delay=0.01)
+    async def forbidden():
+        calls.append(1)
+        raise FakeHttpError(403)
+
+    calls.clear()
+    with pytest.raises(FakeHttpError):
+        asyncio.run(forbidden())
+    assert len(calls) == 1
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+import aiodns
+from aiodns.error import DNSError
+from utils.colors import Colors
+from utils.logger import log_info, log_error
+
+# 需要换一个 DNS 服务器重试的错误
+RETRY_ERRORS = (
+    aiodns.error.ARES_ETIMEOUT,
+    aiodns.error.ARES_ESERVFAIL,
+    aiodns.error.ARES_EREFUSED,
+    aiodns.error.ARES_ECONNREFUSED,
+)
+
+# 域名不存在或没有对应记录
+NOT_FOUND_ERRORS = (
+    aiodns.error.ARES_ENOTFOUND,
+    aiodns.error.ARES_ENODATA,
+)
+
+class _NameserverLimiter:
+    """单个 DNS 服务器的发包速率限制"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self.next_time = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """等待到允许发送下一个查询的时间"""
+        if not self.interval:
+            return
+        async with self.lock:
+            now = time.monotonic()
+            wait = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class AsyncResolver:
+    """基于 aiodns/pycares 的异步 DNS 解析引擎
+
+    在进程内完成解析，不依赖 massdns 和临时文件。限制同时在途的查询数量以及
+    每个 DNS 服务器的查询速率，超时或服务器错误时换一个服务器重试。
+    """
+
+    def __init__(self, nameservers: List[str], concurrency: int = 500, rate_limit: float = 300,
+                 timeout: float = 2.0, retries: int = 2, scheduler=None, debug: bool = False):
+        """
+        Args:
+            nameservers: 可用的 DNS 服务器列表
+            concurrency: 同时在途的最大查询数
+            rate_limit: 每个 DNS 服务器每秒最大查询数
+            timeout: 单次查询超时时间（秒）
+            retries: 超时或服务器错误时的最大重试次数
+            scheduler: ResolverScheduler，提供时按实时权重选择服务器并回报查询结果
+            debug: 是否显示调试信息
+        """
+        if not nameservers:
+            raise ValueError("没有可用的 DNS 服务器")
+        self.nameservers = list(nameservers)
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+        self.retries = retries
+        self.scheduler = scheduler
+        self.debug = debug
+
+        self.stats = {'queries': 0, 'retries': 0, 'failures': 0}
+
+    def resolve(self, domains: Iterable[str]) -> Dict[str, Dict[str, List[str]]]:
+        """批量解析子域名
+
+        在独立线程中运行事件循环，调用方无论是否处于事件循环中都可以直接使用。
+
+        Args:
+            domains: 待解析的子域名
+        Returns:
+            Dict[str, Dict[str, List[str]]]: 存在的子域名及其记录 {'A': [], 'CNAME': []}
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self._resolve_all(domains)).result()
+
+    async def _resolve_all(self, domains: Iterable[str]) -> Dict[str, Dict[str, List[str]]]:
+        """由固定数量的工作协程从队列中取子域名解析
+
+        队列长度有上限，候选子域名从迭代器中逐个读取，内存占用与字典大小无关。
+        """
+        # 每个 DNS 服务器一个 channel，重试由本类控制
+        self._resolvers = {
+            server: aiodns.DNSResolver(nameservers=[server], timeout=self.timeout, tries=1)
+            for server in self.nameservers
+        }
+        self._limiters = {server: _NameserverLimiter(self.rate_limit) for server in self.nameservers}
+
+        start_time = time.time()
+        records = {}
+        total = 0
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def worker():
+            while True:
+                domain = await queue.get()
+                try:
+                    if domain is None:
+                        return
+                    record = await self._resolve_domain(domain)
+                    if record:
+                        records[domain] = record
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            for domain in domains:
+                total += 1
+                await queue.put(domain)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+
+        if self.debug:
+            log_info(f"异步解析完成: {Colors.highlight(total)} 个查询, "
+                     f"重试 {Colors.highlight(self.stats['retries'])} 次, "
+                     f"失败 {Colors.highlight(self.stats['failures'])} 个, "
+                     f"用时 {time.time() - start_time:.2f} 秒")
+        return records
+
+    async def _resolve_domain(self, domain: str) -> Optional[Dict[str, List[str]]]:
+        """解析单个子域名的 A 记录，名称存在时再获取 CNAME"""
+        answers, exists = await self._query(domain, 'A')
+        if not exists:
+            return None
+
+        record = {'A': [], 'CNAME': []}
+        if answers:
+            record['A'] = [answer.host for answer in answers]
+
+        cname, _ = await self._query(domain, 'CNAME')
+        if cname:
+            record['CNAME'] = [cname.cname.rstrip('.')]
+
+        return record
+
+    async def _query(self, domain: str, qtype: str):
+        """执行查询并在需要时换服务器重试
+
+        Returns:
+            (查询结果, 名称是否存在)
+        """
+        tried = []
+        for attempt in range(self.retries + 1):
+            server = self._pick_server(tried)
+            tried.append(server)
+            await self._limiters[server].acquire()
+            self.stats['queries'] += 1
+            start_time = time.monotonic()
+            try:
+                answers = await self._resolvers[server].query(domain, qtype)
+                self._report(server, True, time.monotonic() - start_time)
+                return answers, True
+            except DNSError as e:
+                code = e.args[0] if e.args else None
+                if code in NOT_FOUND_ERRORS:
+                    # NXDOMAIN/NODATA 是正常应答
+                    self._report(server, True, time.monotonic() - start_time)
+                    return None, code == aiodns.error.ARES_ENODATA
+                if code not in RETRY_ERRORS:
+                    if self.debug:
+                        log_error(f"查询 {domain} ({qtype}) 失败: {str(e)}")
+                    return None, False
+                self._report(server, False, reason='超时' if code == aiodns.error.ARES_ETIMEOUT else '返回错误')
+                if attempt < self.retries:
+                    self.stats['retries'] += 1
+
+        self.stats['failures'] += 1
+        return None, False
+
+    def _report(self, server: str, success: bool, latency: Optional[float] = None, reason: str = ''):
+        """向调度器回报查询结果"""
+        if not self.scheduler:
+            return
+        if success:
+            self.scheduler.report_success(server, latency)
+        else:
+            self.scheduler.report_failure(server, reason)
+
+    def _pick_server(self, tried: List[str]) -> str:
+        """选择一个尚未尝试过的 DNS 服务器"""
+        if self.scheduler:
+            return self.scheduler.pick(exclude=tried)
+        candidates = [server for server in self.nameservers if server not in tried]
+        return random.choice(candidates or self.nameservers)
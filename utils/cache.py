@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from utils.config import Config
+from utils.logger import log_error
+
+class ResultCache:
+    """数据源结果缓存
+
+    以 (数据源, 域名, 查询) 为键将结果以 JSON 形式保存在 SQLite 中，每个数据源可以
+    配置不同的有效期。重复扫描同一域名时只查询已过期的数据源，节省 API 配额和等待时间。
+    """
+
+    def __init__(self, cache_file: str = None, default_ttl: int = 24 * 3600,
+                 ttl: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            cache_file: 缓存数据库文件，默认为 ~/.scouter/cache.db
+            default_ttl: 默认有效期（秒）
+            ttl: 各数据源的有效期（秒），如 {'crtsh': 43200}
+        """
+        if cache_file is None:
+            cache_file = os.path.join(os.path.expanduser("~"), '.scouter', 'cache.db')
+        self.cache_file = cache_file
+        self.default_ttl = default_ttl
+        self.ttl = ttl or {}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        # 多个数据源线程共享同一连接，由锁保证串行访问
+        self._conn = sqlite3.connect(self.cache_file, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'source TEXT NOT NULL, domain TEXT NOT NULL, query TEXT NOT NULL, '
+                'data TEXT NOT NULL, created REAL NOT NULL, '
+                'PRIMARY KEY (source, domain, query))'
+            )
+            self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config: Config = None) -> 'ResultCache':
+        """根据配置文件中的 cache 配置创建缓存"""
+        config = config or Config()
+        default_ttl = config.get_api_key('cache', 'default_ttl') or 24 * 3600
+        ttl = config.get_api_key('cache', 'ttl') or {}
+        return cls(default_ttl=int(default_ttl), ttl=ttl)
+
+    def ttl_for(self, source: str) -> int:
+        """获取数据源的有效期"""
+        return int(self.ttl.get(source, self.default_ttl))
+
+    def get(self, source: str, domain: str, query: str = '') -> Optional[Any]:
+        """获取未过期的缓存结果，不存在或已过期时返回 None"""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    'SELECT data, created FROM results WHERE source = ? AND domain = ? AND query = ?',
+                    (source, domain, query)
+                ).fetchone()
+        except sqlite3.Error as e:
+            log_error(f"读取缓存失败: {str(e)}")
+            return None
+
+        if not row or time.time() - row[1] >= self.ttl_for(source):
+            return None
+        return json.loads(row[0])
+
+    def set(self, source: str, domain: str, value: Any, query: str = ''):
+        """写入缓存结果，集合会被转换为排序后的列表"""
+        if isinstance(value, (set, frozenset)):
+            value = sorted(value)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO results (source, domain, query, data, created) VALUES (?, ?, ?, ?, ?)',
+                    (source, domain, query, json.dumps(value), time.time())
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            log_error(f"写入缓存失败: {str(e)}")
+
+    def invalidate(self, source: str, domain: str, query: str = None):
+        """删除缓存结果，未指定查询时删除该数据源该域名下的全部结果"""
+        try:
+            with self._lock:
+                if query is None:
+                    self._conn.execute('DELETE FROM results WHERE source = ? AND domain = ?', (source, domain))
+                else:
+                    self._conn.execute('DELETE FROM results WHERE source = ? AND domain = ? AND query = ?',
+                                       (source, domain, query))
+                self._conn.commit()
+        except sqlite3.Error as e:
+            log_error(f"删除缓存失败: {str(e)}")
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
@@ -55,7 +55,46 @@ class Config:
             'api_key': ''      # 微步在线 API Key
         },
         'virustotal': {
-            'api_key': ''      # VirusTotal API Key
+            'api_key': '',     # VirusTotal API Key
+            'max_pages': 4     # 最多翻页数，免费额度每分钟 4 次请求，付费额度可调大
+        },
+        'cache': {
+            'default_ttl': 86400,  # 数据源结果缓存的默认有效期（秒）
+            'ttl': {               # 各数据源的有效期（秒），未列出的使用默认值
+                'crtsh': 43200,
+                'certspotter': 43200,
+                'hackertarget': 43200,
+                'rapiddns': 43200,
+                'github_blob': 2592000,  # 代码仓库文件内容按 blob SHA 缓存，内容不会变化
+                'gitee_blob': 2592000
+            }
+        },
+        'http_cache': {
+            'max_size_mb': 256     # HTTP 条件请求缓存的大小上限
+        },
+        'ratelimit': {                     # 各主机每秒最大请求数，可带路径前缀
+            'api.github.com': 1.3,         # 5000 次/小时
+            'api.github.com/search': 0.5,  # 搜索接口 30 次/分钟
+            'gitee.com': 1,
+            'fofa.info': 1,
+            'hunter.qianxin.com': 0.5,
+            'api.shodan.io': 1,
+            'api.dnsdumpster.com': 0.5,
+            'www.virustotal.com': 0.066,   # 免费额度 4 次/分钟
+            'www.google.com': 1,           # 搜索引擎结果页，过快会触发验证码
+            'www.baidu.com': 1,
+            'www.bing.com': 2
+        },
+        'resolver_probe': {
+            'trusted_servers': ['223.5.5.5', '119.29.29.29', '8.8.8.8', '1.1.1.1'],  # 建立基准结果的可信服务器
+            'probe_domains': ['www.baidu.com'],  # 验证 DNS 服务器正确性的探测域名
+            'nxdomain_zone': 'example.com'       # 随机子域名必须返回 NXDOMAIN 的域名
+        },
+        'browser': {
+            'pool_size': 2,          # 同时运行的 Chrome 实例上限
+            'max_idle': 300,         # 空闲浏览器保留时间（秒）
+            'acquire_timeout': 300,  # 等待可用浏览器的最长时间（秒），超时的数据源直接失败
+            'driver_path': ''        # ChromeDriver 路径，为空时由 webdriver_manager 获取
         }
     }
     
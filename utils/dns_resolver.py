@@ -1,7 +1,6 @@
 import dns.resolver
 import dns.exception
 from typing import Dict, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from tqdm import tqdm
 import json
@@ -10,19 +9,29 @@ from utils.logger import log_error, log_info ,log_warning,log_success
 from utils.colors import Colors
 
 import random
-import time
 import string
-from concurrent.futures import as_completed
 import os
 import subprocess
+import shutil
+import threading
 from modules.check.takeover import check_takeover
+from utils.async_resolver import AsyncResolver
+from utils.resolver_scheduler import ResolverScheduler
+from utils.resolver_pool import ResolverPool
+from utils.wildcard import WildcardDetector
 
 class SubdomainFinder:
-    def __init__(self, domain, debug=False):
+    # 外部提供的 DNS 服务器的初始权重
+    DEFAULT_WEIGHT = 5
+    
+    def __init__(self, domain, debug=False, resolver_engine='auto', resolvers_file=None, max_resolvers=200):
         self.domain = domain
+        self.resolvers_file = resolvers_file
+        self.max_resolvers = max_resolvers
         self.subdomains = set()
         self.dns_records = {}
         self.debug = debug
+        self.server_latency = {}  # 可用性探测时测得的延迟
         
         # 设置 DNS 服务器及其初始权重
         self.server_weights = {
@@ -45,111 +54,56 @@ class SubdomainFinder:
         if not self.nameservers:
             raise Exception("没有可用的 DNS 服务器")
         
-        # DNS 服务器性能统计
+        # DNS 服务器性能统计，延迟为 EWMA，以可用性探测的延迟作为初始值
         self.server_stats = {
             server: {
                 'success': 0,
                 'failure': 0,
-                'latency': [],
+                'latency': self.server_latency.get(server),
                 'weight': self.server_weights[server]
             }
             for server in self.nameservers
         }
         
+        # 按实时权重调度 DNS 服务器，并根据查询结果更新统计
+        self.scheduler = ResolverScheduler(self.server_stats, debug=debug)
+        
         # 设置超时和重试
         self.timeout = 1
         self.tries = 1
         
+        # 解析引擎: massdns 或内置异步引擎 aiodns
+        self.resolver_engine = self._select_engine(resolver_engine)
+        
         # 修改泛解析相关的属性
         self.has_wildcard = False
         self.wildcard_records = []  # 存储 (ip_set, ttl) 元组
         
+        # 各区域（主域名及子区域）的泛解析特征
+        self.wildcard_detector = WildcardDetector(self.get_nameservers, debug=debug)
+        self.wildcard_zones = {}  # zone -> [(ip_set, ttl)]
+        self.wildcard_ips = {}    # zone -> 泛解析 IP 并集
+        self.checked_zones = set()
+        
+        # 子域名接管检测结果，CNAME 目标的检查结果在多次解析间共享
+        self.takeover_cache = {}
+        self.takeover_results = {}
+        
         # 直接调用同步方法检查泛解析
         self._check_wildcard_dns(debug)
     
     def _check_wildcard_dns(self, debug=False):
-        """检查泛解析，同时考虑 IP 和 TTL"""
+        """检查主域名的泛解析，同时考虑 IP 和 TTL"""
         print(f"[{datetime.now().strftime('%H:%M:%S')}] [{Colors.info('*')}] {Colors.info('正在检查泛解析...')}")
         
         try:
-            # 生成5个随机子域名
-            random_domains = [f"{self._generate_random_domain()}.{self.domain}" for _ in range(5)]
-            if debug:
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] [{Colors.info('*')}] {Colors.info('测试域名:')} {Colors.highlight(', '.join(random_domains))}")
-            
-            # 随机选择两个 nameserver
-            selected_nameservers = random.sample(self.nameservers, min(2, len(self.nameservers)))
-            
-            # 在开始检测前就输出使用的DNS服务器
-            if debug:
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] [{Colors.info('*')}] {Colors.info('使用的DNS服务器:')} {Colors.highlight(', '.join(selected_nameservers))}")
-            
-            # 创建同步 DNS 解析器
-            resolver = dns.resolver.Resolver()
-            resolver.nameservers = selected_nameservers
-            resolver.timeout = 2
-            resolver.lifetime = 2
-            
-            wildcard_records = []  # 存储 (ip_set, ttl) 元组
-            
-            # 解析这些随机域名
-            for domain in random_domains:
-                # 添加重试逻辑
-                max_retries = 2
-                retry_count = 0
-                
-                while retry_count <= max_retries:
-                    try:
-                        answers = resolver.resolve(domain, 'A')
-                        ips = set(str(rdata.address) for rdata in answers)
-                        ttl = answers.rrset.ttl  # 获取 TTL
-                        
-                        if ips:
-                            if debug:
-                                print(f"[{datetime.now().strftime('%H:%M:%S')}] [{Colors.info('*')}] {Colors.highlight(domain)} -> "
-                                      f"{Colors.BRIGHT_WHITE}{', '.join(ips)} (TTL: {ttl})")
-                            wildcard_records.append((ips, ttl))
-                        break  # 成功解析，跳出重试循环
-                    
-                    except dns.resolver.NXDOMAIN:
-                        if debug:
-                            print(f"[{datetime.now().strftime('%H:%M:%S')}] [{Colors.info('*')}] {Colors.highlight(domain)} -> {Colors.warning('域名不存在')}")
-                        break  # 域名不存在，不需要重试
-                    
-                    except dns.resolver.NoAnswer:
-                        if debug:
-                            print(f"[{datetime.now().strftime('%H:%M:%S')}] [{Colors.info('*')}] {Colors.highlight(domain)} -> {Colors.warning('无记录')}")
-                        break  # 无记录，不需要重试
-                    
-                    except dns.resolver.Timeout:
-                        retry_count += 1
-                        if retry_count <= max_retries:
-                            if debug:
-                                print(f"[{datetime.now().strftime('%H:%M:%S')}] [{Colors.info('*')}] {Colors.highlight(domain)} -> "
-                                      f"{Colors.warning(f'查询超时，正在重试 ({retry_count}/{max_retries})...')}")
-                            # 切换到另一个 nameserver 进行重试
-                            if len(self.nameservers) > 2:
-                                new_nameserver = random.choice([ns for ns in self.nameservers if ns not in resolver.nameservers])
-                                resolver.nameservers = [new_nameserver]
-                                if debug:
-                                    print(f"[{datetime.now().strftime('%H:%M:%S')}] [{Colors.info('*')}] 切换到 DNS 服务器: {Colors.highlight(new_nameserver)}")
-                        else:
-                            if debug:
-                                print(f"[{datetime.now().strftime('%H:%M:%S')}] [{Colors.info('*')}] {Colors.highlight(domain)} -> {Colors.error('查询超时，已达最大重试次数')}")
-                    
-                    except Exception as e:
-                        if debug:
-                            print(f"[{datetime.now().strftime('%H:%M:%S')}] [{Colors.info('*')}] {Colors.highlight(domain)} -> {Colors.error(f'查询失败: {str(e)}')}")
-                        break  # 其他错误，不重试
-            
-            # 检查是否存在泛解析（IP集合和TTL都相同）
-            if len(wildcard_records) >= 4:  # 需要4个都解析成功
-                first_record = wildcard_records[0]
-                if all(record == first_record for record in wildcard_records):
-                    self.has_wildcard = True
-                    self.wildcard_records = wildcard_records
-                    log_warning(f"发现泛解析,IP: {', '.join(first_record[0])}, TTL: {first_record[1]}")
-                    return
+            wildcard_records = self.wildcard_detector.detect(self.domain)
+            self.checked_zones.add(self.domain)
+            if wildcard_records:
+                self.has_wildcard = True
+                self.wildcard_records = wildcard_records
+                self._add_wildcard_zone(self.domain, wildcard_records)
+                return
             
             log_info('未发现泛解析')
             
@@ -193,33 +147,35 @@ class SubdomainFinder:
         return True
     
     def _check_nameservers_availability(self) -> List[str]:
-        """检查 DNS 服务器可用性并保存可用服务器到文件"""
+        """并发验证 DNS 服务器可用性并保存可用服务器到文件"""
         print(f"[{datetime.now().strftime('%H:%M:%S')}] [{Colors.info('*')}] {Colors.info('正在检查 DNS 服务器可用性...')}")
         
-        available_servers = []
-        test_domain = "www.baidu.com"
         resolver_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'dict', 'resolver.txt')
+        candidates = list(self.server_weights.keys())
         
-        # 测试所有DNS服务器
-        for server in self.server_weights.keys():
+        # 追加用户提供的大批量公共 DNS 服务器
+        if self.resolvers_file:
             try:
-                resolver = dns.resolver.Resolver()
-                resolver.nameservers = [server]
-                resolver.timeout = 2
-                resolver.lifetime = 2
-                
-                start_time = time.time()
-                try:
-                    resolver.resolve(test_domain, 'A')
-                    latency = time.time() - start_time
-                    available_servers.append(server)
-                    if self.debug:
-                        log_info(f"DNS 服务器 {Colors.highlight(server)} 可用 (延迟: {latency:.3f}s)")
-                except Exception:
-                    if self.debug:
-                        log_error(f"DNS 服务器 {Colors.highlight(server)} 不可用")
+                extra_servers = ResolverPool.load_file(self.resolvers_file)
+                for server in extra_servers:
+                    self.server_weights.setdefault(server, self.DEFAULT_WEIGHT)
+                candidates.extend(extra_servers)
+                log_info(f"从 {self.resolvers_file} 加载了 {len(extra_servers)} 个 DNS 服务器")
             except Exception as e:
-                log_error(f"DNS 服务器 {Colors.highlight(server)} 测试失败: {str(e)}")
+                log_error(f"读取 DNS 服务器列表失败: {str(e)}")
+        
+        pool = ResolverPool.from_config(debug=self.debug)
+        self.server_latency = pool.validate(candidates, limit=self.max_resolvers)
+        available_servers = [server for server in candidates if server in self.server_latency]
+        available_servers = list(dict.fromkeys(available_servers))
+        
+        # 探测本身可能因网络环境失败（如可信服务器不可达），此时退回未验证的列表
+        if not available_servers and candidates:
+            log_warning("没有 DNS 服务器通过验证，使用未经验证的服务器列表")
+            available_servers = list(dict.fromkeys(candidates))
+            if self.max_resolvers:
+                available_servers = available_servers[:self.max_resolvers]
+            self.server_latency = {}
         
         # 保存可用的服务器到文件
         if available_servers:
@@ -234,189 +190,302 @@ class SubdomainFinder:
         
         return available_servers
 
-  
+    def get_nameservers(self, count: int = 2) -> List[str]:
+        """按实时权重选择若干个不同的可用 DNS 服务器"""
+        servers = []
+        for _ in range(min(count, len(self.nameservers))):
+            server = self.scheduler.pick(exclude=servers)
+            if server in servers:
+                break
+            servers.append(server)
+        return servers
+
+    def _write_weighted_resolvers(self, path: str) -> str:
+        """按实时权重生成 massdns 使用的服务器列表文件"""
+        with open(path, 'w') as f:
+            for server in self.scheduler.weighted_list():
+                f.write(f"{server}\n")
+        return path
 
-    def dns_brute(self, subdomains: set, max_threads: Optional[int] = None, debug=False):
-        """使用 massdns 进行 DNS 爆破"""
+    def _select_engine(self, engine: str) -> str:
+        """确定使用的解析引擎，massdns 不存在时（包括显式指定）使用内置异步引擎"""
+        if engine not in ('auto', 'massdns'):
+            return engine
+        if shutil.which('massdns'):
+            return 'massdns'
+        if engine == 'massdns':
+            log_warning('未找到 massdns，改用内置异步解析引擎，如需使用 massdns 请先安装')
+        else:
+            log_warning('未找到 massdns，使用内置异步解析引擎')
+        return 'aiodns'
+
+    def dns_brute(self, subdomains: set, max_threads: Optional[int] = None, debug=False, takeover=True):
+        """对子域名进行 DNS 解析
+        
+        根据 resolver_engine 使用 massdns 或内置异步解析引擎，两者返回相同结构的结果。
+        
+        Args:
+            subdomains: 待解析的子域名集合
+            max_threads: 内置引擎的最大在途查询数
+            debug: 是否显示调试信息
+            takeover: 解析完成后是否进行子域名接管检测，为 False 时由调用方自行调用 detect_takeover
+        Returns:
+            (有效子域名集合, DNS 记录)
+        """
         self.debug = debug
+        if self.resolver_engine == 'aiodns':
+            valid_domains, valid_records = self._dns_brute_native(subdomains, max_threads)
+        else:
+            valid_domains, valid_records = self._dns_brute_massdns(subdomains)
+        
+        if takeover and valid_records:
+            valid_domains |= self.detect_takeover(valid_records)
+        return valid_domains, valid_records
+
+    def detect_takeover(self, records: Dict[str, Dict[str, List[str]]]) -> set:
+        """对解析结果统一进行子域名接管检测
+        
+        同一 CNAME 目标只检查一次，结果累计到 takeover_results。
+        
+        Returns:
+            只有 CNAME 记录且存在接管风险的子域名，这些子域名也视为有效
+        """
+        results = check_takeover(self.domain, records, self.debug, cache=self.takeover_cache)
+        self.takeover_results.update(results)
+        
+        cname_only = {domain for domain in results if not records[domain]['A']}
+        for domain in cname_only:
+            log_warning(f"域名 {Colors.highlight(domain)} 只有CNAME记录且存在接管风险!")
+        return cname_only
+
+    def _dns_brute_native(self, subdomains: set, max_threads: Optional[int] = None):
+        """使用内置异步解析引擎进行 DNS 爆破"""
+        try:
+            log_info(f'开始使用内置异步解析引擎扫描 {len(subdomains)} 个子域名...')
+            resolver = AsyncResolver(
+                self.nameservers,
+                concurrency=max_threads or 500,
+                scheduler=self.scheduler,
+                debug=self.debug
+            )
+            records = resolver.resolve(subdomains)
+        except Exception as e:
+            log_error(f'执行过程中出错: {str(e)}')
+            return set(), {}
+        
+        if self.debug:
+            self.scheduler.summary()
+        
+        valid_domains, valid_records = self._process_records(records)
+        log_success(f'扫描完成，发现 {len(valid_domains)} 个有效子域名')
+        return valid_domains, valid_records
+
+    def _process_records(self, records: Dict[str, Dict[str, List[str]]]):
+        """根据解析记录确定有效子域名
+        
+        有 A 记录的子域名有效，存在泛解析时过滤掉命中泛解析 IP 的子域名。
+        只有 CNAME 记录的子域名保留在 DNS 记录中，由解析完成后的接管检测决定是否有效。
+        """
+        valid_domains = set()
+        valid_records = {}
+        cname_records = {}
+        
+        for domain, record in records.items():
+            if record['A']:
+                valid_domains.add(domain)
+                valid_records[domain] = {'A': record['A'], 'CNAME': record['CNAME']}
+            elif record['CNAME']:
+                cname_records[domain] = {'A': [], 'CNAME': record['CNAME']}
+                if self.debug:
+                    log_info(f"域名 {Colors.highlight(domain)} 只有CNAME记录: {Colors.highlight(', '.join(record['CNAME']))}")
+        
+        # 检测解析结果中出现的子区域是否存在泛解析
+        self._check_subzone_wildcards(valid_domains)
+        if not self.wildcard_zones:
+            valid_records.update(cname_records)
+            return valid_domains, valid_records
+        
+        # 过滤命中所在区域泛解析的子域名（只比较 IP）
+        filtered_domains = set()
+        filtered_records = dict(cname_records)
+        wildcard_hits = {}
+        for domain in valid_domains:
+            if self._is_wildcard_hit(domain, valid_records[domain]['A']):
+                zone = self._find_wildcard_zone(domain)
+                wildcard_hits[zone] = wildcard_hits.get(zone, 0) + 1
+            else:
+                filtered_domains.add(domain)
+                filtered_records[domain] = valid_records[domain]
+        
+        if self.debug:
+            for zone, count in wildcard_hits.items():
+                log_warning(f"共发现 {Colors.highlight(str(count))} 个域名命中 {Colors.highlight(zone)} 的泛解析 "
+                          f"(IP: {Colors.highlight(', '.join(self.wildcard_ips[zone]))})")
+        
+        return filtered_domains, filtered_records
+
+    def _check_subzone_wildcards(self, domains: set):
+        """对子域名集合中出现的、尚未检测过的子区域进行泛解析检测"""
+        zones = WildcardDetector.candidate_zones(domains, self.domain) - self.checked_zones
+        if not zones:
+            return
+        if self.debug:
+            log_info(f"正在检测 {Colors.highlight(len(zones))} {Colors.info('个子区域的泛解析...')}")
+        self.checked_zones.update(zones)
+        for zone, records in self.wildcard_detector.detect_many(zones).items():
+            self._add_wildcard_zone(zone, records)
+
+    def _add_wildcard_zone(self, zone: str, records: List[Tuple[set, int]]):
+        """记录区域的泛解析特征"""
+        if not records:
+            return
+        self.wildcard_zones[zone] = records
+        self.wildcard_ips[zone] = set().union(*(ips for ips, _ in records))
+
+    def _find_wildcard_zone(self, domain: str) -> Optional[str]:
+        """找到子域名所在的、存在泛解析的最近区域"""
+        labels = domain.split('.')
+        for i in range(1, len(labels)):
+            zone = '.'.join(labels[i:])
+            if zone in self.wildcard_zones:
+                return zone
+            if zone == self.domain:
+                break
+        return None
+
+    def _dns_brute_massdns(self, subdomains: set):
+        """使用 massdns 进行 DNS 爆破
         
+        子域名通过 stdin 送入 massdns，NDJSON 结果从 stdout 逐行读取，每行只解析一次，
+        命中已知泛解析的结果在读取时直接丢弃。
+        """
         # 准备文件路径
         result_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'result')
         os.makedirs(result_dir, exist_ok=True)
         
         domain_base = self.domain.replace('.', '_')
-        temp_input = os.path.join(result_dir, f'{domain_base}_temp_input.txt')
-        result_file = os.path.join(result_dir, f'{self.domain}.txt')
-        wildcard_file = os.path.join(result_dir, f'{self.domain}_wildcard.txt')  # 添加泛解析记录文件
-        resolver_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'dict', 'resolver.txt')
+        resolver_file = os.path.join(result_dir, f'{domain_base}_resolvers.txt')
         
-        # 将子域名写入临时文件
         try:
-            with open(temp_input, 'w') as f:
-                for subdomain in subdomains:
-                    f.write(f"{subdomain}\n")
-            log_info(f'已将 {len(subdomains)} 个子域名写入临时文件')
+            self._write_weighted_resolvers(resolver_file)
         except Exception as e:
-            log_error(f'写入临时文件失败: {str(e)}')
+            log_error(f'写入 DNS 服务器列表失败: {str(e)}')
             return set(), {}
         
         try:
             # 执行 massdns
-            log_info('开始使用 massdns 进行扫描...')
-            
-            # 使用 subprocess.run 执行命令
-            result = subprocess.run([
+            log_info(f'开始使用 massdns 扫描 {len(subdomains)} 个子域名...')
+            process = subprocess.Popen([
                 'massdns',
                 '-r', resolver_file,  # 使用绝对路径
                 '-t', 'A',
                 '-o', 'J',
-                '-w', result_file,
-                temp_input
-            ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+                '-q'
+            ], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                text=True, bufsize=1 << 16)
             
-            if result.returncode != 0:
+            # 在独立线程中写入子域名，避免与读取结果互相阻塞
+            writer = threading.Thread(target=self._feed_massdns, args=(process, subdomains), daemon=True)
+            writer.start()
+            
+            records = {}
+            wildcard_hits = 0
+            for line in process.stdout:
+                parsed = self._parse_massdns_line(line)
+                if not parsed:
+                    continue
+                domain, record = parsed
+                
+                # 命中已知泛解析的结果直接丢弃
+                if self._is_wildcard_hit(domain, record['A']):
+                    wildcard_hits += 1
+                    continue
+                
+                if domain in records:
+                    records[domain]['A'].extend(record['A'])
+                    records[domain]['CNAME'].extend(record['CNAME'])
+                else:
+                    records[domain] = record
+            
+            writer.join()
+            if process.wait() != 0:
                 log_error('massdns 执行失败')
                 return set(), {}
             
-            # 读取结果文件并处理
-            valid_domains = set()
-            valid_records = {}
+            if self.debug:
+                if wildcard_hits:
+                    log_warning(f"共有 {Colors.highlight(str(wildcard_hits))} 个结果命中已知泛解析")
+                self.scheduler.summary()
             
-            if os.path.exists(result_file):
-                with open(result_file, 'r') as f:
-                    for line in f:
-                        try:
-                            # 解析JSON格式的结果
-                            result = json.loads(line.strip())
-                            domain = result['name'].rstrip('.')  # 移除末尾的点
-                            
-                            if result['status'] == 'NOERROR' and 'data' in result:
-                                answers = result['data'].get('answers', [])
-                                
-                                # 初始化该域名的记录
-                                if domain not in valid_records:
-                                    valid_records[domain] = {'A': [], 'CNAME': []}
-                                
-                                # 处理每个答案
-                                has_a_record = False  # 标记是否有A记录
-                                for answer in answers:
-                                    if answer['type'] == 'A':
-                                        valid_records[domain]['A'].append(answer['data'])
-                                        has_a_record = True
-                                    elif answer['type'] == 'CNAME':
-                                        valid_records[domain]['CNAME'].append(answer['data'].rstrip('.'))
-                                
-                                # 只有当有A记录时才添加到有效域名集合
-                                if has_a_record:
-                                    valid_domains.add(domain)
-                                    valid_records[domain] = {'A': valid_records[domain]['A'], 'CNAME': valid_records[domain]['CNAME']}
-                                elif valid_records[domain]['CNAME']:
-                                    # 如果只有 CNAME 记录,检查是否可能被接管
-                                    temp_records = {domain: valid_records[domain]}
-                                    takeover_results = check_takeover(self.domain, temp_records, self.debug)
-                                    
-                                    if takeover_results:
-                                        # 如果发现接管风险,也将其添加到有效域名集合
-                                        valid_domains.add(domain)
-                                        valid_records[domain] = {'A': [], 'CNAME': valid_records[domain]['CNAME']}
-                                        log_warning(f"域名 {Colors.highlight(domain)} 只有CNAME记录且存在接管风险!")
-                                        for info in takeover_results.values():
-                                            log_warning(f"  - CNAME: {Colors.highlight(info['cname'])}")
-                                            log_warning(f"  - 服务: {Colors.highlight(info['service'])}")
-                                            log_warning(f"  - 详情: {Colors.highlight(info['details'])}")
-                                    elif self.debug:
-                                        log_info(f"域名 {Colors.highlight(domain)} 只有CNAME记录: {Colors.highlight(', '.join(valid_records[domain]['CNAME']))}")
-                        except json.JSONDecodeError as e:
-                            if self.debug:
-                                log_error(f'JSON解析失败: {str(e)}')
-                            continue
-                        except Exception as e:
-                            if self.debug:
-                                log_error(f'处理结果行失败: {str(e)}')
-                            continue
-                
-                # 检查泛解析
-                if self.has_wildcard:
-                    wildcard_ips = set()
-                    for ips, _ in self.wildcard_records:  # 忽略 TTL
-                        wildcard_ips.update(ips)
-                    
-                    filtered_domains = set()
-                    filtered_records = {}
-                    wildcard_hit_count = 0
-                    
-                    # 预先读取所有结果到内存
-                    domain_results = {}
-                    try:
-                        with open(result_file, 'r') as f:
-                            for line in f:
-                                result = json.loads(line.strip())
-                                domain = result['name'].rstrip('.')
-                                domain_results[domain] = result
-                    except Exception as e:
-                        if self.debug:
-                            log_error(f'读取结果文件失败: {str(e)}')
-                        return valid_domains, valid_records
-                    
-                    def check_domain_wildcard(domain):
-                        """检查单个域名是否命中泛解析"""
-                        try:
-                            records = valid_records[domain]
-                            domain_ips = set(records['A'])
-                            
-                            # 只检查 IP 是否匹配泛解析
-                            is_wildcard = domain_ips and domain_ips.issubset(wildcard_ips)
-                            
-                            # if is_wildcard and self.debug:
-                            #     log_warning(f"域名 {Colors.highlight(domain)} 命中IP泛解析: "
-                            #               f"{Colors.highlight(', '.join(domain_ips))}")
-                            
-                            return domain, records, is_wildcard
-                            
-                        except Exception as e:
-                            if self.debug:
-                                log_error(f'处理域名 {domain} 时出错: {str(e)}')
-                            return domain, valid_records.get(domain), False
-                    
-                    # 使用线程池并行处理
-                    with ThreadPoolExecutor(max_workers=min(32, len(valid_domains))) as executor:
-                        futures = [executor.submit(check_domain_wildcard, domain) for domain in valid_domains]
-                        
-                        for future in as_completed(futures):
-                            try:
-                                domain, records, is_wildcard = future.result()
-                                if is_wildcard:
-                                    wildcard_hit_count += 1
-                                else:
-                                    filtered_domains.add(domain)
-                                    filtered_records[domain] = records
-                            except Exception as e:
-                                if self.debug:
-                                    log_error(f'处理结果时出错: {str(e)}')
-                    
-                    if self.debug:
-                        log_warning(f"共发现 {Colors.highlight(str(wildcard_hit_count))} 个域名命中泛解析 "
-                                  f"(IP: {Colors.highlight(', '.join(wildcard_ips))})")
-                    
-                    valid_domains = filtered_domains
-                    valid_records = filtered_records
-                
-                log_success(f'扫描完成，发现 {len(valid_domains)} 个有效子域名')
+            valid_domains, valid_records = self._process_records(records)
+            log_success(f'扫描完成，发现 {len(valid_domains)} 个有效子域名')
+            return valid_domains, valid_records
             
+        except Exception as e:
+            log_error(f'执行过程中出错: {str(e)}')
+            return set(), {}
+        
+        finally:
             # 清理临时文件
             try:
-                os.remove(temp_input)
-                if self.debug:
-                    log_info('已清理临时文件')
+                os.remove(resolver_file)
             except Exception as e:
                 if self.debug:
                     log_error(f'清理临时文件失败: {str(e)}')
+
+    def _feed_massdns(self, process: subprocess.Popen, subdomains: set):
+        """向 massdns 的 stdin 写入子域名"""
+        try:
+            for subdomain in subdomains:
+                process.stdin.write(f"{subdomain}\n")
+        except (BrokenPipeError, ValueError):
+            # massdns 提前退出
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except Exception:
+                pass
+
+    def _parse_massdns_line(self, line: str):
+        """解析一行 massdns 输出并更新服务器统计
+        
+        Returns:
+            (子域名, {'A': [], 'CNAME': []})，非 NOERROR 应答返回 None
+        """
+        try:
+            result = json.loads(line)
+        except json.JSONDecodeError as e:
+            if self.debug:
+                log_error(f'JSON解析失败: {str(e)}')
+            return None
+        
+        try:
+            # 根据应答状态更新服务器统计
+            server = result.get('resolver', '').rsplit(':', 1)[0]
+            if result['status'] in ('SERVFAIL', 'REFUSED'):
+                self.scheduler.report_failure(server, '返回错误')
+            else:
+                self.scheduler.report_success(server)
             
-            return valid_domains, valid_records
+            if result['status'] != 'NOERROR' or 'data' not in result:
+                return None
             
+            record = {'A': [], 'CNAME': []}
+            for answer in result['data'].get('answers', []):
+                if answer['type'] == 'A':
+                    record['A'].append(answer['data'])
+                elif answer['type'] == 'CNAME':
+                    record['CNAME'].append(answer['data'].rstrip('.'))
+            return result['name'].rstrip('.'), record  # 移除末尾的点
         except Exception as e:
-            log_error(f'执行过程中出错: {str(e)}')
-            return set(), {}
-
-    
+            if self.debug:
+                log_error(f'处理结果行失败: {str(e)}')
+            return None
 
+    def _is_wildcard_hit(self, domain: str, ips: List[str]) -> bool:
+        """子域名的 IP 是否全部落在所在区域的已知泛解析 IP 中"""
+        if not ips or not self.wildcard_zones:
+            return False
+        zone = self._find_wildcard_zone(domain)
+        return bool(zone) and set(ips).issubset(self.wildcard_ips[zone])
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import BinaryIO, Dict, Optional, Tuple
+from urllib.parse import urlencode
+from utils.config import Config
+from utils.logger import log_error
+
+# 不随响应体保存的响应头，缓存的是解码后的内容
+SKIP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie'}
+
+class HttpCache:
+    """HTTP 条件请求缓存
+
+    保存带有 ETag 或 Last-Modified 的 GET 响应，再次请求时携带 If-None-Match /
+    If-Modified-Since 重新验证，服务端返回 304 时直接使用本地副本。
+    索引保存在 SQLite 中，响应体单独保存为文件，总大小超过上限时按最近访问时间淘汰。
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: 缓存目录，默认为 ~/.scouter/http_cache
+            max_bytes: 响应体总大小上限（字节）
+        """
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.expanduser("~"), '.scouter', 'http_cache')
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(self.cache_dir, 'index.db'), check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, url TEXT NOT NULL, etag TEXT, last_modified TEXT, '
+                'headers TEXT NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)'
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict] = None) -> str:
+        """根据 URL 和查询参数生成缓存键"""
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(sorted(params.items()), doseq=True)}"
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.body')
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """返回重新验证所需的条件请求头，本地副本不存在时返回空字典"""
+        with self._lock:
+            row = self._conn.execute('SELECT etag, last_modified FROM entries WHERE key = ?', (key,)).fetchone()
+        if not row or not os.path.exists(self._body_path(key)):
+            return {}
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def load(self, key: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """读取本地副本并更新访问时间
+
+        Returns:
+            (响应头, 响应体)，不存在时返回 None
+        """
+        try:
+            with open(self._body_path(key), 'rb') as f:
+                content = f.read()
+            with self._lock:
+                row = self._conn.execute('SELECT headers FROM entries WHERE key = ?', (key,)).fetchone()
+                self._conn.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+                self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            log_error(f"读取 HTTP 缓存失败: {str(e)}")
+            return None
+        if not row:
+            return None
+        return json.loads(row[0]), content
+
+    def open_body(self, key: str) -> Optional[BinaryIO]:
+        """以文件形式打开本地副本并更新访问时间，用于流式读取大响应"""
+        try:
+            f = open(self._body_path(key), 'rb')
+            with self._lock:
+                self._conn.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+                self._conn.commit()
+            return f
+        except (OSError, sqlite3.Error):
+            return None
+
+    @staticmethod
+    def is_cacheable(headers) -> bool:
+        """响应是否带有可用于重新验证的 ETag 或 Last-Modified"""
+        return bool(headers.get('ETag') or headers.get('Last-Modified'))
+
+    def temp_path(self, key: str) -> str:
+        """流式写入响应体时使用的临时文件路径"""
+        return f'{self._body_path(key)}.{threading.get_ident()}.tmp'
+
+    def store(self, key: str, url: str, headers, content: bytes) -> bool:
+        """保存响应，没有 ETag 和 Last-Modified 的响应无法重新验证，不保存
+
+        Returns:
+            是否已保存
+        """
+        if not self.is_cacheable(headers) or len(content) > self.max_bytes:
+            return False
+        tmp_path = self.temp_path(key)
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+        except OSError as e:
+            log_error(f"写入 HTTP 缓存失败: {str(e)}")
+            return False
+        return self.store_file(key, url, headers, tmp_path)
+
+    def store_file(self, key: str, url: str, headers, path: str) -> bool:
+        """将已写入临时文件的响应体移入缓存，文件会被移动或删除
+
+        Returns:
+            是否已保存
+        """
+        size = os.path.getsize(path)
+        if not self.is_cacheable(headers) or size > self.max_bytes:
+            os.remove(path)
+            return False
+
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        saved_headers = {name: value for name, value in headers.items() if name.lower() not in SKIP_HEADERS}
+        try:
+            os.replace(path, self._body_path(key))
+            with self._lock:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO entries (key, url, etag, last_modified, headers, size, accessed) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (key, url, etag, last_modified, json.dumps(saved_headers), size, time.time())
+                )
+                self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            log_error(f"写入 HTTP 缓存失败: {str(e)}")
+            return False
+
+        self._evict()
+        return True
+
+    def _evict(self):
+        """总大小超过上限时按最近访问时间淘汰"""
+        with self._lock:
+            total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evicted = []
+            for key, size in self._conn.execute('SELECT key, size FROM entries ORDER BY accessed'):
+                if total <= self.max_bytes:
+                    break
+                evicted.append(key)
+                total -= size
+            self._conn.executemany('DELETE FROM entries WHERE key = ?', [(key,) for key in evicted])
+            self._conn.commit()
+        for key in evicted:
+            try:
+                os.remove(self._body_path(key))
+            except OSError:
+                pass
+
+_http_cache: Optional[HttpCache] = None
+_http_cache_lock = threading.Lock()
+
+def get_http_cache() -> HttpCache:
+    """获取进程内共享的 HTTP 缓存，大小上限来自配置文件中的 http_cache"""
+    global _http_cache
+    if _http_cache is None:
+        with _http_cache_lock:
+            if _http_cache is None:
+                max_size_mb = Config().get_api_key('http_cache', 'max_size_mb') or 256
+                _http_cache = HttpCache(max_bytes=int(max_size_mb) * 1024 * 1024)
+    return _http_cache
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+import itertools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Set
+from utils.colors import Colors
+from utils.logger import log_info, log_error, log_warning
+
+class ScanState:
+    """增量扫描状态
+
+    记录上一次扫描的有效子域名及其解析记录，以及解析失败的候选子域名。再次扫描时
+    只解析从未出现过的候选子域名，已知子域名（即使数据源不再返回）按较长的复查间隔重新解析，
+    并输出与上一次结果相比新增、消失和记录变化的子域名。已知子域名连续 max_misses 次
+    解析失败才视为消失，避免一次超时造成误报。
+    """
+
+    def __init__(self, state_file: str, recheck_interval: float = 72 * 3600, max_misses: int = 3):
+        """
+        Args:
+            state_file: 状态文件路径，如 result/<domain>_state.json
+            recheck_interval: 已知子域名和解析失败的候选子域名的复查间隔（秒）
+            max_misses: 已知子域名连续解析失败多少次后视为消失
+        """
+        self.state_file = state_file
+        self.recheck_interval = recheck_interval
+        self.max_misses = max_misses
+        self.records: Dict[str, Dict] = {}   # 有效子域名 -> {'A': [], 'CNAME': [], 'checked': 时间, 'misses': 连续失败次数}
+        self.misses: Dict[str, float] = {}   # 解析失败的候选子域名 -> 检查时间
+        self.attempted: Set[str] = set()     # 本次扫描提交解析的子域名
+        self.transient: Set[str] = set()     # 字典生成的候选子域名，解析失败时不记录
+        self._known_added = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """加载上一次扫描的状态"""
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            self.records = state.get('records', {})
+            self.misses = state.get('misses', {})
+            log_info(f"已加载上一次扫描状态: {Colors.highlight(len(self.records))} {Colors.info('个已知子域名')}")
+        except Exception as e:
+            log_error(f"加载扫描状态失败: {str(e)}")
+
+    def save(self):
+        """保存扫描状态，已到复查时间的失败记录不再保存"""
+        now = time.time()
+        self.misses = {name: checked for name, checked in self.misses.items() if not self._is_due(checked, now)}
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(self.state_file, 'w') as f:
+                json.dump({'records': self.records, 'misses': self.misses, 'updated': time.time()}, f)
+        except Exception as e:
+            log_error(f"保存扫描状态失败: {str(e)}")
+
+    def _is_due(self, checked: float, now: float) -> bool:
+        """是否到达复查时间"""
+        return now - checked >= self.recheck_interval
+
+    def pending(self, candidates: Iterable[str]) -> Set[str]:
+        """筛选需要解析的子域名：新出现的候选子域名以及到达复查时间的已知子域名
+
+        第一次调用时还会加入所有到达复查时间的已知子域名，数据源不再返回的子域名也能被复查。
+        """
+        now = time.time()
+        result = set()
+        with self._lock:
+            if not self._known_added:
+                self._known_added = True
+                candidates = itertools.chain(candidates, self.records)
+            for name in candidates:
+                name = name.lower()
+                if name in self.attempted:
+                    continue
+                if name in self.records:
+                    checked = self.records[name].get('checked', 0)
+                else:
+                    checked = self.misses.get(name)
+                if checked is None or self._is_due(checked, now):
+                    result.add(name)
+            self.attempted.update(result)
+        return result
+
+    def update(self, resolved_domains: Set[str], dns_records: Dict[str, Dict[str, List[str]]]) -> Dict[str, List]:
+        """合并本次解析结果并计算变化
+
+        Args:
+            resolved_domains: 本次解析确认的有效子域名
+            dns_records: 本次解析的 DNS 记录
+        Returns:
+            {'added': [...], 'removed': [...], 'changed': [...]}
+        """
+        now = time.time()
+        delta = {'added': [], 'removed': [], 'changed': []}
+
+        for name in sorted(self.attempted):
+            previous = self.records.get(name)
+            if name not in resolved_domains:
+                if previous is None:
+                    if name not in self.transient:
+                        self.misses[name] = now
+                    continue
+                # 已知子域名连续多次解析失败才视为消失
+                previous['misses'] = previous.get('misses', 0) + 1
+                previous['checked'] = now
+                if previous['misses'] >= self.max_misses:
+                    del self.records[name]
+                    delta['removed'].append({'domain': name, 'A': previous['A'], 'CNAME': previous['CNAME']})
+                continue
+
+            record = dns_records.get(name, {})
+            current = {'A': sorted(record.get('A', [])), 'CNAME': sorted(record.get('CNAME', []))}
+            self.misses.pop(name, None)
+            self.records[name] = dict(current, checked=now, misses=0)
+
+            if previous is None:
+                delta['added'].append(dict(current, domain=name))
+            elif previous['A'] != current['A'] or previous['CNAME'] != current['CNAME']:
+                delta['changed'].append({
+                    'domain': name,
+                    'old': {'A': previous['A'], 'CNAME': previous['CNAME']},
+                    'new': current
+                })
+        return delta
+
+    def domains(self) -> Set[str]:
+        """当前所有有效子域名"""
+        return set(self.records)
+
+    def dns_records(self) -> Dict[str, Dict[str, List[str]]]:
+        """当前所有有效子域名的 DNS 记录"""
+        return {name: {'A': record['A'], 'CNAME': record['CNAME']} for name, record in self.records.items()}
+
+    @staticmethod
+    def save_delta(delta: Dict[str, List], delta_file: str):
+        """保存变化结果并打印统计"""
+        try:
+            with open(delta_file, 'w') as f:
+                json.dump(dict(delta, time=datetime.now().isoformat()), f, indent=4)
+        except Exception as e:
+            log_error(f"保存变化结果失败: {str(e)}")
+            return
+
+        log_info(f"增量扫描: 新增 {Colors.highlight(len(delta['added']))} 个, "
+                 f"消失 {Colors.highlight(len(delta['removed']))} 个, "
+                 f"记录变化 {Colors.highlight(len(delta['changed']))} 个, 变化结果已保存到: {delta_file}")
+        for item in delta['added']:
+            log_warning(f"新增子域名: {Colors.highlight(item['domain'])} {', '.join(item['A'] or item['CNAME'])}")
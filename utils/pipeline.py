@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+from utils.colors import Colors
+from utils.logger import log_info, log_success, log_error
+
+class StreamingResolver:
+    """流式解析管道
+
+    数据源每产出一批子域名就送入队列，后台线程按微批次交给 SubdomainFinder 解析，
+    确认有效的子域名立即追加写入实时结果文件，使解析与数据源收集重叠进行。
+    """
+
+    def __init__(self, get_finder: Callable, live_file: str, batch_size: int = 2000,
+                 flush_interval: float = 3.0, debug: bool = False):
+        """
+        Args:
+            get_finder: 获取 SubdomainFinder 的函数，会阻塞直到解析器就绪
+            live_file: 实时结果文件路径
+            batch_size: 微批次最大子域名数
+            flush_interval: 批次未满时的最长等待时间（秒）
+            debug: 是否显示调试信息
+        """
+        self.get_finder = get_finder
+        self.live_file = live_file
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.debug = debug
+
+        self.queue = queue.Queue()
+        self.seen: Set[str] = set()
+        self.valid_domains: Set[str] = set()
+        self.dns_records: Dict[str, Dict[str, List[str]]] = {}
+        self.error = None
+        self.finder = None
+
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """启动后台解析线程"""
+        # 清空上一次扫描的实时结果
+        try:
+            os.makedirs(os.path.dirname(self.live_file), exist_ok=True)
+            open(self.live_file, 'w').close()
+        except Exception as e:
+            log_error(f'创建实时结果文件失败: {str(e)}')
+        self._thread.start()
+
+    def submit(self, subdomains: Iterable[str]):
+        """提交子域名，已提交过的子域名会被忽略"""
+        new_domains = []
+        with self._lock:
+            for subdomain in subdomains:
+                subdomain = subdomain.lower()
+                if subdomain not in self.seen:
+                    self.seen.add(subdomain)
+                    new_domains.append(subdomain)
+        for subdomain in new_domains:
+            self.queue.put(subdomain)
+
+    def close(self) -> Tuple[Set[str], Dict[str, Dict[str, List[str]]]]:
+        """等待队列中剩余的子域名解析完成，并对全部结果统一进行一次接管检测
+
+        Returns:
+            (有效子域名集合, DNS 记录)
+        """
+        self._closed.set()
+        self._thread.join()
+        if self.error:
+            raise self.error
+        if self.finder and self.dns_records:
+            self._emit(self.finder.detect_takeover(self.dns_records), {})
+        return self.valid_domains, self.dns_records
+
+    def _next_batch(self) -> Set[str]:
+        """从队列中取出一个微批次"""
+        batch = set()
+        deadline = None
+        while len(batch) < self.batch_size:
+            timeout = 0.2 if deadline is None else max(0, deadline - time.time())
+            try:
+                batch.add(self.queue.get(timeout=timeout))
+                if deadline is None:
+                    deadline = time.time() + self.flush_interval
+            except queue.Empty:
+                # 数据源已全部结束时不再等待批次填满
+                if batch and (self._closed.is_set() or time.time() >= deadline):
+                    break
+                if not batch and self._closed.is_set():
+                    break
+        return batch
+
+    def _run(self):
+        """后台解析循环"""
+        try:
+            finder = self.finder = self.get_finder()
+            while True:
+                batch = self._next_batch()
+                if not batch:
+                    if self._closed.is_set() and self.queue.empty():
+                        break
+                    continue
+
+                if self.debug:
+                    log_info(f'流式解析批次: {Colors.highlight(len(batch))} 个子域名')
+                # 接管检测在全部批次完成后统一进行
+                domains, records = finder.dns_brute(batch, debug=self.debug, takeover=False)
+                self._emit(domains, records)
+        except Exception as e:
+            self.error = e
+
+    def _emit(self, domains: Set[str], records: Dict[str, Dict[str, List[str]]]):
+        """记录并立即写出本批次确认的子域名"""
+        new_domains = sorted(domains - self.valid_domains)
+        self.valid_domains.update(domains)
+        # 只有 CNAME 记录的子域名也保留，供最终的接管检测使用
+        self.dns_records.update(records)
+
+        if not new_domains:
+            return
+        try:
+            with open(self.live_file, 'a') as f:
+                for domain in new_domains:
+                    ips = self.dns_records.get(domain, {}).get('A', [])
+                    f.write(f"{domain} {','.join(ips)}\n" if ips else f"{domain}\n")
+        except Exception as e:
+            log_error(f'写入实时结果失败: {str(e)}')
+        log_success(f'实时确认 {Colors.highlight(len(new_domains))} 个有效子域名，累计 {Colors.highlight(len(self.valid_domains))} 个')
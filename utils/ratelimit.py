@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+from utils.config import Config
+from utils.logger import log_warning
+
+def parse_retry_after(value: str) -> Optional[float]:
+    """解析 Retry-After（秒数或 HTTP 日期），返回需要等待的秒数"""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+class TokenBucket:
+    """令牌桶
+
+    令牌不足时预占未来的令牌，并发调用方按先后顺序排队，各自只等待实际需要的时间。
+    除配置的速率外，还会根据响应头学习到的剩余配额调整速率，或在配额耗尽时暂停到重置时间。
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: int = 1):
+        """
+        Args:
+            rate: 每秒请求数，为 None 时不限速，只遵守服务端返回的等待时间
+            burst: 允许的突发请求数
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.time()
+        self.blocked_until = 0.0     # 服务端要求的暂停截止时间
+        self.learned_rate = None     # 根据剩余配额计算出的速率
+        self.learned_until = 0.0     # 学习到的速率的有效期（配额重置时间）
+        self.throttled = 0           # 连续被限速的次数
+        self.lock = threading.Lock()
+
+    def _effective_rate(self, now: float) -> Optional[float]:
+        """当前生效的速率"""
+        if self.learned_rate is not None and now < self.learned_until:
+            return min(self.rate, self.learned_rate) if self.rate else self.learned_rate
+        return self.rate
+
+    def reserve(self) -> float:
+        """预占一个令牌，返回需要等待的时间（秒）"""
+        with self.lock:
+            now = time.time()
+            wait = max(0.0, self.blocked_until - now)
+            rate = self._effective_rate(now)
+            if rate:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * rate)
+                self.updated = now
+                self.tokens -= 1
+                if self.tokens < 0:
+                    wait = max(wait, -self.tokens / rate)
+            return wait
+
+    def block(self, until: float):
+        """暂停到指定时间"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, until)
+
+class RateLimiter:
+    """按主机限速的请求速率限制器
+
+    进程内所有数据源共享同一个限速器，使用同一 API 密钥的并发请求统一排队。
+    限速规则以主机名（可带路径前缀，如 api.github.com/search）为键配置，
+    并从 Retry-After、X-RateLimit-* 响应头中学习实际需要等待的时间。
+    """
+
+    # 没有 Retry-After 时，被限速后的退避时间上限（秒）
+    MAX_BACKOFF = 60
+
+    def __init__(self, limits: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            limits: 各主机的每秒请求数，如 {'api.github.com': 1.3}
+        """
+        self.limits = limits or {}
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, url: str) -> Tuple[str, Optional[float]]:
+        """查找 URL 对应的限速键和速率，路径前缀越长优先级越高"""
+        parsed = urlparse(url)
+        host = (parsed.hostname or '').lower()
+        path = parsed.path or '/'
+        best, rate = host, None
+        for key, value in self.limits.items():
+            key_host, _, key_path = key.partition('/')
+            if key_host != host or not path.startswith('/' + key_path):
+                continue
+            if rate is None or len(key) > len(best):
+                best, rate = key, value
+        return best, rate
+
+    def bucket(self, url: str) -> TokenBucket:
+        """获取 URL 对应的令牌桶"""
+        key, rate = self._key(url)
+        with self._lock:
+            if key not in self.buckets:
+                burst = max(1, int(rate)) if rate else 1
+                self.buckets[key] = TokenBucket(rate, burst)
+            return self.buckets[key]
+
+    def acquire(self, url: str) -> float:
+        """等待到允许向该 URL 发送请求，返回实际等待的时间"""
+        wait = self.bucket(url).reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """acquire 的异步版本，等待期间不阻塞事件循环"""
+        wait = self.bucket(url).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def backoff(self, url: str, delay: Optional[float] = None):
+        """手动暂停该主机的请求，用于在响应体中返回限速错误的接口
+
+        Args:
+            delay: 暂停时间（秒），为 None 时按连续被限速次数指数退避
+        """
+        bucket = self.bucket(url)
+        with bucket.lock:
+            bucket.throttled += 1
+            if delay is None:
+                delay = min(self.MAX_BACKOFF, 2 ** bucket.throttled)
+        bucket.block(time.time() + delay)
+        log_warning(f"{urlparse(url).hostname} 请求被限速，{delay:.0f} 秒后继续")
+
+    @staticmethod
+    def _parse_reset(value: str, now: float) -> Optional[float]:
+        """解析配额重置时间，兼容时间戳和剩余秒数两种格式"""
+        try:
+            reset = float(value)
+        except ValueError:
+            return None
+        return reset if reset > 1e9 else now + reset
+
+    @staticmethod
+    def _header(headers, *names: str) -> Optional[str]:
+        for name in names:
+            value = headers.get(name)
+            if value is not None:
+                return value
+        return None
+
+    @classmethod
+    def is_rate_limited(cls, response) -> bool:
+        """响应是否表示请求被限速"""
+        if response.status_code == 429:
+            return True
+        if response.status_code in (403, 503):
+            remaining = cls._header(response.headers, 'X-RateLimit-Remaining', 'RateLimit-Remaining')
+            return 'Retry-After' in response.headers or remaining == '0'
+        return False
+
+    def update(self, url: str, response) -> bool:
+        """根据响应头更新该主机的限速状态
+
+        Returns:
+            请求是否被限速
+        """
+        bucket = self.bucket(url)
+        headers = response.headers
+        now = time.time()
+
+        remaining = self._header(headers, 'X-RateLimit-Remaining', 'RateLimit-Remaining')
+        reset = self._header(headers, 'X-RateLimit-Reset', 'RateLimit-Reset')
+        reset_time = self._parse_reset(reset, now) if reset is not None else None
+
+        if remaining is not None and reset_time is not None and reset_time > now:
+            try:
+                remaining = int(remaining)
+            except ValueError:
+                remaining = None
+            if remaining is not None:
+                with bucket.lock:
+                    # 将剩余配额均匀分配到重置前的时间内
+                    bucket.learned_rate = remaining / (reset_time - now) if remaining > 0 else None
+                    bucket.learned_until = reset_time
+                if remaining <= 0:
+                    bucket.block(reset_time)
+
+        limited = self.is_rate_limited(response)
+        if not limited:
+            with bucket.lock:
+                bucket.throttled = 0
+            return False
+
+        retry_after = self._header(headers, 'Retry-After')
+        delay = parse_retry_after(retry_after) if retry_after is not None else None
+        if delay is not None:
+            bucket.block(now + delay)
+        elif not (reset_time and reset_time > now):
+            self.backoff(url)
+        return True
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """获取进程内共享的限速器，限速规则来自配置文件中的 ratelimit"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                limits = Config().config.get('ratelimit') or {}
+                _limiter = RateLimiter({key: float(value) for key, value in limits.items()})
+    return _limiter
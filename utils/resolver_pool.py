@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import random
+import string
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Set
+import dns.resolver
+from utils.colors import Colors
+from utils.config import Config
+from utils.logger import log_info, log_error, log_warning
+
+class ResolverPool:
+    """DNS 服务器池
+
+    并发验证大批量公共 DNS 服务器：与可信服务器的解析结果对比检查正确性、
+    检查是否劫持 NXDOMAIN、测量延迟。验证结果带有效期缓存在磁盘上，
+    缓存未过期的服务器不再重复探测。
+    """
+
+    # 用于建立基准结果的可信服务器，国内外各有一部分，任一侧可达即可建立基准
+    TRUSTED_SERVERS = ['223.5.5.5', '119.29.29.29', '8.8.8.8', '1.1.1.1']
+
+    # 国内外都能正常解析的探测域名
+    PROBE_DOMAINS = ['www.baidu.com']
+
+    # 不存在泛解析的稳定域名，用于检测 NXDOMAIN 劫持
+    NXDOMAIN_ZONE = 'example.com'
+
+    def __init__(self, cache_file: str = None, ttl: int = 6 * 3600, timeout: float = 2.0,
+                 max_latency: float = 1.5, max_workers: int = 100, debug: bool = False,
+                 trusted_servers: Optional[List[str]] = None, probe_domains: Optional[List[str]] = None,
+                 nxdomain_zone: Optional[str] = None):
+        """
+        Args:
+            cache_file: 健康检查缓存文件，默认为 ~/.scouter/resolvers.json
+            ttl: 缓存有效期（秒）
+            timeout: 单次探测超时时间（秒）
+            max_latency: 可接受的最大延迟（秒）
+            max_workers: 并发探测数
+            debug: 是否显示调试信息
+            trusted_servers: 可信服务器，默认为 TRUSTED_SERVERS
+            probe_domains: 探测域名，默认为 PROBE_DOMAINS
+            nxdomain_zone: 检测 NXDOMAIN 劫持使用的域名，默认为 NXDOMAIN_ZONE
+        """
+        self.trusted_servers = trusted_servers or self.TRUSTED_SERVERS
+        self.probe_domains = probe_domains or self.PROBE_DOMAINS
+        self.nxdomain_zone = nxdomain_zone or self.NXDOMAIN_ZONE
+        if cache_file is None:
+            cache_file = os.path.join(os.path.expanduser("~"), '.scouter', 'resolvers.json')
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_latency = max_latency
+        self.max_workers = max_workers
+        self.debug = debug
+        self.cache = self._load_cache()
+        self._baseline: Optional[Dict[str, Set[str]]] = None
+
+    @classmethod
+    def from_config(cls, config: Config = None, **kwargs) -> 'ResolverPool':
+        """根据配置文件中的 resolver_probe 配置创建服务器池"""
+        config = config or Config()
+        return cls(
+            trusted_servers=config.get_api_key('resolver_probe', 'trusted_servers') or None,
+            probe_domains=config.get_api_key('resolver_probe', 'probe_domains') or None,
+            nxdomain_zone=config.get_api_key('resolver_probe', 'nxdomain_zone') or None,
+            **kwargs
+        )
+
+    @staticmethod
+    def load_file(path: str) -> List[str]:
+        """从文件读取 DNS 服务器列表，忽略空行和注释"""
+        servers = []
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    servers.append(line)
+        return servers
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        """加载健康检查缓存"""
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            log_error(f"加载 DNS 服务器缓存失败: {str(e)}")
+            return {}
+
+    def _save_cache(self):
+        """保存健康检查缓存"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(self.cache_file, 'w') as f:
+                json.dump(self.cache, f)
+        except Exception as e:
+            log_error(f"保存 DNS 服务器缓存失败: {str(e)}")
+
+    def _is_fresh(self, server: str) -> bool:
+        """缓存记录是否在有效期内"""
+        entry = self.cache.get(server)
+        return bool(entry) and time.time() - entry.get('checked', 0) < self.ttl
+
+    def _resolve(self, server: str, domain: str):
+        """使用指定服务器解析 A 记录
+
+        Returns:
+            (IP 集合与 CNAME 目标, 延迟)，NXDOMAIN 时为 (None, 延迟)
+        """
+        resolver = dns.resolver.Resolver(configure=False)
+        resolver.nameservers = [server]
+        resolver.timeout = self.timeout
+        resolver.lifetime = self.timeout
+        start_time = time.time()
+        try:
+            answers = resolver.resolve(domain, 'A')
+            # CDN 域名在不同地区解析到不同 IP，CNAME 目标一并作为比对依据
+            result = {str(rdata.address) for rdata in answers}
+            result.add(str(answers.canonical_name).rstrip('.').lower())
+            return result, time.time() - start_time
+        except dns.resolver.NXDOMAIN:
+            return None, time.time() - start_time
+
+    def _get_baseline(self) -> Dict[str, Set[str]]:
+        """从可信服务器获取探测域名的基准结果"""
+        if self._baseline is None:
+            baseline = {}
+            for domain in self.probe_domains:
+                ips = set()
+                for server in self.trusted_servers:
+                    try:
+                        result, _ = self._resolve(server, domain)
+                        ips.update(result or ())
+                    except Exception:
+                        continue
+                if ips:
+                    baseline[domain] = ips
+            self._baseline = baseline
+        return self._baseline
+
+    def check_server(self, server: str) -> Dict:
+        """验证单个 DNS 服务器
+
+        Returns:
+            {'ok': 是否可用, 'latency': 平均延迟, 'reason': 不可用原因, 'checked': 检查时间}
+        """
+        entry = {'ok': False, 'latency': None, 'reason': '', 'checked': time.time()}
+        latencies = []
+        try:
+            # 正确性：探测域名的 IP 或 CNAME 目标必须与基准结果有交集
+            for domain, expected in self._get_baseline().items():
+                ips, latency = self._resolve(server, domain)
+                latencies.append(latency)
+                if not ips or not (ips & expected):
+                    entry['reason'] = f'{domain} 解析结果错误'
+                    return entry
+
+            # NXDOMAIN 劫持：随机域名必须返回 NXDOMAIN
+            label = ''.join(random.choice(string.ascii_lowercase + string.digits) for _ in range(16))
+            ips, latency = self._resolve(server, f"{label}.{self.nxdomain_zone}")
+            latencies.append(latency)
+            if ips is not None:
+                entry['reason'] = 'NXDOMAIN 被劫持'
+                return entry
+        except Exception as e:
+            entry['reason'] = f'查询失败: {type(e).__name__}'
+            return entry
+
+        entry['latency'] = sum(latencies) / len(latencies)
+        if entry['latency'] > self.max_latency:
+            entry['reason'] = f"延迟过高 ({entry['latency']:.3f}s)"
+            return entry
+
+        entry['ok'] = True
+        return entry
+
+    def validate(self, servers: Iterable[str], limit: Optional[int] = None) -> Dict[str, float]:
+        """并发验证 DNS 服务器，缓存未过期的服务器直接使用缓存结果
+
+        Args:
+            servers: 待验证的服务器列表
+            limit: 最多返回的服务器数量，按延迟从低到高保留
+        Returns:
+            Dict[str, float]: 可用服务器及其延迟
+        """
+        servers = list(dict.fromkeys(servers))
+        pending = [server for server in servers if not self._is_fresh(server)]
+
+        if pending:
+            log_info(f"正在并发验证 {Colors.highlight(len(pending))} {Colors.info('个 DNS 服务器')}"
+                     f"{Colors.info(f'（{len(servers) - len(pending)} 个使用缓存结果）')}")
+            if not self._get_baseline():
+                log_warning("无法从可信 DNS 服务器获取基准结果，跳过正确性检查")
+
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                future_to_server = {executor.submit(self.check_server, server): server for server in pending}
+                for future in as_completed(future_to_server):
+                    server = future_to_server[future]
+                    try:
+                        entry = future.result()
+                    except Exception as e:
+                        entry = {'ok': False, 'latency': None, 'reason': str(e), 'checked': time.time()}
+                    self.cache[server] = entry
+                    if self.debug:
+                        if entry['ok']:
+                            log_info(f"DNS 服务器 {Colors.highlight(server)} 可用 (延迟: {entry['latency']:.3f}s)")
+                        else:
+                            log_error(f"DNS 服务器 {Colors.highlight(server)} 不可用: {entry['reason']}")
+            self._save_cache()
+        elif servers:
+            log_info(f"使用缓存的 DNS 服务器健康检查结果 ({Colors.highlight(len(servers))} {Colors.info('个')})")
+
+        available = {
+            server: self.cache[server]['latency']
+            for server in servers
+            if self.cache.get(server, {}).get('ok')
+        }
+        if limit and len(available) > limit:
+            fastest = sorted(available, key=available.get)[:limit]
+            available = {server: available[server] for server in fastest}
+        return available
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+import itertools
+import random
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from utils.colors import Colors
+from utils.logger import log_info, log_warning
+
+class ResolverScheduler:
+    """DNS 服务器调度器
+
+    按实时权重分配查询：有效权重由初始权重、失败率 EWMA 和延迟 EWMA 共同决定。
+    连续超时或返回 SERVFAIL 的服务器会被降级进入冷却期，冷却结束后重新参与调度。
+    权重表在统计变化后最多每 refresh_interval 秒重建一次，服务器降级或冷却结束时立即重建。
+    """
+
+    refresh_interval = 0.5  # 统计变化后重建权重表的最短间隔（秒）
+
+    def __init__(self, server_stats: Dict[str, Dict], cooldown: float = 30.0,
+                 failure_threshold: int = 3, alpha: float = 0.2, debug: bool = False):
+        """
+        Args:
+            server_stats: SubdomainFinder 中的 DNS 服务器性能统计，会被原地更新
+            cooldown: 降级后的基础冷却时间（秒），多次降级时成倍增加
+            failure_threshold: 连续失败多少次后降级
+            alpha: EWMA 平滑系数
+            debug: 是否显示调试信息
+        """
+        self.server_stats = server_stats
+        self.cooldown = cooldown
+        self.failure_threshold = failure_threshold
+        self.alpha = alpha
+        self.debug = debug
+        self._lock = threading.Lock()
+        # (服务器, 权重, 累计权重, 过期时间)，为 None 时下次选择前重建
+        self._table: Optional[Tuple[List[str], List[float], List[float], float]] = None
+        self._dirty = False
+        self._built_at = 0.0
+
+        for stats in self.server_stats.values():
+            stats.setdefault('success', 0)
+            stats.setdefault('failure', 0)
+            stats.setdefault('latency', None)
+            stats.setdefault('failure_rate', 0.0)
+            stats.setdefault('consecutive_failures', 0)
+            stats.setdefault('demotions', 0)
+            stats.setdefault('cooldown_until', 0.0)
+
+    def effective_weight(self, server: str) -> float:
+        """计算服务器的当前有效权重"""
+        stats = self.server_stats[server]
+        health = max(0.05, 1.0 - stats['failure_rate'])
+        # 延迟越高权重越低，100ms 以内视为同一档
+        latency = stats['latency'] or 0.1
+        return stats['weight'] * health * (0.1 / max(latency, 0.1))
+
+    def is_available(self, server: str, now: Optional[float] = None) -> bool:
+        """服务器是否不在冷却期内"""
+        return self.server_stats[server]['cooldown_until'] <= (now or time.time())
+
+    def available_servers(self) -> List[str]:
+        """返回当前可用的服务器，全部处于冷却期时返回最早恢复的服务器"""
+        now = time.time()
+        servers = [server for server in self.server_stats if self.is_available(server, now)]
+        if not servers and self.server_stats:
+            servers = [min(self.server_stats, key=lambda s: self.server_stats[s]['cooldown_until'])]
+        return servers
+
+    def pick(self, exclude: Iterable[str] = ()) -> str:
+        """按有效权重随机选择一个服务器
+
+        Args:
+            exclude: 优先排除的服务器（如本次查询已经尝试过的）
+        """
+        servers, weights, cum_weights, _ = self._weight_table()
+        if exclude:
+            exclude = set(exclude)
+            candidates = [(server, weight) for server, weight in zip(servers, weights) if server not in exclude]
+            if candidates:
+                return random.choices([server for server, _ in candidates],
+                                      weights=[weight for _, weight in candidates])[0]
+        return random.choices(servers, cum_weights=cum_weights)[0]
+
+    def _weight_table(self) -> Tuple[List[str], List[float], List[float], float]:
+        """获取当前的权重表，统计变化或有服务器冷却结束时重建"""
+        now = time.time()
+        table = self._table
+        if table is None or now >= table[3] or (self._dirty and now - self._built_at >= self.refresh_interval):
+            servers = self.available_servers()
+            weights = [self.effective_weight(server) for server in servers]
+            # 最早结束冷却的服务器恢复时权重表过期
+            expires = min((stats['cooldown_until'] for stats in self.server_stats.values()
+                           if stats['cooldown_until'] > now), default=float('inf'))
+            table = (servers, weights, list(itertools.accumulate(weights)), expires)
+            self._table = table
+            self._built_at = now
+            self._dirty = False
+        return table
+
+    def report_success(self, server: str, latency: Optional[float] = None):
+        """记录一次成功的查询（包括 NXDOMAIN 等正常应答）"""
+        with self._lock:
+            stats = self.server_stats.get(server)
+            if stats is None:
+                return
+            stats['success'] += 1
+            self._dirty = True
+            stats['consecutive_failures'] = 0
+            stats['failure_rate'] *= (1 - self.alpha)
+            if latency is not None:
+                if stats['latency'] is None:
+                    stats['latency'] = latency
+                else:
+                    stats['latency'] = (1 - self.alpha) * stats['latency'] + self.alpha * latency
+
+    def report_failure(self, server: str, reason: str = 'timeout'):
+        """记录一次失败的查询（超时、SERVFAIL、REFUSED），连续失败达到阈值时降级"""
+        with self._lock:
+            stats = self.server_stats.get(server)
+            if stats is None:
+                return
+            stats['failure'] += 1
+            self._dirty = True
+            stats['consecutive_failures'] += 1
+            stats['failure_rate'] = (1 - self.alpha) * stats['failure_rate'] + self.alpha
+
+            if stats['consecutive_failures'] >= self.failure_threshold and self.is_available(server):
+                stats['demotions'] += 1
+                duration = self.cooldown * min(2 ** (stats['demotions'] - 1), 8)
+                stats['cooldown_until'] = time.time() + duration
+                stats['consecutive_failures'] = 0
+                self._table = None  # 降级的服务器立即退出调度
+                if self.debug:
+                    log_warning(f"DNS 服务器 {Colors.highlight(server)} 连续{reason}，降级 {duration:.0f} 秒")
+
+    def weighted_list(self, size: int = 100) -> List[str]:
+        """按有效权重生成服务器列表，权重越高出现次数越多
+
+        massdns 在服务器列表中随机选择，重复出现即可按权重分配查询。
+        """
+        servers = self.available_servers()
+        weights = {server: self.effective_weight(server) for server in servers}
+        total = sum(weights.values()) or 1
+        result = []
+        for server in servers:
+            result.extend([server] * max(1, round(size * weights[server] / total)))
+        return result
+
+    def summary(self):
+        """打印各服务器的统计信息"""
+        for server, stats in sorted(self.server_stats.items(), key=lambda item: -self.effective_weight(item[0])):
+            latency = f"{stats['latency'] * 1000:.0f}ms" if stats['latency'] is not None else '-'
+            log_info(f"DNS 服务器 {Colors.highlight(server)}: 成功 {stats['success']}, 失败 {stats['failure']}, "
+                     f"延迟 {latency}, 权重 {self.effective_weight(server):.2f}")
@@ -1,31 +1,174 @@
 #!/usr/bin/env python3
 
+import asyncio
 import time
+import random
 import functools
-from datetime import datetime
+import threading
+from typing import Callable, Dict, Optional, Tuple
 from utils.colors import Colors
 from utils.logger import log_warning
+from utils.ratelimit import parse_retry_after
 
-def retry_on_error(max_retries=3, delay=1):
+# 可以重试的 HTTP 状态码，其余 4xx 重试也不会成功
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """数据源熔断期间的请求直接失败"""
+
+class CircuitBreaker:
+    """单个数据源的熔断器
+
+    连续失败达到阈值后熔断，熔断期间的请求立即抛出 CircuitOpenError；
+    冷却结束后放行一次试探请求，成功则恢复，失败则重新熔断。
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 300):
+        """
+        Args:
+            name: 数据源名称
+            failure_threshold: 连续失败多少次后熔断
+            reset_timeout: 熔断持续时间（秒）
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """请求前检查熔断状态"""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            if time.time() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"数据源 {self.name} 已熔断")
+            # 冷却结束，放行试探请求，失败一次即重新熔断
+            self.opened_at = None
+            self.failures = self.failure_threshold - 1
+
+    @property
+    def is_open(self) -> bool:
+        """是否处于熔断状态"""
+        return self.opened_at is not None
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold and self.opened_at is None:
+                self.opened_at = time.time()
+                log_warning(f"数据源 {Colors.highlight(self.name)} 连续失败 {self.failures} 次，"
+                            f"{self.reset_timeout:.0f} 秒内不再请求")
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """获取数据源的熔断器，同一数据源在进程内共享"""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+def classify_error(error: Exception) -> Tuple[bool, Optional[float]]:
+    """判断异常是否值得重试
+
+    带响应的 HTTP 异常（requests/httpx 的 raise_for_status）按状态码判断，
+    其余异常（超时、连接失败、浏览器异常等）视为临时错误。
+
+    Returns:
+        (是否可以重试, 服务端要求的等待时间)
+    """
+    if isinstance(error, CircuitOpenError):
+        return False, None
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is None:
+        return True, None
+    retry_after = response.headers.get('Retry-After') if response.headers is not None else None
+    return status in RETRYABLE_STATUS, parse_retry_after(retry_after) if retry_after else None
+
+def retry_on_error(max_retries=3, delay=1, backoff=2, max_delay=30, max_retry_after=60,
+                   circuit_key: Optional[Callable[..., str]] = None):
     """网络请求重试装饰器
-    
+
+    只重试临时错误，等待时间按指数增长并加入随机抖动，服务端返回 Retry-After 时按其等待。
+    可以装饰普通函数和协程函数。
+
     Args:
-        max_retries: 最大重试次数
-        delay: 重试间隔（秒）
+        max_retries: 最大尝试次数
+        delay: 首次重试的基础间隔（秒）
+        backoff: 间隔增长倍数
+        max_delay: 最大间隔（秒）
+        max_retry_after: 可接受的最长 Retry-After（秒），超过时不再重试
+        circuit_key: 根据被装饰函数的参数返回数据源名称，提供时按数据源熔断
     """
+    def next_wait(error: Exception, attempt: int, breaker: Optional[CircuitBreaker]) -> Optional[float]:
+        """记录一次失败并返回重试前的等待时间，不应重试时返回 None"""
+        retryable, retry_after = classify_error(error)
+        if breaker and retryable:
+            breaker.record_failure()
+        if not retryable or attempt == max_retries - 1:  # 不可重试或最后一次尝试
+            return None
+        if breaker and breaker.is_open:
+            raise CircuitOpenError(f"数据源 {breaker.name} 已熔断") from error
+
+        # 指数退避，抖动范围为间隔的一半
+        wait = min(max_delay, delay * backoff ** attempt)
+        wait = wait / 2 + random.uniform(0, wait / 2)
+        if retry_after is not None:
+            if retry_after > max_retry_after:
+                return None
+            wait = max(wait, retry_after)
+        log_warning(f'请求失败 ({str(error)})，{wait:.1f} 秒后进行第 {attempt + 2} 次重试...')
+        return wait
+
     def decorator(func):
+        # 协程函数使用 asyncio.sleep 等待，不阻塞事件循环
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                breaker = get_circuit_breaker(circuit_key(*args, **kwargs)) if circuit_key else None
+                for attempt in range(max_retries):
+                    if breaker:
+                        breaker.before_call()
+                    try:
+                        result = await func(*args, **kwargs)
+                    except Exception as e:
+                        wait = next_wait(e, attempt, breaker)
+                        if wait is None:
+                            raise
+                        await asyncio.sleep(wait)
+                    else:
+                        if breaker:
+                            breaker.record_success()
+                        return result
+                return None
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            breaker = get_circuit_breaker(circuit_key(*args, **kwargs)) if circuit_key else None
             for attempt in range(max_retries):
+                if breaker:
+                    breaker.before_call()
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
                 except Exception as e:
-                    if attempt == max_retries - 1:  # 最后一次尝试
+                    wait = next_wait(e, attempt, breaker)
+                    if wait is None:
                         raise  # 重新抛出异常
-                    
-                    timestamp = datetime.now().strftime('%H:%M:%S')
-                    log_warning(f'请求失败 ({str(e)})，{delay} 秒后进行第 {attempt + 2} 次重试...')
-                    time.sleep(delay)
+                    time.sleep(wait)
+                else:
+                    if breaker:
+                        breaker.record_success()
+                    return result
             return None
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import random
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+import dns.resolver
+import dns.exception
+from utils.colors import Colors
+from utils.logger import log_info, log_error, log_warning
+
+class WildcardDetector:
+    """泛解析检测器
+
+    对每个区域并发解析若干随机子域名，IP 集合和 TTL 都一致时判定存在泛解析。
+    各区域的泛解析特征（IP 集合和 TTL）带有效期缓存在磁盘上。
+    """
+
+    def __init__(self, get_nameservers: Callable[[int], List[str]], cache_file: str = None,
+                 ttl: int = 24 * 3600, probes: int = 5, timeout: float = 2.0, retries: int = 2,
+                 max_workers: int = 20, debug: bool = False):
+        """
+        Args:
+            get_nameservers: 获取 DNS 服务器的函数，参数为需要的数量
+            cache_file: 缓存文件，默认为 ~/.scouter/wildcard.json
+            ttl: 缓存有效期（秒）
+            probes: 每个区域探测的随机子域名数量
+            timeout: 单次查询超时时间（秒）
+            retries: 查询超时后的最大重试次数
+            max_workers: 并发查询数
+            debug: 是否显示调试信息
+        """
+        if cache_file is None:
+            cache_file = os.path.join(os.path.expanduser("~"), '.scouter', 'wildcard.json')
+        self.get_nameservers = get_nameservers
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.probes = probes
+        self.timeout = timeout
+        self.retries = retries
+        self.max_workers = max_workers
+        self.debug = debug
+        self._lock = threading.Lock()
+        self.cache = self._load_cache()
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        """加载泛解析缓存"""
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            log_error(f"加载泛解析缓存失败: {str(e)}")
+            return {}
+
+    def _save_cache(self):
+        """保存泛解析缓存"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with self._lock:
+                data = json.dumps(self.cache)
+            with open(self.cache_file, 'w') as f:
+                f.write(data)
+        except Exception as e:
+            log_error(f"保存泛解析缓存失败: {str(e)}")
+
+    def _get_cached(self, zone: str):
+        """获取未过期的缓存结果，不存在时返回 None"""
+        entry = self.cache.get(zone)
+        if not entry or time.time() - entry.get('checked', 0) >= self.ttl:
+            return None
+        return [(set(ips), ttl) for ips, ttl in entry['records']]
+
+    @staticmethod
+    def _random_label(length: int = None) -> str:
+        """生成随机标签"""
+        length = length or random.randint(8, 12)
+        chars = string.ascii_lowercase + string.digits
+        return ''.join(random.choice(chars) for _ in range(length))
+
+    @staticmethod
+    def candidate_zones(subdomains: Iterable[str], apex: str) -> Set[str]:
+        """找出子域名集合中出现的所有子区域
+
+        如 a.dev.example.com 对应子区域 dev.example.com，不包含主域名本身。
+        """
+        zones = set()
+        suffix = f".{apex}"
+        for subdomain in subdomains:
+            if not subdomain.endswith(suffix):
+                continue
+            labels = subdomain[:-len(suffix)].split('.')
+            for i in range(1, len(labels)):
+                zones.add('.'.join(labels[i:]) + suffix)
+        return zones
+
+    def _probe(self, name: str):
+        """解析单个随机子域名
+
+        Returns:
+            (IP 集合, TTL)，不存在或无记录时返回 None
+        """
+        servers = self.get_nameservers(2)
+        for attempt in range(self.retries + 1):
+            resolver = dns.resolver.Resolver(configure=False)
+            # 超时后换一个服务器重试
+            resolver.nameservers = servers if attempt == 0 else (self.get_nameservers(1) or servers)
+            resolver.timeout = self.timeout
+            resolver.lifetime = self.timeout
+            try:
+                answers = resolver.resolve(name, 'A')
+                ips = {str(rdata.address) for rdata in answers}
+                return (ips, answers.rrset.ttl) if ips else None
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                return None
+            except dns.exception.Timeout:
+                continue
+            except Exception as e:
+                if self.debug:
+                    log_error(f"{Colors.highlight(name)} -> 查询失败: {str(e)}")
+                return None
+        return None
+
+    def detect(self, zone: str) -> List[Tuple[Set[str], int]]:
+        """检测单个区域的泛解析
+
+        Returns:
+            泛解析记录列表 [(IP 集合, TTL)]，无泛解析时为空列表
+        """
+        return self.detect_many([zone]).get(zone, [])
+
+    def detect_many(self, zones: Iterable[str]) -> Dict[str, List[Tuple[Set[str], int]]]:
+        """并发检测多个区域的泛解析，优先使用缓存
+
+        Returns:
+            Dict[str, List[Tuple[Set[str], int]]]: 各区域的泛解析记录
+        """
+        results = {}
+        pending = []
+        for zone in zones:
+            cached = self._get_cached(zone)
+            if cached is None:
+                pending.append(zone)
+            else:
+                results[zone] = cached
+
+        if not pending:
+            return results
+
+        probes = {zone: [f"{self._random_label()}.{zone}" for _ in range(self.probes)] for zone in pending}
+        answers = {zone: [] for zone in pending}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending) * self.probes)) as executor:
+            future_to_zone = {
+                executor.submit(self._probe, name): (zone, name)
+                for zone, names in probes.items()
+                for name in names
+            }
+            for future in as_completed(future_to_zone):
+                zone, name = future_to_zone[future]
+                record = future.result()
+                if record:
+                    answers[zone].append(record)
+                    if self.debug:
+                        log_info(f"{Colors.highlight(name)} -> {', '.join(record[0])} (TTL: {record[1]})")
+
+        for zone in pending:
+            records = answers[zone]
+            # 至少 4 个随机子域名解析成功且结果完全相同才判定为泛解析
+            is_wildcard = len(records) >= self.probes - 1 and all(record == records[0] for record in records)
+            results[zone] = records if is_wildcard else []
+            with self._lock:
+                self.cache[zone] = {
+                    'records': [[sorted(ips), ttl] for ips, ttl in results[zone]],
+                    'checked': time.time()
+                }
+            if is_wildcard:
+                log_warning(f"发现泛解析 {Colors.highlight(zone)}, IP: {', '.join(records[0][0])}, TTL: {records[0][1]}")
+
+        self._save_cache()
+        return results